@@ -1,13 +1,13 @@
 from changing_dot_visualize.observer import Observer
 
 from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.changing_graph.graph_journal import GraphJournal
 from changing_dot.custom_types import AnalyzerOptions
 from changing_dot.dependency_graph.dependency_graph import (
     DependencyGraph,
     create_dependency_graph_from_folder,
 )
 from changing_dot.modifyle.modifyle import IModifyle, IntegralModifyle
-from changing_dot.utils.process_pickle_files import process_pickle_files
 
 
 def apply_graph_changes(
@@ -28,27 +28,26 @@ def run_apply_graph_changes(
     output_path: str,
     analyzer_options: AnalyzerOptions,
 ) -> None:
-    graphs = process_pickle_files(f"{output_path}/{iteration_name}/")
+    journal = GraphJournal(f"{output_path}/{iteration_name}/")
 
-    G = ChangingGraph(graphs[-1])
+    G = ChangingGraph(journal.load_latest())
 
-    observer = Observer(
+    with Observer(
         G,
         iteration_name,
         output_folder=output_path,
-        step=len(graphs),
-    )
+        step=journal.number_of_steps,
+    ) as observer:
+        file_modifier: IModifyle = IntegralModifyle()
 
-    file_modifier: IModifyle = IntegralModifyle()
+        folder_to_analyse = (
+            analyzer_options.folder_path
+            if analyzer_options.language == "python"
+            else analyzer_options.solution_path
+        )
 
-    folder_to_analyse = (
-        analyzer_options.folder_path
-        if analyzer_options.language == "python"
-        else analyzer_options.solution_path
-    )
+        DG = create_dependency_graph_from_folder(
+            folder_to_analyse, analyzer_options.language
+        )
 
-    DG = create_dependency_graph_from_folder(
-        folder_to_analyse, analyzer_options.language
-    )
-
-    apply_graph_changes(G, DG, file_modifier, observer)
+        apply_graph_changes(G, DG, file_modifier, observer)
@@ -1,20 +1,65 @@
-from collections import Counter
+import hashlib
+import heapq
+import os
+from collections import Counter, defaultdict
+from typing import Any
 
 import networkx as nx
+from changing_dot.changing_graph.graph_journal import GraphDelta
+from changing_dot.changing_graph.graph_reduction import GraphReduction
 from changing_dot.custom_types import (
+    BlockEdit,
+    CompileError,
     ErrorProblemNode,
     ErrorSolutionNode,
     InitialResolveNode,
+    Instruction,
     NodeData,
     NodeStatus,
     ProblemNode,
     SolutionNode,
 )
 
+PENDING_NODE_TYPES = ("problem", "solution", "initial_resolve")
 
+ProblemKey = tuple[str, int, str]
+SolutionKey = tuple[str, int, str]
+
+
+def get_problem_key(error: CompileError) -> ProblemKey:
+    return os.path.abspath(error.file_path), error.pos[0], error.text
+
+
+def get_edits_hash(edits: list[BlockEdit]) -> str:
+    # Edits match whatever their order and trailing whitespaces
+    normalized_afters = sorted(
+        {"\n".join(line.rstrip() for line in edit.after.splitlines()) for edit in edits}
+    )
+    return hashlib.sha256("\0".join(normalized_afters).encode()).hexdigest()
+
+
+def get_solution_key(instruction: Instruction, edits: list[BlockEdit]) -> SolutionKey:
+    return instruction.file_path, instruction.block_id, get_edits_hash(edits)
+
+
+# Nodes are indexed by status and by type, so that the main loops find the
+# next pending node without scanning the whole graph after each handled node.
+# Problems and solutions are also indexed by key to find duplicates. Indexes
+# are rebuilt from the nodes when a saved graph is resumed. Cycles and
+# redundant edges are found from a reduction built when the graph is optimized.
+# Changes made since the last saved step are tracked for the journal.
 class ChangingGraph:
     next_index: int
     G: nx.DiGraph
+    nodes_by_status: defaultdict[str, set[int]]
+    nodes_by_type: defaultdict[str, set[int]]
+    problems_by_key: defaultdict[ProblemKey, set[int]]
+    solutions_by_key: defaultdict[SolutionKey, set[int]]
+    pending_queue: list[int]
+    changed_nodes: set[int]
+    removed_nodes: set[int]
+    added_edges: set[tuple[int, int]]
+    removed_edges: set[tuple[int, int]]
 
     def __init__(self, G: nx.DiGraph | None = None) -> None:
         if G is None:
@@ -24,6 +69,85 @@ class ChangingGraph:
             next_index = max(nx.get_node_attributes(G, "index").values()) + 1
         self.G = G
         self.next_index = next_index
+        self.nodes_by_status = defaultdict(set)
+        self.nodes_by_type = defaultdict(set)
+        self.problems_by_key = defaultdict(set)
+        self.solutions_by_key = defaultdict(set)
+        self.pending_queue = []
+        self.changed_nodes = set()
+        for index in self.G.nodes():
+            self.index_node(index)
+        # A given graph is the state of the last saved step
+        self.changed_nodes = set()
+        self.removed_nodes = set()
+        self.added_edges = set()
+        self.removed_edges = set()
+
+    def pop_changes(self, step_logs: list[Any]) -> GraphDelta:
+        delta = GraphDelta(
+            nodes={
+                index: dict(self.G.nodes[index])
+                for index in sorted(self.changed_nodes)
+                if index in self.G
+            },
+            removed_nodes=sorted(
+                index for index in self.removed_nodes if index not in self.G
+            ),
+            edges=sorted(edge for edge in self.added_edges if self.G.has_edge(*edge)),
+            removed_edges=sorted(
+                edge for edge in self.removed_edges if not self.G.has_edge(*edge)
+            ),
+            step_logs=step_logs,
+        )
+        self.changed_nodes = set()
+        self.removed_nodes = set()
+        self.added_edges = set()
+        self.removed_edges = set()
+        return delta
+
+    def record_added_edge(self, edge: tuple[int, int]) -> None:
+        self.added_edges.add(edge)
+        self.removed_edges.discard(edge)
+
+    def record_removed_edge(self, edge: tuple[int, int]) -> None:
+        self.removed_edges.add(edge)
+        self.added_edges.discard(edge)
+
+    def record_removed_node(self, index: int) -> None:
+        self.removed_nodes.add(index)
+        self.changed_nodes.discard(index)
+
+    def index_node(self, index: int) -> None:
+        node = self.G.nodes[index]
+        self.changed_nodes.add(index)
+        self.nodes_by_status[node["status"]].add(index)
+        self.nodes_by_type[node["node_type"]].add(index)
+        if node["node_type"] == "problem":
+            self.problems_by_key[get_problem_key(node["error"])].add(index)
+        if node["node_type"] == "solution":
+            solution_key = get_solution_key(node["instruction"], node["edits"])
+            self.solutions_by_key[solution_key].add(index)
+        if self.is_pending(index):
+            heapq.heappush(self.pending_queue, index)
+
+    def unindex_node(self, index: int) -> None:
+        # the pending queue is cleaned lazily when it is read
+        node = self.G.nodes[index]
+        self.nodes_by_status[node["status"]].discard(index)
+        self.nodes_by_type[node["node_type"]].discard(index)
+        if node["node_type"] == "problem":
+            self.problems_by_key[get_problem_key(node["error"])].discard(index)
+        if node["node_type"] == "solution":
+            solution_key = get_solution_key(node["instruction"], node["edits"])
+            self.solutions_by_key[solution_key].discard(index)
+
+    def is_pending(self, index: int) -> bool:
+        node = self.G.nodes.get(index)
+        return (
+            node is not None
+            and node["status"] == "pending"
+            and node["node_type"] in PENDING_NODE_TYPES
+        )
 
     def add_solution_node(self, node_data: SolutionNode) -> int:
         index = self.next_index
@@ -35,6 +159,7 @@ class ChangingGraph:
             instruction=node_data.instruction,
             edits=node_data.edits,
         )
+        self.index_node(index)
         self.next_index += 1
         return index
 
@@ -46,6 +171,7 @@ class ChangingGraph:
             node_type=node_data.node_type,
             status=node_data.status,
         )
+        self.index_node(index)
         self.next_index += 1
         return index
 
@@ -58,20 +184,28 @@ class ChangingGraph:
             status=node_data.status,
             error=node_data.error,
         )
+        self.index_node(index)
         self.next_index += 1
         return index
 
-    def update_solution_node(self, node_data: SolutionNode) -> None:
+    def update_node_data(self, node_data: NodeData) -> None:
+        self.unindex_node(node_data.index)
         self.G.nodes[node_data.index].update(node_data)
+        self.index_node(node_data.index)
+
+    def update_solution_node(self, node_data: SolutionNode) -> None:
+        self.update_node_data(node_data)
 
     def update_problem_node(self, node_data: ProblemNode) -> None:
-        self.G.nodes[node_data.index].update(node_data)
+        self.update_node_data(node_data)
 
     def add_edge(self, source_index: int, target_index: int) -> None:
         self.G.add_edge(source_index, target_index)
+        self.record_added_edge((source_index, target_index))
 
     def remove_edge(self, source_index: int, target_index: int) -> None:
         self.G.remove_edge(source_index, target_index)
+        self.record_removed_edge((source_index, target_index))
 
     def get_node(self, index: int) -> NodeData:
         node = self.G.nodes()[index]
@@ -119,7 +253,9 @@ class ChangingGraph:
         )
 
     def mark_node_as(self, node_index: int, status: NodeStatus) -> None:
+        self.unindex_node(node_index)
         self.G.nodes()[node_index]["status"] = status
+        self.index_node(node_index)
 
     def get_number_of_nodes(self) -> int:
         n: int = nx.number_of_nodes(self.G)
@@ -159,30 +295,33 @@ class ChangingGraph:
     def get_children(self, node_index: int) -> list[int]:
         return list(self.G.successors(node_index))
 
+    def get_nodes_with(self, status: NodeStatus, node_type: str) -> list[int]:
+        return sorted(self.nodes_by_status[status] & self.nodes_by_type[node_type])
+
     def get_all_pending_nodes(self) -> list[int]:
-        return [
-            node["index"]
-            for index, node in self.G.nodes(data=True)
-            if node["status"] == "pending"
-            and (
-                node["node_type"] == "problem"
-                or node["node_type"] == "solution"
-                or node["node_type"] == "initial_resolve"
-            )
-        ]
+        return sorted(
+            index
+            for index in self.nodes_by_status["pending"]
+            if self.G.nodes[index]["node_type"] in PENDING_NODE_TYPES
+        )
+
+    def get_next_pending_node(self) -> int | None:
+        # Pending node with the lowest index, it stays in the queue until its
+        # status changes
+        while len(self.pending_queue) > 0:
+            index = self.pending_queue[0]
+            if self.is_pending(index):
+                return index
+            heapq.heappop(self.pending_queue)
+        return None
 
     def get_all_handled_solution_nodes(self) -> list[int]:
-        return [
-            node["index"]
-            for index, node in self.G.nodes(data=True)
-            if node["status"] == "handled" and node["node_type"] == "solution"
-        ]
+        return self.get_nodes_with("handled", "solution")
 
     def get_all_pending_problem_nodes(self) -> list[ProblemNode]:
         return [
             self.get_problem_node(index)
-            for index, node in self.G.nodes(data=True)
-            if node["node_type"] == "problem" and node["status"] == "pending"
+            for index in self.get_nodes_with("pending", "problem")
         ]
 
     def get_leaves(self) -> list[int]:
@@ -200,9 +339,7 @@ class ChangingGraph:
         return failed_successors
 
     def get_cycles(self) -> list[set[int]]:
-        strongly_connected_components = list(nx.strongly_connected_components(self.G))
-        cycles = [scc for scc in strongly_connected_components if len(scc) != 1]
-        return cycles
+        return sorted(GraphReduction(self.G).get_cycles(), key=min)
 
     def in_edges(self, node_index: int) -> list[tuple[int, int]]:
         return self.G.in_edges(node_index)  # type: ignore
@@ -211,14 +348,42 @@ class ChangingGraph:
         return self.G.out_edges(node_index)  # type: ignore
 
     def remove_node(self, node_index: int) -> None:
+        self.unindex_node(node_index)
         self.G.remove_node(node_index)
+        self.record_removed_node(node_index)
+
+    def merge_nodes(self, node_indexes: set[int], node_data: SolutionNode) -> int:
+        # Replace the nodes by a single node, edges between them are dropped
+        merged_index = self.add_solution_node(node_data)
+        for node_index in node_indexes:
+            for parent in self.G.predecessors(node_index):
+                if parent not in node_indexes:
+                    self.G.add_edge(parent, merged_index)
+                    self.record_added_edge((parent, merged_index))
+            for child in self.G.successors(node_index):
+                if child not in node_indexes:
+                    self.G.add_edge(merged_index, child)
+                    self.record_added_edge((merged_index, child))
+        for node_index in node_indexes:
+            self.unindex_node(node_index)
+            self.G.remove_node(node_index)
+            self.record_removed_node(node_index)
+        return merged_index
 
     def remove_redundant_edges(self) -> None:
-        G_reduced = nx.transitive_reduction(self.G)
-        # update attributes that were not copied
-        for node in G_reduced:
-            G_reduced.nodes[node].update(self.G.nodes[node])
-        self.G = G_reduced
+        reduction = GraphReduction(self.G)
+        if len(reduction.get_cycles()) > 0:
+            raise nx.NetworkXError(
+                "Transitive reduction only uniquely defined on directed acyclic graphs."
+            )
+        redundant_edges = [
+            (source, target)
+            for source, target in self.G.edges()
+            if not reduction.dag.has_edge(source, target)
+        ]
+        self.G.remove_edges_from(redundant_edges)
+        for edge in redundant_edges:
+            self.record_removed_edge(edge)
 
     def find_same_problem(
         self,
@@ -226,24 +391,30 @@ class ChangingGraph:
         line_number_to_match: int,
         error_text_to_match: str,
     ) -> list[int]:
-        matching_nodes = []
-        for node, attrs in self.G.nodes(data=True):
-            if attrs.get("node_type") != "problem":
-                continue
-
-            if attrs.get("error").get("file_path") != error_path_to_match:
-                continue
-
-            node_line_number = attrs.get("error").get("pos")[0]
-            if node_line_number != line_number_to_match:
-                continue
-
-            if attrs.get("error").get("text") != error_text_to_match:
-                continue
-
-            matching_nodes.append(node)
+        key = (
+            os.path.abspath(error_path_to_match),
+            line_number_to_match,
+            error_text_to_match,
+        )
+        return sorted(self.problems_by_key.get(key, ()))
+
+    def find_pending_problems(self, error: CompileError) -> list[int]:
+        # Pending problems of the same error, its whole position included
+        return sorted(
+            index
+            for index in self.problems_by_key.get(get_problem_key(error), ())
+            if self.is_pending(index) and self.G.nodes[index]["error"].key == error.key
+        )
 
-        return matching_nodes
+    def find_same_solution(
+        self, instruction: Instruction, edits: list[BlockEdit]
+    ) -> list[int]:
+        key = get_solution_key(instruction, edits)
+        return sorted(
+            index
+            for index in self.solutions_by_key.get(key, ())
+            if self.G.nodes[index]["status"] != "failed"
+        )
 
     def error_on_problem_node(
         self,
@@ -251,7 +422,7 @@ class ChangingGraph:
     ) -> None:
         node = self.get_node(error_node.index)
         assert node.node_type == "problem"
-        self.G.nodes[error_node.index].update(error_node)
+        self.update_node_data(error_node)
 
     def error_on_solution_node(
         self,
@@ -259,4 +430,4 @@ class ChangingGraph:
     ) -> None:
         node = self.get_node(error_node.index)
         assert node.node_type == "solution"
-        self.G.nodes[error_node.index].update(error_node)
+        self.update_node_data(error_node)
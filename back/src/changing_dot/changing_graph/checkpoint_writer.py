@@ -0,0 +1,64 @@
+import queue
+import threading
+from typing import NamedTuple
+
+import networkx as nx
+from changing_dot.changing_graph.graph_journal import GraphDelta, GraphJournalWriter
+
+CHECKPOINT_QUEUE_SIZE = 8
+
+
+class Checkpoint(NamedTuple):
+    step: int
+    # Copy of the graph, for snapshot steps only
+    G: nx.DiGraph | None
+    delta: GraphDelta
+
+
+# Writes checkpoints to the journal in a background thread, so that they are
+# serialised and synced to disk off the main loop. The queue is bounded: when
+# the disk can not keep up, submitting a checkpoint waits.
+class CheckpointWriter:
+    def __init__(
+        self,
+        journal_writer: GraphJournalWriter,
+        queue_size: int = CHECKPOINT_QUEUE_SIZE,
+    ) -> None:
+        self.journal_writer = journal_writer
+        self.queue: queue.Queue[Checkpoint | None] = queue.Queue(maxsize=queue_size)
+        self.error: BaseException | None = None
+        self.thread = threading.Thread(
+            target=self.run, name="checkpoint-writer", daemon=True
+        )
+        self.thread.start()
+
+    def run(self) -> None:
+        while True:
+            checkpoint = self.queue.get()
+            try:
+                if checkpoint is None:
+                    return
+                # Once a write failed the following deltas can not be replayed
+                if self.error is None:
+                    self.journal_writer.write_step(*checkpoint)
+            except Exception as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
+
+    def raise_error(self) -> None:
+        if self.error is not None:
+            raise RuntimeError("Could not write a checkpoint") from self.error
+
+    def submit(self, checkpoint: Checkpoint) -> None:
+        self.raise_error()
+        self.queue.put(checkpoint)
+
+    def flush(self) -> None:
+        self.queue.join()
+        self.raise_error()
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+        self.raise_error()
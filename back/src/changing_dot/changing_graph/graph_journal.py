@@ -0,0 +1,309 @@
+import os
+import pickle
+import re
+import struct
+import threading
+from collections.abc import Iterator
+from typing import Any, BinaryIO, NamedTuple
+
+import networkx as nx
+from pydantic import BaseModel, ValidationError
+
+JOURNAL_FILE_NAME = "journal.bin"
+MANIFEST_FILE_NAME = "manifest.json"
+SNAPSHOT_FILE_PATTERN = re.compile(r"^snapshot_(\d+)\.pickle$")
+LEGACY_STEP_NUMBER_PATTERN = re.compile(r"\d+")
+
+# A full snapshot of the graph is written every SNAPSHOT_INTERVAL steps, so a
+# step is rebuilt from at most SNAPSHOT_INTERVAL - 1 deltas
+SNAPSHOT_INTERVAL = 50
+
+# Each record of the journal is its step and the size of its data
+RECORD_HEADER = struct.Struct("<qq")
+
+
+class GraphDelta(NamedTuple):
+    nodes: dict[int, dict[str, Any]]
+    removed_nodes: list[int]
+    edges: list[tuple[int, int]]
+    removed_edges: list[tuple[int, int]]
+    step_logs: list[Any]
+
+
+class SnapshotEntry(BaseModel):
+    step: int
+    file_name: str
+    # Records of the steps following the snapshot start at this offset
+    journal_offset: int
+
+
+# Index of the steps of a run, rewritten after each written step so that any
+# step is found without listing the run or reading the whole journal
+class JournalManifest(BaseModel):
+    first_step: int
+    latest_step: int
+    journal_size: int
+    snapshots: list[SnapshotEntry]
+
+
+def get_snapshot_file_name(step: int) -> str:
+    return f"snapshot_{step}.pickle"
+
+
+def get_temporary_path(path: str) -> str:
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def apply_delta(G: nx.DiGraph, delta: GraphDelta) -> None:
+    G.remove_nodes_from(delta.removed_nodes)
+    G.remove_edges_from(delta.removed_edges)
+    for index, attributes in delta.nodes.items():
+        G.add_node(index)
+        G.nodes[index].clear()
+        G.nodes[index].update(attributes)
+    G.add_edges_from(delta.edges)
+    G.graph["step_logs"] = delta.step_logs
+
+
+def get_file_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def read_records(
+    file: BinaryIO, start_offset: int, end_offset: int
+) -> Iterator[tuple[int, int, int]]:
+    # Step, data offset and data size of the records of an open journal between
+    # the two offsets, a record cut by a crash ends the journal
+    end_offset = min(end_offset, os.fstat(file.fileno()).st_size)
+    offset = start_offset
+    while offset + RECORD_HEADER.size <= end_offset:
+        file.seek(offset)
+        step, size = RECORD_HEADER.unpack(file.read(RECORD_HEADER.size))
+        data_offset = offset + RECORD_HEADER.size
+        if data_offset + size > end_offset:
+            return
+        yield step, data_offset, size
+        offset = data_offset + size
+
+
+def read_manifest(directory: str) -> JournalManifest | None:
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE_NAME)) as file:
+            return JournalManifest.model_validate_json(file.read())
+    except (FileNotFoundError, ValidationError):
+        return None
+
+
+def load_manifest(directory: str) -> JournalManifest | None:
+    # The directory is scanned only when the manifest is missing or when the
+    # journal is shorter than it says, after a crash during a write
+    manifest = read_manifest(directory)
+    journal_path = os.path.join(directory, JOURNAL_FILE_NAME)
+    if manifest is None or get_file_size(journal_path) < manifest.journal_size:
+        return scan_directory(directory)
+    return manifest
+
+
+def scan_directory(directory: str) -> JournalManifest | None:
+    # Manifest of a run saved without one, from its snapshots or its pickle per
+    # step and from the records of its journal
+    snapshot_steps: dict[int, str] = {}
+    legacy_steps: dict[int, str] = {}
+    for file_name in os.listdir(directory):
+        snapshot_match = SNAPSHOT_FILE_PATTERN.match(file_name)
+        if snapshot_match is not None:
+            snapshot_steps[int(snapshot_match.group(1))] = file_name
+        elif file_name.endswith((".pkl", ".pickle")):
+            number_match = LEGACY_STEP_NUMBER_PATTERN.search(file_name)
+            step = int(number_match.group(0)) if number_match is not None else -1
+            legacy_steps[step] = file_name
+
+    if len(snapshot_steps) == 0:
+        snapshot_steps = legacy_steps
+    if len(snapshot_steps) == 0:
+        return None
+
+    journal_path = os.path.join(directory, JOURNAL_FILE_NAME)
+    records: list[tuple[int, int, int]] = []
+    if os.path.exists(journal_path):
+        with open(journal_path, "rb") as file:
+            records = list(read_records(file, 0, get_file_size(journal_path)))
+    journal_size = records[-1][1] + records[-1][2] if len(records) > 0 else 0
+
+    snapshots = [
+        SnapshotEntry(
+            step=step,
+            file_name=file_name,
+            journal_offset=next(
+                (
+                    data_offset - RECORD_HEADER.size
+                    for record_step, data_offset, _ in records
+                    if record_step > step
+                ),
+                journal_size,
+            ),
+        )
+        for step, file_name in sorted(snapshot_steps.items())
+    ]
+
+    return JournalManifest(
+        first_step=min(snapshot_steps),
+        latest_step=max([*snapshot_steps, *(step for step, _, _ in records)]),
+        journal_size=journal_size,
+        snapshots=snapshots,
+    )
+
+
+# Steps of a run are written as the changes made to the graph since the
+# previous step, appended to a single journal file, and as periodic full
+# snapshots. The first step written by a writer is always a snapshot.
+class GraphJournalWriter:
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.journal_path = os.path.join(directory, JOURNAL_FILE_NAME)
+        self.needs_snapshot = True
+        os.makedirs(directory, exist_ok=True)
+
+        self.manifest = load_manifest(directory)
+        # What was written after the last known step, as a record cut by a
+        # crash, is dropped
+        if os.path.exists(self.journal_path):
+            os.truncate(self.journal_path, self.get_journal_size())
+
+    def get_journal_size(self) -> int:
+        return self.manifest.journal_size if self.manifest is not None else 0
+
+    def start_step(self, step: int) -> bool:
+        # Whether the step is written as a snapshot
+        is_snapshot = self.needs_snapshot or step % SNAPSHOT_INTERVAL == 0
+        self.needs_snapshot = False
+        return is_snapshot
+
+    def write_step(self, step: int, G: nx.DiGraph | None, delta: GraphDelta) -> str:
+        # G is given for snapshot steps only
+        journal_size = self.get_journal_size()
+        snapshot: SnapshotEntry | None = None
+        if G is not None:
+            snapshot = SnapshotEntry(
+                step=step,
+                file_name=get_snapshot_file_name(step),
+                journal_offset=journal_size,
+            )
+            path = os.path.join(self.directory, snapshot.file_name)
+            G.graph["step_logs"] = delta.step_logs
+            temporary_path = get_temporary_path(path)
+            with open(temporary_path, "wb") as file:
+                pickle.dump(G, file, protocol=pickle.HIGHEST_PROTOCOL)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, path)
+        else:
+            path = self.journal_path
+            data = pickle.dumps(delta, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(path, "ab") as file:
+                file.write(RECORD_HEADER.pack(step, len(data)) + data)
+                file.flush()
+                os.fsync(file.fileno())
+            journal_size += RECORD_HEADER.size + len(data)
+
+        self.write_manifest(step, journal_size, snapshot)
+        return path
+
+    def write_manifest(
+        self, step: int, journal_size: int, snapshot: SnapshotEntry | None
+    ) -> None:
+        # Written once the step is on disk, it never points to missing data
+        if self.manifest is None:
+            self.manifest = JournalManifest(
+                first_step=step, latest_step=step, journal_size=0, snapshots=[]
+            )
+        self.manifest.first_step = min(self.manifest.first_step, step)
+        self.manifest.latest_step = step
+        self.manifest.journal_size = journal_size
+        if snapshot is not None:
+            # A step written again, when resuming from an earlier step,
+            # replaces the snapshots that followed it
+            self.manifest.snapshots = [
+                entry for entry in self.manifest.snapshots if entry.step < step
+            ] + [snapshot]
+
+        path = os.path.join(self.directory, MANIFEST_FILE_NAME)
+        temporary_path = get_temporary_path(path)
+        with open(temporary_path, "w") as file:
+            file.write(self.manifest.model_dump_json())
+        os.replace(temporary_path, path)
+
+
+# Loads the graph of any step of a run from the closest snapshot before it and
+# the records that follow. Runs saved as one pickle per step are read as well.
+class GraphJournal:
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.journal_path = os.path.join(directory, JOURNAL_FILE_NAME)
+        manifest = load_manifest(directory)
+        if manifest is None:
+            raise FileNotFoundError(f"No saved step in {directory}")
+        self.manifest = manifest
+
+    @property
+    def number_of_steps(self) -> int:
+        return self.manifest.latest_step - self.manifest.first_step + 1
+
+    def get_steps(self) -> list[int]:
+        return list(range(self.manifest.first_step, self.manifest.latest_step + 1))
+
+    def get_snapshot(self, step: int) -> SnapshotEntry:
+        return max(
+            (entry for entry in self.manifest.snapshots if entry.step <= step),
+            key=lambda entry: entry.step,
+        )
+
+    def read_file(self, file_name: str) -> nx.DiGraph:
+        with open(os.path.join(self.directory, file_name), "rb") as file:
+            G: nx.DiGraph = pickle.load(file)
+        return G
+
+    def read_deltas(
+        self, snapshot: SnapshotEntry, last_step: int
+    ) -> Iterator[GraphDelta]:
+        # Deltas of the steps after the snapshot, up to last_step
+        if snapshot.journal_offset >= self.manifest.journal_size:
+            return
+        with open(self.journal_path, "rb") as file:
+            for step, data_offset, size in read_records(
+                file, snapshot.journal_offset, self.manifest.journal_size
+            ):
+                if step > last_step:
+                    return
+                if step <= snapshot.step:
+                    continue
+                file.seek(data_offset)
+                delta: GraphDelta = pickle.loads(file.read(size))
+                yield delta
+
+    def load_step(self, step: int) -> nx.DiGraph:
+        snapshot = self.get_snapshot(step)
+        G = self.read_file(snapshot.file_name)
+        if snapshot.step < step:
+            for delta in self.read_deltas(snapshot, step):
+                apply_delta(G, delta)
+        return G
+
+    def load_latest(self) -> nx.DiGraph:
+        return self.load_step(self.manifest.latest_step)
+
+    def load_all_steps(self) -> Iterator[nx.DiGraph]:
+        # Steps are replayed one after the other, each graph is a copy
+        snapshots = sorted(self.manifest.snapshots, key=lambda entry: entry.step)
+        for position, snapshot in enumerate(snapshots):
+            last_step = (
+                snapshots[position + 1].step - 1
+                if position + 1 < len(snapshots)
+                else self.manifest.latest_step
+            )
+            G = self.read_file(snapshot.file_name)
+            yield G.copy()
+            if snapshot.step < last_step:
+                for delta in self.read_deltas(snapshot, last_step):
+                    apply_delta(G, delta)
+                    yield G.copy()
@@ -0,0 +1,60 @@
+import networkx as nx
+
+
+def reduce_dag(G: nx.DiGraph) -> None:
+    # Transitive reduction in place, in one pass in reverse topological order.
+    # What a node reaches is a bitset over topological positions, children are
+    # visited closest first so that an edge is redundant when its child was
+    # already reached through an other child.
+    order: list[int] = list(nx.topological_sort(G))  # type: ignore
+    positions = {node: position for position, node in enumerate(order)}
+    remaining_parents = {node: G.in_degree(node) for node in order}
+    reachable: dict[int, int] = {}
+
+    for node in reversed(order):
+        node_reachable = 0
+        for child in sorted(G.successors(node), key=positions.__getitem__):
+            child_bit = 1 << positions[child]
+            if node_reachable & child_bit:
+                G.remove_edge(node, child)
+            else:
+                node_reachable |= child_bit | reachable[child]
+            remaining_parents[child] -= 1
+            if remaining_parents[child] == 0:
+                del reachable[child]
+        reachable[node] = node_reachable
+
+
+# Condensation of a graph with its edges transitively reduced. Components are
+# named after their smallest node. It is built in one pass over the graph.
+class GraphReduction:
+    components: dict[int, int]
+    members: dict[int, set[int]]
+    dag: nx.DiGraph
+
+    def __init__(self, G: nx.DiGraph) -> None:
+        condensation = nx.condensation(G)
+        representatives = {
+            component: min(members)
+            for component, members in condensation.nodes(data="members")
+        }
+        self.components = {
+            node: representatives[component]
+            for node, component in condensation.graph["mapping"].items()
+        }
+        self.members = {
+            representatives[component]: set(members)
+            for component, members in condensation.nodes(data="members")
+        }
+        self.dag = nx.DiGraph()
+        self.dag.add_nodes_from(
+            representatives[component] for component in condensation
+        )
+        self.dag.add_edges_from(
+            (representatives[source], representatives[target])
+            for source, target in condensation.edges()
+        )
+        reduce_dag(self.dag)
+
+    def get_cycles(self) -> list[set[int]]:
+        return [members for members in self.members.values() if len(members) != 1]
@@ -12,30 +12,7 @@ def find_same_solution_block(
     instruction_to_match: Instruction,
     edits_to_match: list[BlockEdit],
 ) -> list[int]:
-    matching_nodes = []
-    for node, attrs in G.G.nodes(data=True):
-        if attrs.get("node_type") != "solution":
-            continue
-
-        if attrs.get("status") == "failed":
-            continue
-
-        if attrs.get("instruction").file_path != instruction_to_match.file_path:
-            continue
-
-        node_block_id = attrs.get("instruction").block_id
-        if node_block_id != instruction_to_match.block_id:
-            continue
-
-        node_edit_afters = [edit.after for edit in attrs.get("edits")]
-
-        for edit in edits_to_match:
-            if edit.after not in node_edit_afters:
-                continue
-
-        matching_nodes.append(node)
-
-    return matching_nodes
+    return G.find_same_solution(instruction_to_match, edits_to_match)
 
 
 def check_if_duplicate_solution_block(
@@ -0,0 +1,48 @@
+import heapq
+
+from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.custom_types import BlockEdit, SolutionNode
+from pydantic import BaseModel
+
+
+class CommitPlan(BaseModel):
+    solution_nodes: list[SolutionNode]
+    skipped_nodes: list[int]
+
+    def get_edits_list(self) -> list[list[BlockEdit]]:
+        return [node.edits for node in self.solution_nodes]
+
+
+def plan_commits(G: ChangingGraph) -> CommitPlan:
+    # Leaves are committed first: a node comes once all its children are
+    # planned and among the available leaves the latest node comes first.
+    # The graph is only read.
+    remaining_children = {node: G.G.out_degree(node) for node in G.G.nodes()}
+    leaves = [-node for node, count in remaining_children.items() if count == 0]
+    heapq.heapify(leaves)
+
+    solution_nodes: list[SolutionNode] = []
+    skipped_nodes: list[int] = []
+    number_of_planned_nodes = 0
+
+    while len(leaves) > 0:
+        leaf = -heapq.heappop(leaves)
+        number_of_planned_nodes += 1
+
+        node = G.G.nodes[leaf]
+        if node["node_type"] == "solution":
+            if node["status"] == "handled":
+                solution_nodes.append(G.get_solution_node(leaf))
+            else:
+                skipped_nodes.append(leaf)
+
+        for parent in G.G.predecessors(leaf):
+            remaining_children[parent] -= 1
+            if remaining_children[parent] == 0:
+                heapq.heappush(leaves, -parent)
+
+    # If this assertion is false then it means that
+    # there is part of the graph that we can't commit
+    assert number_of_planned_nodes == G.get_number_of_nodes()
+
+    return CommitPlan(solution_nodes=solution_nodes, skipped_nodes=skipped_nodes)
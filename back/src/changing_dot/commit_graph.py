@@ -1,22 +1,18 @@
-from typing import TYPE_CHECKING, Any, cast
+from typing import Any
 
 from changing_dot_visualize.observer import Observer
 from git import Repo
 
 from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.changing_graph.graph_journal import GraphJournal
 from changing_dot.commit.commit_edits import commit_edits
+from changing_dot.commit.commit_plan import plan_commits
 from changing_dot.commit.conflict_handler import (
     IConflictHandler,
     create_openai_conflict_handler,
 )
-from changing_dot.custom_types import Commit, SolutionNode
+from changing_dot.custom_types import Commit
 from changing_dot.modifyle.modifyle import IModifyle, IntegralModifyle
-from changing_dot.utils.process_pickle_files import process_pickle_files
-
-if TYPE_CHECKING:
-    from changing_dot.custom_types import (
-        BlockEdit,
-    )
 
 
 def commit_graph(
@@ -30,39 +26,19 @@ def commit_graph(
     repo = Repo(commit.git_path)
 
     base_branch_name = commit.branch_name
-    leaves = G.get_leaves()
 
     observer.log("Starting to commit")
 
-    list_of_solution_nodes: list[SolutionNode] = []
-
-    while len(leaves) > 0:
-        leaf = leaves.pop()
-
-        node = G.get_node(leaf)
-
-        if node.node_type == "solution":
-            node = cast(SolutionNode, node)
-            if node.status != "handled":
-                observer.log(
-                    f"Removing node {node.index} because of status {node.status}"
-                )
-                G.remove_node(leaf)
-                continue
+    plan = plan_commits(G)
 
-            observer.log(f"adding solution {leaf} to commits to apply")
+    for node_index in plan.skipped_nodes:
+        observer.log(
+            f"Skipping node {node_index} because of status {G.get_node(node_index).status}"
+        )
+    for node in plan.solution_nodes:
+        observer.log(f"adding solution {node.index} to commits to apply")
 
-            list_of_solution_nodes.append(node)
-
-        observer.log(f"Removed from graph node {leaf}")
-        G.remove_node(leaf)
-        leaves = G.get_leaves()
-
-    # If this assertion is false then it means that
-    # there is part of the graph that we can't commit
-    assert G.get_number_of_nodes() == 0
-
-    edits_list: list[list[BlockEdit]] = [node.edits for node in list_of_solution_nodes]
+    edits_list = plan.get_edits_list()
 
     observer.log("Got list of all edits, committing the changes one by one")
 
@@ -71,6 +47,7 @@ def commit_graph(
     )
 
     observer.save_graph_state()
+    observer.flush()
 
 
 def run_commit_graph(
@@ -78,22 +55,21 @@ def run_commit_graph(
     commit: Commit,
     output_path: str,
 ) -> None:
-    graphs = process_pickle_files(f"{output_path}/{iteration_name}/")
+    journal = GraphJournal(f"{output_path}/{iteration_name}/")
 
     file_modifier: IModifyle = IntegralModifyle()
 
-    G = ChangingGraph(graphs[-1])
+    G = ChangingGraph(journal.load_latest())
 
-    observer = Observer(
+    with Observer(
         G,
         iteration_name,
         output_folder=output_path,
-        step=len(graphs),
-    )
-
-    conflict_handler = create_openai_conflict_handler()
+        step=journal.number_of_steps,
+    ) as observer:
+        conflict_handler = create_openai_conflict_handler()
 
-    commit_graph(G, file_modifier, observer, conflict_handler, commit)
+        commit_graph(G, file_modifier, observer, conflict_handler, commit)
 
 
 def run_commit_graph_from_config(config: dict[str, Any]) -> None:
@@ -3,3 +3,5 @@ from pathlib import Path
 PROJECT_ROOT_PATH = Path(__file__).parents[1]
 
 CDOT_PATH = Path.home() / ".cdot"
+
+PARSE_CACHE_PATH = CDOT_PATH / "parse_cache"
@@ -10,3 +10,6 @@ ANAYLZER_URL = (
     if os.environ.get("ANALYZER_URL") is not None
     else "localhost:5177"
 )
+
+# Reduced files are cached in PARSE_CACHE_PATH between runs only when asked
+PARSE_CACHE_ENABLED = os.environ.get("PARSE_CACHE") == "true"
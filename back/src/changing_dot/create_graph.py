@@ -75,32 +75,31 @@ def run_create_graph(
         folder_to_analyse, analyzer_options.language
     )
 
-    observer = Observer(
+    with Observer(
         G,
         iteration_name,
         output_path,
-    )
-
-    interpreter = create_instruction_interpreter(observer, llm_provider)
-
-    initialisation = ErrorInitialization(
-        init_type="error",
-        initial_error=initial_change.error,
-        initial_file_path=initial_change.file_path,
-        initial_error_position=initial_change.error_position,
-    )
+    ) as observer:
+        interpreter = create_instruction_interpreter(observer, llm_provider)
+
+        initialisation = ErrorInitialization(
+            init_type="error",
+            initial_error=initial_change.error,
+            initial_file_path=initial_change.file_path,
+            initial_error_position=initial_change.error_position,
+        )
 
-    create_graph(
-        G,
-        DG,
-        initialisation,
-        error_manager,
-        instruction_manager,
-        interpreter,
-        file_modifier,
-        observer,
-        restriction_options,
-    )
+        create_graph(
+            G,
+            DG,
+            initialisation,
+            error_manager,
+            instruction_manager,
+            interpreter,
+            file_modifier,
+            observer,
+            restriction_options,
+        )
 
 
 def create_graph(
@@ -137,9 +136,8 @@ def create_graph(
     pending_nodes = G.get_all_pending_nodes()
     observer.log(f"Continuing on all {len(pending_nodes)} next nodes")
 
-    while len(pending_nodes) > 0:
-        node_index = pending_nodes[0]
-
+    node_index = G.get_next_pending_node()
+    while node_index is not None:
         handle_node(
             G,
             DG,
@@ -151,10 +149,12 @@ def create_graph(
             instruction_manager,
         )
 
-        pending_nodes = G.get_all_pending_nodes()
+        node_index = G.get_next_pending_node()
 
     file_modifier.revert_changes(DG)
 
     optimize_graph(G, observer)
 
     observer.log("Finished")
+
+    observer.flush()
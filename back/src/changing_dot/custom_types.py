@@ -55,12 +55,22 @@ class ErrorInitialization(BaseModel):
 Initialization = ErrorInitialization
 
 
+CompileErrorKey = tuple[str, tuple[int, int, int, int], str]
+
+
 class CompileError(BaseModel):
     text: str
     file_path: str
     project_name: str
     pos: tuple[int, int, int, int]
 
+    # Errors are the same whatever their project and the form of their path.
+    # Not cached: a pickled error would keep the path resolved from the
+    # working directory of the run that saved it
+    @property
+    def key(self) -> CompileErrorKey:
+        return os.path.abspath(self.file_path), self.pos, self.text
+
 
 NodeStatus = Literal["pending"] | Literal["handled"] | Literal["failed"]
 
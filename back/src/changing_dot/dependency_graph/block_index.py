@@ -0,0 +1,82 @@
+import bisect
+
+Point = tuple[int, int]
+
+
+class FileBlockIndex:
+    # Blocks of a file sorted by start point and by end point, so that
+    # positional queries are a binary search away
+    starts: list[tuple[Point, int]]
+    ends: list[tuple[Point, int]]
+
+    def __init__(self) -> None:
+        self.starts = []
+        self.ends = []
+
+    def add(self, node_index: int, start_point: Point, end_point: Point) -> None:
+        bisect.insort(self.starts, (start_point, node_index))
+        bisect.insort(self.ends, (end_point, node_index))
+
+    def remove(self, node_index: int, start_point: Point, end_point: Point) -> None:
+        del self.starts[bisect.bisect_left(self.starts, (start_point, node_index))]
+        del self.ends[bisect.bisect_left(self.ends, (end_point, node_index))]
+
+    def get_blocks_ending_after(self, point: Point) -> list[int]:
+        position = bisect.bisect_right(self.ends, point, key=lambda item: item[0])
+        return [node_index for _, node_index in self.ends[position:]]
+
+    def get_last_block_starting_at_or_before(self, row: int) -> int | None:
+        position = bisect.bisect_right(self.starts, row, key=lambda item: item[0][0])
+        if position == 0:
+            return None
+        return self.starts[position - 1][1]
+
+    def get_blocks(self) -> list[int]:
+        return [node_index for _, node_index in self.starts]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class BlockIndex:
+    file_indexes: dict[str, FileBlockIndex]
+
+    def __init__(self) -> None:
+        self.file_indexes = {}
+
+    def add(
+        self, file_path: str, node_index: int, start_point: Point, end_point: Point
+    ) -> None:
+        file_index = self.file_indexes.get(file_path)
+        if file_index is None:
+            file_index = FileBlockIndex()
+            self.file_indexes[file_path] = file_index
+        file_index.add(node_index, start_point, end_point)
+
+    def remove(
+        self, file_path: str, node_index: int, start_point: Point, end_point: Point
+    ) -> None:
+        file_index = self.file_indexes[file_path]
+        file_index.remove(node_index, start_point, end_point)
+        if len(file_index) == 0:
+            del self.file_indexes[file_path]
+
+    def get_blocks_ending_after(self, file_path: str, point: Point) -> list[int]:
+        file_index = self.file_indexes.get(file_path)
+        if file_index is None:
+            return []
+        return file_index.get_blocks_ending_after(point)
+
+    def get_last_block_starting_at_or_before(
+        self, file_path: str, row: int
+    ) -> int | None:
+        file_index = self.file_indexes.get(file_path)
+        if file_index is None:
+            return None
+        return file_index.get_last_block_starting_at_or_before(row)
+
+    def get_file_blocks(self, file_path: str) -> list[int]:
+        file_index = self.file_indexes.get(file_path)
+        if file_index is None:
+            return []
+        return file_index.get_blocks()
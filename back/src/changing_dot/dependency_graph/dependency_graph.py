@@ -1,150 +1,550 @@
-import copy
-from collections.abc import Generator
-from typing import Any, TypedDict
+import bisect
+import hashlib
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, NamedTuple
 
 import networkx as nx
+from changing_dot.config.constants import PARSE_CACHE_PATH
+from changing_dot.config.environment import PARSE_CACHE_ENABLED
 from changing_dot.custom_types import BlockEdit
+from changing_dot.dependency_graph.block_index import BlockIndex
 from changing_dot.dependency_graph.language_matchers import ILanguageMatcher
+from changing_dot.dependency_graph.node_store import NodeRecord, NodeStore, NodeView
 from changing_dot.dependency_graph.node_type_to_terminal import (
+    get_language_from_file_path,
     get_matcher_from_file_path,
     parser_from_file_path,
 )
+from changing_dot.dependency_graph.parse_cache import ParseCache
 from changing_dot.dependency_graph.types import (
+    BlockSpan,
     DependencyGraphNode,
     DependencyGraphNodeType,
     DependencyGraphNodeWithIndex,
     DependencyGraphRelation,
+    ReducedNode,
     RelationType,
     SupportedLanguages,
 )
 from changing_dot.utils.file_utils import get_csharp_files, get_python_files
-from changing_dot.utils.text_functions import read_text
-from changing_dot.utils.tree_sitter_utils import get_node_text_from_file_path
+from changing_dot.utils.text_functions import read_source, read_text
+from changing_dot.utils.tree_sitter_utils import (
+    SourceEdit,
+    edit_tree,
+    get_node_text_from_source,
+    get_point_from_byte,
+    get_source_edits,
+    map_end_byte,
+)
 from tree_sitter import Node, Tree
 
 
-def iterate_nodes(node: Node) -> Generator[Node | Any, Any, None]:
-    yield node
-    for child in node.children:
-        yield from iterate_nodes(child)
-
-
 def remove_comments(text: str) -> str:
     return "\n".join(
         line for line in text.split("\n") if not line.strip().startswith("//")
     )
 
 
-class MementoState(TypedDict):
-    G: nx.DiGraph
-    next_index: int
-    trees: list[str]
-    file_path_to_language_matcher: dict[str, ILanguageMatcher]
+def get_text_to_match(text: str) -> str:
+    return remove_comments(text).replace(" ", "").replace("\n", "")
+
+
+# Below this number of files, spawning worker processes costs more than it saves
+PARALLEL_PARSING_MIN_FILES = 64
+
+
+def get_comment_node(node: Node) -> Node | None:
+    if node.prev_sibling is not None and node.prev_sibling.type == "comment":
+        return node.prev_sibling
+    return None
+
+
+def get_block_span(node: Node) -> BlockSpan:
+    comment_node = get_comment_node(node)
+    if comment_node is None:
+        return BlockSpan(
+            node.start_byte, node.start_byte, node.start_byte, node.end_byte
+        )
+    return BlockSpan(
+        comment_node.start_byte,
+        comment_node.end_byte,
+        node.start_byte,
+        node.end_byte,
+    )
 
 
-class Memento:
-    def __init__(self, state: MementoState):
-        self._state = state
+def create_node_record_from_ast_node(
+    node: Node,
+    file_path: str,
+    node_type: DependencyGraphNodeType,
+) -> NodeRecord:
+    comment_node = get_comment_node(node)
 
-    def get_state(self) -> MementoState:
-        return self._state
+    start_point = node.start_point if comment_node is None else comment_node.start_point
+
+    return NodeRecord(
+        node_type,
+        start_point,
+        node.end_point,
+        file_path,
+        get_block_span(node),
+    )
+
+
+def reduce_ast_node(
+    node: Node,
+    language_matcher: ILanguageMatcher,
+    reduced_nodes: list[ReducedNode],
+    include_node: bool = True,
+) -> None:
+    # Blocks come parents first, the parent of a block is the last block
+    # containing it. The tree is walked by the query engine, without recursion.
+    ancestors: list[tuple[Node, int]] = []
+
+    for block_node, node_type in language_matcher.match_blocks(node):
+        if not include_node and block_node == node:
+            continue
+        while len(ancestors) > 0 and not (
+            block_node.start_byte < ancestors[-1][0].end_byte
+            and block_node.end_byte <= ancestors[-1][0].end_byte
+        ):
+            ancestors.pop()
+
+        comment_node = get_comment_node(block_node)
+        start_point = (
+            block_node.start_point if comment_node is None else comment_node.start_point
+        )
+        reduced_nodes.append(
+            (
+                node_type,
+                start_point,
+                block_node.end_point,
+                get_block_span(block_node),
+                ancestors[-1][1] if len(ancestors) > 0 else None,
+            )
+        )
+        ancestors.append((block_node, len(reduced_nodes) - 1))
+
+
+def reduce_file(
+    file_path: str, source: bytes | None = None
+) -> tuple[bytes, list[ReducedNode]] | None:
+    # Runs in worker processes: trees can not be pickled, so only the source
+    # and the reduced nodes are sent back. The file is read unless its source
+    # is given.
+    parser = parser_from_file_path(file_path)
+    if parser is None:
+        return None
+    if source is None:
+        source = read_source(file_path)
+    tree = parser.parse(source)
+    reduced_nodes: list[ReducedNode] = []
+    reduce_ast_node(
+        tree.root_node, get_matcher_from_file_path(file_path), reduced_nodes
+    )
+    return source, reduced_nodes
+
+
+def get_source_digest(source: bytes) -> bytes:
+    return hashlib.blake2b(source, digest_size=16).digest()
+
+
+def count_file_blocks(file_path: str) -> tuple[int, bool | None, bytes] | None:
+    # Number of blocks of a file, whether it has syntax errors and the digest
+    # of its source. Nothing of the tree or of the source is kept.
+    parser = parser_from_file_path(file_path)
+    if parser is None:
+        return None
+    source = read_source(file_path)
+    tree = parser.parse(source)
+    number_of_blocks = len(
+        get_matcher_from_file_path(file_path).match_blocks(tree.root_node)
+    )
+    return number_of_blocks, tree.root_node.has_error, get_source_digest(source)
+
+
+def get_relation(
+    node_type: DependencyGraphNodeType, node_index: int, parent_index: int
+) -> tuple[int, int, RelationType]:
+    if node_type == "Constructor":
+        return node_index, parent_index, "Constructs/ConstructedBy"
+    return parent_index, node_index, "ParentOf/ChildOf"
+
+
+# File of a lazy graph that is not parsed yet. Its blocks get the indexes from
+# start_index, as in a graph built upfront. The digest tells whether the file
+# changed before it was parsed. Whether it has syntax errors is not known when
+# its blocks were counted from the parse cache.
+class PendingFile(NamedTuple):
+    start_index: int
+    number_of_blocks: int
+    source_digest: bytes
+    has_syntax_errors: bool | None
+
+
+EdgeWithAttributes = tuple[int, int, dict[str, Any]]
+
+
+class Transaction:
+    def __init__(self, next_index: int) -> None:
+        self.next_index = next_index
+        self.undo_operations: list[Callable[[], None]] = []
+        # Sources of the files as they were when the transaction began
+        self.original_sources: dict[str, bytes] = {}
 
 
 class DependencyGraph:
-    def __init__(self, file_paths: list[str]) -> None:
+    def __init__(
+        self,
+        file_paths: list[str],
+        workers: int = 1,
+        parse_cache: ParseCache | None = None,
+        lazy: bool = False,
+    ) -> None:
+        # G holds the relations between nodes, their attributes are in store
         self.G: nx.DiGraph = nx.DiGraph()
-        self.next_index: int = 0
         self.trees: dict[str, Tree] = {}
+        self.sources: dict[str, bytes] = {}
+        self.store = NodeStore(self.sources)
+        self.block_index = BlockIndex()
+        self.next_index: int = 0
+        self.workers = workers
+        self.parse_cache = parse_cache
         self.file_path_to_language_matcher: dict[str, ILanguageMatcher] = {
             path: get_matcher_from_file_path(path) for path in file_paths
         }
-        self.create_graph_from_file_paths(sorted(set(file_paths)))
-        self._saved_state: Memento
-
-    def save_state(self) -> None:
-        state: MementoState = {
-            "G": copy.deepcopy(self.G),
-            "next_index": self.next_index,
-            "trees": list(self.trees.keys()),
-            "file_path_to_language_matcher": copy.deepcopy(
-                self.file_path_to_language_matcher
-            ),
-        }
-        memento = Memento(state)
-        self._saved_state = memento
+        self.transactions: list[Transaction] = []
+        # In a lazy graph, a file is parsed the first time one of its blocks or
+        # its tree is requested
+        self.pending_files: dict[str, PendingFile] = {}
+        self.reserved_file_starts: list[tuple[int, str]] = []
+        if lazy:
+            self.reserve_file_indexes(sorted(set(file_paths)))
+        else:
+            self.create_graph_from_file_paths(sorted(set(file_paths)))
+
+    # Transactions only record what changed, rolling back costs about as much
+    # as the changes themselves. They can be nested.
+    def begin(self) -> None:
+        self.transactions.append(Transaction(self.next_index))
+
+    def commit(self) -> None:
+        transaction = self.transactions.pop()
+        if len(self.transactions) == 0:
+            return
+        parent_transaction = self.transactions[-1]
+        parent_transaction.undo_operations.extend(transaction.undo_operations)
+        for file_path, source in transaction.original_sources.items():
+            parent_transaction.original_sources.setdefault(file_path, source)
+
+    def rollback(self) -> None:
+        transaction = self.transactions.pop()
+        for undo_operation in reversed(transaction.undo_operations):
+            undo_operation()
+        self.next_index = transaction.next_index
+        for file_path, source in transaction.original_sources.items():
+            self.restore_source(file_path, source)
+
+    def record_undo_operation(self, undo_operation: Callable[[], None]) -> None:
+        if len(self.transactions) > 0:
+            self.transactions[-1].undo_operations.append(undo_operation)
+
+    def record_source(self, file_path: str) -> None:
+        if len(self.transactions) > 0:
+            self.transactions[-1].original_sources.setdefault(
+                file_path, self.sources[file_path]
+            )
 
-    def revert(self) -> None:
-        assert self._saved_state
-        previous_state = self._saved_state.get_state()
-        for path in previous_state["trees"]:
-            parser = parser_from_file_path(path)
-            if parser is None:
-                continue
-            code = read_text(path)
-            tree = parser.parse(bytes(code, "utf8"))
-            self.trees[path] = tree
-        self.G = previous_state["G"]
-        self.next_index = previous_state["next_index"]
-        self.file_path_to_language_matcher = previous_state[
-            "file_path_to_language_matcher"
-        ]
+    def restore_source(self, file_path: str, source: bytes) -> None:
+        current_source = self.sources[file_path]
+        self.sources[file_path] = source
+
+        tree = self.trees.get(file_path)
+        if tree is None:
+            return
+
+        parser = parser_from_file_path(file_path)
+        assert parser is not None
+        source_edits = get_source_edits(current_source, source)
+        edit_tree(tree, current_source, source, source_edits)
+        self.trees[file_path] = parser.parse(source, tree)
 
     def create_graph_from_file_paths(self, file_paths: list[str]) -> None:
+        reductions: dict[str, list[ReducedNode]] = {}
+        # Sources read to look up the cache are parsed without reading the
+        # files again
+        loaded_sources: dict[str, bytes] = {}
+
+        if self.parse_cache is not None:
+            for path in file_paths:
+                if get_language_from_file_path(path) is None:
+                    continue
+                loaded_sources[path] = self.load_source(path)
+                cached_reduced_nodes = self.parse_cache.get(path, loaded_sources[path])
+                if cached_reduced_nodes is not None:
+                    reductions[path] = cached_reduced_nodes
+
+        paths_to_parse = [path for path in file_paths if path not in reductions]
+
+        if self.workers > 1 and len(paths_to_parse) > 1:
+            parsed_reductions = self.reduce_files_in_parallel(
+                paths_to_parse, loaded_sources
+            )
+        else:
+            parsed_reductions = self.reduce_files(paths_to_parse, loaded_sources)
+
+        if self.parse_cache is not None:
+            for path, reduced_nodes in parsed_reductions.items():
+                self.parse_cache.set(path, self.sources[path], reduced_nodes)
+            self.parse_cache.evict()
+
+        reductions.update(parsed_reductions)
+
+        # Adding files in the order of file_paths keeps the indexes the same
+        # whatever was cached or parsed in parallel
+        for path in file_paths:
+            if path in reductions:
+                self.add_reduced_nodes(path, reductions[path])
+
+    def reserve_file_indexes(self, file_paths: list[str]) -> None:
+        block_counts: dict[str, tuple[int, bool | None, bytes]] = {}
+
+        if self.parse_cache is not None:
+            for path in file_paths:
+                if get_language_from_file_path(path) is None:
+                    continue
+                source = read_source(path)
+                cached_reduced_nodes = self.parse_cache.get(path, source)
+                if cached_reduced_nodes is not None:
+                    block_counts[path] = (
+                        len(cached_reduced_nodes),
+                        None,
+                        get_source_digest(source),
+                    )
+
+        paths_to_count = [path for path in file_paths if path not in block_counts]
+
+        if self.workers > 1 and len(paths_to_count) > 1:
+            chunksize = max(1, len(paths_to_count) // (self.workers * 4))
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                counts = list(
+                    executor.map(count_file_blocks, paths_to_count, chunksize=chunksize)
+                )
+        else:
+            counts = [count_file_blocks(path) for path in paths_to_count]
+
+        for path, count in zip(paths_to_count, counts, strict=True):
+            if count is not None:
+                block_counts[path] = count
+
+        # Ranges follow the order of file_paths, as the indexes of a graph
+        # built upfront
+        for path in file_paths:
+            if path not in block_counts:
+                continue
+            number_of_blocks, has_syntax_errors, source_digest = block_counts[path]
+            self.pending_files[path] = PendingFile(
+                self.next_index, number_of_blocks, source_digest, has_syntax_errors
+            )
+            self.reserved_file_starts.append((self.next_index, path))
+            self.next_index += number_of_blocks
+
+    # Nodes of a file are added without being recorded by transactions: they
+    # are the blocks of the file as it was when the graph was created
+    def materialize_file(self, file_path: str) -> None:
+        pending_file = self.pending_files.pop(file_path, None)
+        if pending_file is None:
+            return
+
+        source = self.load_source(file_path)
+        assert (
+            get_source_digest(source) == pending_file.source_digest
+        ), f"{file_path} changed before it was parsed"
+
+        reduced_nodes = (
+            self.parse_cache.get(file_path, source)
+            if self.parse_cache is not None
+            else None
+        )
+        if reduced_nodes is None:
+            reduced_nodes = self.reduce_files([file_path], {file_path: source})[
+                file_path
+            ]
+            if self.parse_cache is not None:
+                self.parse_cache.set(file_path, source, reduced_nodes)
+        assert len(reduced_nodes) == pending_file.number_of_blocks
+
+        for position, (
+            node_type,
+            start_point,
+            end_point,
+            span,
+            parent_position,
+        ) in enumerate(reduced_nodes):
+            node_index = pending_file.start_index + position
+            self.insert_node(
+                node_index,
+                NodeRecord(node_type, start_point, end_point, file_path, span),
+            )
+            if parent_position is not None:
+                source_index, target_index, relation_type = get_relation(
+                    node_type, node_index, pending_file.start_index + parent_position
+                )
+                self.G.add_edge(source_index, target_index, relation_type=relation_type)
+
+    def materialize_index(self, index: int) -> None:
+        position = (
+            bisect.bisect_right(
+                self.reserved_file_starts, index, key=lambda item: item[0]
+            )
+            - 1
+        )
+        if position < 0:
+            return
+        start_index, file_path = self.reserved_file_starts[position]
+        pending_file = self.pending_files.get(file_path)
+        if (
+            pending_file is not None
+            and index < start_index + pending_file.number_of_blocks
+        ):
+            self.materialize_file(file_path)
+
+    def materialize_all_files(self) -> None:
+        for file_path in list(self.pending_files):
+            self.materialize_file(file_path)
+
+    def reduce_files(
+        self, file_paths: list[str], loaded_sources: dict[str, bytes]
+    ) -> dict[str, list[ReducedNode]]:
+        reductions: dict[str, list[ReducedNode]] = {}
         for path in file_paths:
             parser = parser_from_file_path(path)
             if parser is None:
                 continue
-            code = read_text(path)
-            tree = parser.parse(bytes(code, "utf8"))
-            self.create_graph_from_tree(tree, path)
+            source = loaded_sources.get(path)
+            if source is None:
+                source = self.load_source(path)
+            tree = parser.parse(source)
             self.trees[path] = tree
+            reduced_nodes: list[ReducedNode] = []
+            reduce_ast_node(
+                tree.root_node, self.file_path_to_language_matcher[path], reduced_nodes
+            )
+            reductions[path] = reduced_nodes
+        return reductions
+
+    def reduce_files_in_parallel(
+        self, file_paths: list[str], loaded_sources: dict[str, bytes]
+    ) -> dict[str, list[ReducedNode]]:
+        reductions: dict[str, list[ReducedNode]] = {}
+        chunksize = max(1, len(file_paths) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(
+                reduce_file,
+                file_paths,
+                [loaded_sources.get(path) for path in file_paths],
+                chunksize=chunksize,
+            )
+            for path, reduction in zip(file_paths, results, strict=True):
+                if reduction is None:
+                    continue
+                source, reduced_nodes = reduction
+                self.sources[path] = source
+                reductions[path] = reduced_nodes
+        return reductions
+
+    def get_tree(self, file_path: str) -> Tree:
+        self.materialize_file(file_path)
+        # Trees built by worker processes are not sent back, parse them on demand
+        tree = self.trees.get(file_path)
+        if tree is None:
+            parser = parser_from_file_path(file_path)
+            assert parser is not None
+            tree = parser.parse(self.sources[file_path])
+            self.trees[file_path] = tree
+        return tree
+
+    def load_source(self, file_path: str) -> bytes:
+        source = read_source(file_path)
+        self.sources[file_path] = source
+        return source
+
+    # Code to check is the text of the edited file, on disk or in memory
+    def check_edit(self, edit: BlockEdit, code_to_check: str) -> None:
+        # Check that edit file_path and block ID are compatible
+        node = self.get_node(edit.block_id)
+        assert node.file_path == edit.file_path, "This block is not in this file"
+
+        assert edit.before.replace(" ", "").replace("\n", "") in node.text.replace(
+            " ", ""
+        ).replace("\n", ""), "The before does not match the text in block"
+
+        # Check that the files have actually been changed before updating graph
+        assert edit.after.replace(" ", "").replace("\n", "") in code_to_check.replace(
+            " ", ""
+        ).replace("\n", ""), "The files have not been modified"
 
     def update_graph_from_edits(self, edits: list[BlockEdit]) -> None:
         for edit in edits:
-            code_to_check = read_text(edit.file_path)
-
-            # Check that edit file_path and block ID are compatible
-            node = self.get_node(edit.block_id)
-            assert node.file_path == edit.file_path, "This block is not in this file"
-
-            assert edit.before.replace(" ", "").replace("\n", "") in node.text.replace(
-                " ", ""
-            ).replace("\n", ""), "The before does not match the text in block"
-
-            # Check that the files have actually been changed before updating graph
-            assert edit.after.replace(" ", "").replace(
-                "\n", ""
-            ) in code_to_check.replace(" ", "").replace(
-                "\n", ""
-            ), "The files have not been modified"
+            self.check_edit(edit, read_text(edit.file_path))
 
         for edit in edits:
-            original_start_point = self.get_node(edit.block_id).start_point[0]
             parent_nodes = self.get_parent_nodes(edit.block_id)
             children_nodes = self.get_children_nodes(edit.block_id)
 
             parser = parser_from_file_path(edit.file_path)
             if parser is None:
                 continue
-            code = read_text(edit.file_path)
-            new_tree = parser.parse(bytes(code, "utf8"))
+
+            # Incremental reparse: tree-sitter reuses the old tree outside of
+            # the edited ranges
+            old_tree = self.get_tree(edit.file_path)
+            old_source = self.sources[edit.file_path]
+            self.record_source(edit.file_path)
+            new_source = self.load_source(edit.file_path)
+            source_edits = get_source_edits(old_source, new_source)
+            edit_tree(old_tree, old_source, new_source, source_edits)
+            new_tree = parser.parse(new_source, old_tree)
             self.trees[edit.file_path] = new_tree
 
+            # Blocks that end before the first change are left as they are,
+            # the others are shifted or rebuilt
+            first_changed_byte = min(
+                [source_edit.old_start_byte for source_edit in source_edits]
+                + [
+                    changed_range.start_byte
+                    for changed_range in old_tree.changed_ranges(new_tree)
+                ],
+                default=len(old_source),
+            )
+            ignored_nodes = {edit.block_id, *parent_nodes, *children_nodes}
+            nodes_to_shift = [
+                index
+                for index in self.block_index.get_blocks_ending_after(
+                    edit.file_path, get_point_from_byte(old_source, first_changed_byte)
+                )
+                if index not in ignored_nodes
+            ]
+
             # update the node
             ast_node = self.update_node_given_tree_and_text(
-                new_tree, edit.block_id, edit.after
+                new_tree, edit.block_id, edit.after, source_edits
             )
 
             # update the parent nodes
             for parent_node_index in parent_nodes:
-                parent_node = self.get_node(parent_node_index)
+                parent_text = self.store.get_text(parent_node_index, old_source)
 
-                new_parent_text = parent_node.text.replace(edit.before, edit.after)
+                new_parent_text = parent_text.replace(edit.before, edit.after)
 
                 self.update_node_given_tree_and_text(
                     new_tree,
                     parent_node_index,
                     new_parent_text,
+                    source_edits,
                 )
             # remove all the children nodes and replace them
             for child_node_index in children_nodes:
@@ -152,90 +552,178 @@ class DependencyGraph:
 
             # if ast node is none then there are no children
             if ast_node is not None:
-                for ast_child in ast_node.named_children:
-                    self.traverse_and_reduce(ast_child, edit.file_path, edit.block_id)
+                self.traverse_and_reduce(
+                    ast_node, edit.file_path, edit.block_id, include_node=False
+                )
 
             # update all nodes that are below the node ( that may shift )
-            for other_node in self.get_nodes_with_index():
-                # compare to start_point because new end
-                # point might be lower that old one
-                if (
-                    other_node.file_path == edit.file_path
-                    and other_node.end_point[0] > original_start_point
-                ):
-                    self.update_node_given_tree_and_text(
-                        new_tree,
-                        other_node.index,
-                        other_node.text,
-                    )
+            for other_node_index in nodes_to_shift:
+                self.update_node_given_tree_and_text(
+                    new_tree,
+                    other_node_index,
+                    self.store.get_text(other_node_index, old_source),
+                    source_edits,
+                )
 
     def create_graph_from_tree(self, tree: Tree, file_path: str) -> None:
         self.traverse_and_reduce(tree.root_node, file_path)
 
     def add_edge(self, source: int, target: int, relation_type: RelationType) -> None:
+        previous_attributes = self.G.get_edge_data(source, target)
+        if previous_attributes is None:
+            self.record_undo_operation(partial(self.G.remove_edge, source, target))
+        else:
+            self.record_undo_operation(
+                partial(self.G.add_edge, source, target, **previous_attributes)
+            )
         self.G.add_edge(source, target, relation_type=relation_type)
 
-    def add_node(self, node: DependencyGraphNode) -> int:
+    def add_node(self, record: NodeRecord) -> int:
         index = self.next_index
-        self.G.add_node(
-            index,
-            node_type=node.node_type,
-            start_point=node.start_point,
-            end_point=node.end_point,
-            file_path=node.file_path,
-            text=node.text,
-        )
+        self.insert_node(index, record)
+        self.record_undo_operation(partial(self.discard_node, index))
         self.next_index += 1
         return index
 
     def remove_node(self, node_index: int) -> None:
-        self.G.remove_node(node_index)
+        if len(self.transactions) > 0:
+            edges: list[EdgeWithAttributes] = [
+                *self.G.in_edges(node_index, data=True),
+                *self.G.out_edges(node_index, data=True),
+            ]
+            self.record_undo_operation(
+                partial(
+                    self.insert_node,
+                    node_index,
+                    self.store.get(node_index),
+                    edges,
+                )
+            )
+        self.discard_node(node_index)
 
-    def update_node(self, index: int, node: DependencyGraphNode) -> None:
-        self.G.nodes[index]["node_type"] = node.node_type
-        self.G.nodes[index]["start_point"] = node.start_point
-        self.G.nodes[index]["end_point"] = node.end_point
-        self.G.nodes[index]["file_path"] = node.file_path
-        self.G.nodes[index]["text"] = node.text
+    def update_node(self, index: int, record: NodeRecord) -> None:
+        self.record_undo_operation(
+            partial(self.set_node_record, index, self.store.get(index))
+        )
+        self.set_node_record(index, record)
+
+    # The methods below change the graph without recording anything
+    def insert_node(
+        self,
+        index: int,
+        record: NodeRecord,
+        edges: list[EdgeWithAttributes] | None = None,
+    ) -> None:
+        self.G.add_node(index)
+        self.store.set(index, record)
+        self.block_index.add(
+            record.file_path, index, record.start_point, record.end_point
+        )
+        if edges is not None:
+            self.G.add_edges_from(edges)
+
+    def discard_node(self, index: int) -> None:
+        self.block_index.remove(
+            self.store.get_file_path(index),
+            index,
+            self.store.get_start_point(index),
+            self.store.get_end_point(index),
+        )
+        self.G.remove_node(index)
+
+    def set_node_record(self, index: int, record: NodeRecord) -> None:
+        self.block_index.remove(
+            self.store.get_file_path(index),
+            index,
+            self.store.get_start_point(index),
+            self.store.get_end_point(index),
+        )
+        self.block_index.add(
+            record.file_path, index, record.start_point, record.end_point
+        )
+        self.store.set(index, record)
 
     def get_number_of_nodes(self) -> int:
-        n: int = nx.number_of_nodes(self.G)
+        n: int = nx.number_of_nodes(self.G) + sum(
+            pending_file.number_of_blocks
+            for pending_file in self.pending_files.values()
+        )
         return n
 
+    def get_node_view(self, index: int) -> NodeView:
+        if index not in self.G:
+            self.materialize_index(index)
+        if index not in self.G:
+            raise KeyError(index)
+        return NodeView(self.store, index)
+
+    # Views do not copy the attributes of the nodes, prefer them to the
+    # pydantic nodes when going through the whole graph
+    def get_node_views(self) -> Iterator[NodeView]:
+        self.materialize_all_files()
+        for index in sorted(self.G.nodes()):
+            yield NodeView(self.store, index)
+
     def get_node(self, index: int) -> DependencyGraphNode:
-        node = self.G.nodes()[index]
-        return DependencyGraphNode(**node)
+        return self.get_node_view(index).to_node()
 
     def get_node_with_index(self, index: int) -> DependencyGraphNodeWithIndex:
-        node = self.G.nodes()[index]
-        return DependencyGraphNodeWithIndex(**node, index=index)
+        return self.get_node_view(index).to_node_with_index()
 
     def get_node_by_type(
         self, node_type: DependencyGraphNodeType
     ) -> list[DependencyGraphNode]:
         return [
-            DependencyGraphNode(**self.G.nodes()[index])
-            for index in self.G.nodes()
-            if self.G.nodes()[index]["node_type"] == node_type
+            node_view.to_node()
+            for node_view in self.get_node_views()
+            if node_view.node_type == node_type
         ]
 
     def get_nodes(self) -> list[DependencyGraphNode]:
-        return [
-            DependencyGraphNode(**self.G.nodes()[index]) for index in self.G.nodes()
-        ]
+        return [node_view.to_node() for node_view in self.get_node_views()]
 
     def get_nodes_with_index(self) -> list[DependencyGraphNodeWithIndex]:
+        return [node_view.to_node_with_index() for node_view in self.get_node_views()]
+
+    def get_file_nodes_with_index(
+        self, file_path: str
+    ) -> list[DependencyGraphNodeWithIndex]:
+        self.materialize_file(file_path)
         return [
-            DependencyGraphNodeWithIndex(**self.G.nodes()[index], index=index)
-            for index in self.G.nodes()
+            self.get_node_with_index(index)
+            for index in sorted(self.block_index.get_file_blocks(file_path))
         ]
 
+    def get_enclosing_node_index(self, file_path: str, line: int) -> int | None:
+        # Blocks of a file are nested or disjoint, so the innermost block
+        # enclosing the line is the last block starting before it or one of
+        # its ancestors
+        self.materialize_file(file_path)
+        node_index = self.block_index.get_last_block_starting_at_or_before(
+            file_path, line
+        )
+        while node_index is not None:
+            if self.store.get_end_point(node_index)[0] >= line:
+                return node_index
+            node_index = self.get_enclosing_parent(node_index)
+        return None
+
+    def get_enclosing_parent(self, index: int) -> int | None:
+        for parent, _, relation_type in self.G.in_edges(index, data="relation_type"):
+            if relation_type == "ParentOf/ChildOf":
+                return int(parent)
+        for _, parent, relation_type in self.G.out_edges(index, data="relation_type"):
+            if relation_type == "Constructs/ConstructedBy":
+                return int(parent)
+        return None
+
     def get_parent_child_relations(
         self,
     ) -> list[DependencyGraphRelation]:
+        self.materialize_all_files()
         parent_child_relations: list[DependencyGraphRelation] = []
 
-        for i, j, metadata in self.G.edges(data=True):
+        for i, j, metadata in sorted(self.G.edges(data=True)):
             parent_child_relations.append(
                 DependencyGraphRelation(
                     origin=self.get_node_with_index(i),
@@ -247,7 +735,16 @@ class DependencyGraph:
         return parent_child_relations
 
     def has_syntax_errors(self) -> bool:
-        return any(tree.root_node.has_error for tree in self.trees.values())
+        if any(
+            pending_file.has_syntax_errors
+            for pending_file in self.pending_files.values()
+        ):
+            return True
+        # Files counted from the parse cache were not parsed
+        for file_path, pending_file in list(self.pending_files.items()):
+            if pending_file.has_syntax_errors is None:
+                self.materialize_file(file_path)
+        return any(self.get_tree(path).root_node.has_error for path in self.sources)
 
     def get_parent_nodes(self, index: int) -> list[int]:
         return list(nx.ancestors(self.G, index))
@@ -260,8 +757,9 @@ class DependencyGraph:
         new_tree: Tree,
         node_index: int,
         text: str,
+        source_edits: list[SourceEdit] | None = None,
     ) -> Node | None:
-        text_to_match = remove_comments(text).replace(" ", "").replace("\n", "")
+        text_to_match = get_text_to_match(text)
 
         # edge case where you remove a block
         # In that case you can't find a node in tree-sitter, because it doen not
@@ -270,104 +768,138 @@ class DependencyGraph:
             self.remove_node(node_index)
             return None
 
-        node = self.get_node(node_index)
-
-        language_matcher = self.file_path_to_language_matcher[node.file_path]
+        file_path = self.store.get_file_path(node_index)
+        node_type = self.store.get_node_type(node_index)
 
-        matched_nodes = [
-            ast_node
-            for ast_node in iterate_nodes(new_tree.root_node)
-            if language_matcher.match_class(ast_node) == node.node_type
-            and ast_node.text is not None
-            and isinstance(ast_node.text, bytes)
-            and remove_comments(ast_node.text.decode("utf-8"))
-            .replace(" ", "")
-            .replace("\n", "")
-            == remove_comments(text).replace(" ", "").replace("\n", "")
-        ]
+        language_matcher = self.file_path_to_language_matcher[file_path]
 
-        assert len(matched_nodes) == 1
+        source = self.sources[file_path]
 
-        updated_node = self.create_graph_node_from_ast_node(
-            matched_nodes[0], node.file_path
+        # Fast path: follow the block through the edits and check that it still
+        # holds the expected text
+        matched_node = (
+            self.find_shifted_ast_node(new_tree, node_index, source_edits)
+            if source_edits is not None
+            else None
         )
 
-        assert updated_node is not None
+        if (
+            matched_node is None
+            or get_text_to_match(get_node_text_from_source(matched_node, source))
+            != text_to_match
+        ):
+            matched_nodes = [
+                ast_node
+                for ast_node, ast_node_type in language_matcher.match_blocks(
+                    new_tree.root_node
+                )
+                if ast_node_type == node_type
+                and get_text_to_match(get_node_text_from_source(ast_node, source))
+                == text_to_match
+            ]
 
-        # update match nodes
-        self.update_node(node_index, updated_node)
+            assert len(matched_nodes) == 1
 
-        return matched_nodes[0]
+            matched_node = matched_nodes[0]
 
-    def traverse_and_reduce(
-        self, node: Node, file_path: str, parent_index: int | None = None
-    ) -> None:
-        node_index = None
+        # update match nodes
+        self.update_node(
+            node_index,
+            create_node_record_from_ast_node(matched_node, file_path, node_type),
+        )
 
-        new_node = self.create_graph_node_from_ast_node(node, file_path)
+        return matched_node
 
-        if new_node is not None:
-            node_index = self.add_node(new_node)
-            relation_type: RelationType = (
-                "Constructs/ConstructedBy"
-                if new_node.node_type == "Constructor"
-                else "ParentOf/ChildOf"
-            )
+    def find_shifted_ast_node(
+        self, new_tree: Tree, node_index: int, source_edits: list[SourceEdit]
+    ) -> Node | None:
+        end_byte = map_end_byte(source_edits, self.store.end_bytes[node_index])
 
-            if parent_index is not None:
-                if relation_type == "Constructs/ConstructedBy":
-                    self.add_edge(node_index, parent_index, relation_type)
-                else:
-                    self.add_edge(parent_index, node_index, relation_type)
+        if end_byte is None or end_byte == 0:
+            return None
 
-        for child in node.children:
-            self.traverse_and_reduce(
-                child, file_path, node_index if node_index is not None else parent_index
-            )
+        language_matcher = self.file_path_to_language_matcher[
+            self.store.get_file_path(node_index)
+        ]
+        node_type = self.store.get_node_type(node_index)
 
-    def create_graph_node_from_ast_node(
-        self, node: Node, file_path: str
-    ) -> DependencyGraphNode | None:
-        comment_node = None
+        # Blocks end with their last token, go up from it until the block type
+        ast_node: Node | None = new_tree.root_node.descendant_for_byte_range(
+            end_byte - 1, end_byte
+        )
+        while ast_node is not None and ast_node.end_byte == end_byte:
+            if language_matcher.match_class(ast_node) == node_type:
+                return ast_node
+            ast_node = ast_node.parent
 
-        if node.prev_sibling is not None and node.prev_sibling.type == "comment":
-            comment_node = node.prev_sibling
+        return None
 
-        comment_text = (
-            f"{comment_node.text.decode('utf-8')}\n"
-            if comment_node is not None and isinstance(comment_node.text, bytes)
-            else ""
+    def traverse_and_reduce(
+        self,
+        node: Node,
+        file_path: str,
+        parent_index: int | None = None,
+        include_node: bool = True,
+    ) -> None:
+        reduced_nodes: list[ReducedNode] = []
+        reduce_ast_node(
+            node,
+            self.file_path_to_language_matcher[file_path],
+            reduced_nodes,
+            include_node,
         )
+        self.add_reduced_nodes(file_path, reduced_nodes, parent_index)
 
-        start_point = (
-            node.start_point if comment_node is None else comment_node.start_point
-        )
+    def add_reduced_nodes(
+        self,
+        file_path: str,
+        reduced_nodes: list[ReducedNode],
+        parent_index: int | None = None,
+    ) -> None:
+        node_indexes: list[int] = []
 
-        node_type: DependencyGraphNodeType | None = self.file_path_to_language_matcher[
-            file_path
-        ].match_class(node)
+        for node_type, start_point, end_point, span, parent_position in reduced_nodes:
+            node_index = self.add_node(
+                NodeRecord(node_type, start_point, end_point, file_path, span)
+            )
+            node_indexes.append(node_index)
 
-        if node_type is None:
-            return None
+            node_parent_index = (
+                parent_index
+                if parent_position is None
+                else node_indexes[parent_position]
+            )
 
-        return DependencyGraphNode(
-            node_type=node_type,
-            start_point=start_point,
-            end_point=node.end_point,
-            file_path=file_path,
-            text=f"{comment_text}{get_node_text_from_file_path(node, file_path)}",
-        )
+            if node_parent_index is None:
+                continue
+
+            self.add_edge(*get_relation(node_type, node_index, node_parent_index))
+
+
+def get_default_number_of_workers(file_paths: list[str]) -> int:
+    if len(file_paths) < PARALLEL_PARSING_MIN_FILES:
+        return 1
+    return os.cpu_count() or 1
 
 
 def create_dependency_graph_from_folder(
-    folder_path: str, language: SupportedLanguages
+    folder_path: str,
+    language: SupportedLanguages,
+    workers: int | None = None,
+    parse_cache: ParseCache | None = None,
+    lazy: bool = True,
 ) -> DependencyGraph:
     if language == "python":
-        python_files = get_python_files(folder_path)
-        return DependencyGraph(python_files)
-    if language == "c_sharp":
-        python_files = get_csharp_files(folder_path)
-        return DependencyGraph(python_files)
-
+        file_paths = get_python_files(folder_path)
+    elif language == "c_sharp":
+        file_paths = get_csharp_files(folder_path)
     else:
         raise NotImplementedError("This language is not implemented yet")
+
+    if workers is None:
+        workers = get_default_number_of_workers(file_paths)
+
+    if parse_cache is None and PARSE_CACHE_ENABLED:
+        parse_cache = ParseCache(PARSE_CACHE_PATH)
+
+    return DependencyGraph(file_paths, workers, parse_cache, lazy)
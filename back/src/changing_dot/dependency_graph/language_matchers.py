@@ -1,84 +1,106 @@
 from changing_dot.dependency_graph.types import (
+    NODE_TYPES,
     DependencyGraphNodeType,
 )
-from tree_sitter import Node
+from tree_sitter import Language, Node
 
-TerminalToNodeType = dict[str, DependencyGraphNodeType]
+# Bump when a matcher changes, cached reductions of files are keyed by it
+MATCHERS_VERSION = 2
 
+MatchedBlock = tuple[Node, DependencyGraphNodeType]
 
-class ILanguageMatcher:
-    def match_class(self, ast_node: Node) -> DependencyGraphNodeType | None:
-        raise NotImplementedError()
 
+# Blocks of a language are selected by a tree-sitter query, compiled once and
+# run in one pass over a tree. Each block is captured under its node type, when
+# a node is captured more than once the first pattern of the query wins.
+class ILanguageMatcher:
+    query_source = ""
+
+    def __init__(self, language: Language | None = None) -> None:
+        self.query = (
+            language.query(self.query_source)
+            if language is not None and self.query_source != ""
+            else None
+        )
+
+    def match_blocks(
+        self,
+        ast_node: Node,
+        start_byte: int | None = None,
+        end_byte: int | None = None,
+    ) -> list[MatchedBlock]:
+        # Blocks in ast_node, parents before their children
+        if self.query is None:
+            return []
+
+        captures = (
+            self.query.captures(ast_node)
+            if start_byte is None or end_byte is None
+            else self.query.captures(ast_node, start_byte=start_byte, end_byte=end_byte)
+        )
+
+        matched_blocks: dict[int, MatchedBlock] = {}
+        for captured_node, capture_name in captures:
+            if capture_name not in NODE_TYPES or captured_node.id in matched_blocks:
+                continue
+            matched_blocks[captured_node.id] = (captured_node, capture_name)
+
+        return sorted(
+            matched_blocks.values(),
+            key=lambda matched_block: (
+                matched_block[0].start_byte,
+                -matched_block[0].end_byte,
+            ),
+        )
 
-class EmptyMatcher(ILanguageMatcher):
     def match_class(self, ast_node: Node) -> DependencyGraphNodeType | None:
+        # Patterns can capture a node through its children, so the captures of
+        # the whole node are kept and not the ones of a byte range
+        for matched_node, node_type in self.match_blocks(ast_node):
+            if matched_node == ast_node:
+                return node_type
         return None
 
 
-c_sharp_terminal_to_node_type: TerminalToNodeType = {
-    "class_declaration": "Class",
-    "method_declaration": "Method",
-    "constructor_declaration": "Constructor",
-    "field_declaration": "Field",
-    "property_declaration": "Field",
-    "using_directive": "Import",
-}
+class EmptyMatcher(ILanguageMatcher):
+    pass
 
 
 class CSharpMatcher(ILanguageMatcher):
-    def match_class(self, ast_node: Node) -> DependencyGraphNodeType | None:
-        return c_sharp_terminal_to_node_type.get(ast_node.type)
-
-
-python_terminal_to_node_type: TerminalToNodeType = {
-    "class_definition": "Class",
-    "function_definition": "Method",
-    "import_statement": "Import",
-}
+    query_source = """
+        (class_declaration) @Class
+        (method_declaration) @Method
+        (constructor_declaration) @Constructor
+        (field_declaration) @Field
+        (property_declaration) @Field
+        (using_directive) @Import
+    """
 
 
 class PythonMatcher(ILanguageMatcher):
-    def match_class(self, ast_node: Node) -> DependencyGraphNodeType | None:
-        node_type = python_terminal_to_node_type.get(ast_node.type)
-
-        if (
-            node_type == "Method"
-            and ast_node.text is not None
-            and "def __init__(" in ast_node.text.decode("utf-8")
-        ):
-            node_type = "Constructor"
-
-        return node_type
-
-
-pip_req_terminal_to_node_type: TerminalToNodeType = {
-    "requirement": "Method",
-}
+    query_source = """
+        ((function_definition name: (identifier) @_name) @Constructor
+            (#eq? @_name "__init__"))
+        (class_definition) @Class
+        (function_definition) @Method
+        (import_statement) @Import
+    """
 
 
 class PipReqMatcher(ILanguageMatcher):
-    def match_class(self, ast_node: Node) -> DependencyGraphNodeType | None:
-        return pip_req_terminal_to_node_type.get(ast_node.type)
+    query_source = """
+        (requirement) @Method
+    """
 
 
 class XmlMatcher(ILanguageMatcher):
-    def match_class(self, ast_node: Node) -> DependencyGraphNodeType | None:
-        if ast_node.type == "element":
-            return "Method"
-        return None
+    query_source = """
+        (element) @Method
+    """
 
 
+# Only elements holding other elements are blocks
 class CsProjMatcher(ILanguageMatcher):
-    def match_class(self, ast_node: Node) -> DependencyGraphNodeType | None:
-        if ast_node.type == "element" and self.has_element_descendant(ast_node):
-            return "Method"
-        return None
-
-    def has_element_descendant(self, node: Node) -> bool:
-        for child in node.children:
-            if child.type == "element":
-                return True
-            if self.has_element_descendant(child):
-                return True
-        return False
+    query_source = """
+        (element (content (element))) @Method
+    """
@@ -0,0 +1,170 @@
+from array import array
+from typing import NamedTuple
+
+from changing_dot.dependency_graph.types import (
+    NODE_TYPES,
+    BlockSpan,
+    DependencyGraphNode,
+    DependencyGraphNodeType,
+    DependencyGraphNodeWithIndex,
+)
+
+NODE_TYPE_CODES: dict[DependencyGraphNodeType, int] = {
+    node_type: code for code, node_type in enumerate(NODE_TYPES)
+}
+
+
+def get_block_text(source: bytes, span: BlockSpan) -> str:
+    if span.body_start_byte == span.start_byte:
+        return source[span.start_byte : span.end_byte].decode("utf-8")
+    comment_text = source[span.start_byte : span.comment_end_byte].decode("utf-8")
+    body_text = source[span.body_start_byte : span.end_byte].decode("utf-8")
+    return f"{comment_text}\n{body_text}"
+
+
+class NodeRecord(NamedTuple):
+    node_type: DependencyGraphNodeType
+    start_point: tuple[int, int]
+    end_point: tuple[int, int]
+    file_path: str
+    span: BlockSpan
+
+
+# Attributes of the dependency graph nodes, one typed array per attribute and
+# one slot per node index. File paths are interned and texts are not stored:
+# they are read from the current source of the file when requested.
+class NodeStore:
+    def __init__(self, sources: dict[str, bytes]) -> None:
+        self.sources = sources
+        self.node_types = array("B")
+        self.start_rows = array("i")
+        self.start_columns = array("i")
+        self.end_rows = array("i")
+        self.end_columns = array("i")
+        self.file_ids = array("i")
+        self.start_bytes = array("q")
+        self.comment_end_bytes = array("q")
+        self.body_start_bytes = array("q")
+        self.end_bytes = array("q")
+        self.file_paths: list[str] = []
+        self.file_ids_by_path: dict[str, int] = {}
+
+    def get_file_id(self, file_path: str) -> int:
+        file_id = self.file_ids_by_path.get(file_path)
+        if file_id is None:
+            file_id = len(self.file_paths)
+            self.file_paths.append(file_path)
+            self.file_ids_by_path[file_path] = file_id
+        return file_id
+
+    def set(self, index: int, record: NodeRecord) -> None:
+        # Indexes only grow, except when a rollback gives back the last ones
+        while len(self.node_types) <= index:
+            self.node_types.append(0)
+            self.start_rows.append(0)
+            self.start_columns.append(0)
+            self.end_rows.append(0)
+            self.end_columns.append(0)
+            self.file_ids.append(0)
+            self.start_bytes.append(0)
+            self.comment_end_bytes.append(0)
+            self.body_start_bytes.append(0)
+            self.end_bytes.append(0)
+
+        self.node_types[index] = NODE_TYPE_CODES[record.node_type]
+        self.start_rows[index], self.start_columns[index] = record.start_point
+        self.end_rows[index], self.end_columns[index] = record.end_point
+        self.file_ids[index] = self.get_file_id(record.file_path)
+        self.start_bytes[index] = record.span.start_byte
+        self.comment_end_bytes[index] = record.span.comment_end_byte
+        self.body_start_bytes[index] = record.span.body_start_byte
+        self.end_bytes[index] = record.span.end_byte
+
+    def get(self, index: int) -> NodeRecord:
+        return NodeRecord(
+            self.get_node_type(index),
+            self.get_start_point(index),
+            self.get_end_point(index),
+            self.get_file_path(index),
+            self.get_span(index),
+        )
+
+    def get_node_type(self, index: int) -> DependencyGraphNodeType:
+        return NODE_TYPES[self.node_types[index]]
+
+    def get_start_point(self, index: int) -> tuple[int, int]:
+        return self.start_rows[index], self.start_columns[index]
+
+    def get_end_point(self, index: int) -> tuple[int, int]:
+        return self.end_rows[index], self.end_columns[index]
+
+    def get_file_path(self, index: int) -> str:
+        return self.file_paths[self.file_ids[index]]
+
+    def get_span(self, index: int) -> BlockSpan:
+        return BlockSpan(
+            self.start_bytes[index],
+            self.comment_end_bytes[index],
+            self.body_start_bytes[index],
+            self.end_bytes[index],
+        )
+
+    def get_text(self, index: int, source: bytes | None = None) -> str:
+        # source gives the text of the node in an other version of its file
+        if source is None:
+            source = self.sources[self.get_file_path(index)]
+        return get_block_text(source, self.get_span(index))
+
+    def get_node(self, index: int) -> DependencyGraphNode:
+        return DependencyGraphNode(
+            node_type=self.get_node_type(index),
+            start_point=self.get_start_point(index),
+            end_point=self.get_end_point(index),
+            file_path=self.get_file_path(index),
+            text=self.get_text(index),
+        )
+
+    def get_node_with_index(self, index: int) -> DependencyGraphNodeWithIndex:
+        return DependencyGraphNodeWithIndex(
+            node_type=self.get_node_type(index),
+            start_point=self.get_start_point(index),
+            end_point=self.get_end_point(index),
+            file_path=self.get_file_path(index),
+            text=self.get_text(index),
+            index=index,
+        )
+
+
+# Read-only view on a node of the store, attributes are read when accessed
+class NodeView:
+    __slots__ = ("store", "index")
+
+    def __init__(self, store: NodeStore, index: int) -> None:
+        self.store = store
+        self.index = index
+
+    @property
+    def node_type(self) -> DependencyGraphNodeType:
+        return self.store.get_node_type(self.index)
+
+    @property
+    def start_point(self) -> tuple[int, int]:
+        return self.store.get_start_point(self.index)
+
+    @property
+    def end_point(self) -> tuple[int, int]:
+        return self.store.get_end_point(self.index)
+
+    @property
+    def file_path(self) -> str:
+        return self.store.get_file_path(self.index)
+
+    @property
+    def text(self) -> str:
+        return self.store.get_text(self.index)
+
+    def to_node(self) -> DependencyGraphNode:
+        return self.store.get_node(self.index)
+
+    def to_node_with_index(self) -> DependencyGraphNodeWithIndex:
+        return self.store.get_node_with_index(self.index)
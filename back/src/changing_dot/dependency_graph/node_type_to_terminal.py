@@ -1,5 +1,7 @@
-import tree_sitter_c_sharp as tscsharp
-from cdot_tree_sitter_python import language as language_py
+import threading
+from functools import cache
+from typing import Literal
+
 from changing_dot.dependency_graph.language_matchers import (
     CSharpMatcher,
     CsProjMatcher,
@@ -12,8 +14,6 @@ from changing_dot.dependency_graph.language_matchers import (
 from changing_dot.dependency_graph.types import SupportedLanguages
 from changing_dot.utils.file_utils import get_file_extension
 from tree_sitter import Language, Parser
-from tree_sitter_requirements import language as language_pip_requirements
-from tree_sitter_xml import language_xml
 
 extension_to_language: dict["str", SupportedLanguages] = {
     "py": "python",
@@ -34,10 +34,52 @@ def get_language_from_file_path(file_path: str) -> SupportedLanguages | None:
     return language
 
 
-PY_LANGUAGE = Language(language_py())
-PIP_REQ_LANGUAGE = Language(language_pip_requirements())
-CS_LANGUAGE = Language(tscsharp.language())
-XML_LANGUAGE = Language(language_xml())
+# xml and csproj files share the same grammar
+Grammar = Literal["python", "c_sharp", "xml", "pip_requirements"]
+
+language_to_grammar: dict[SupportedLanguages, Grammar] = {
+    "python": "python",
+    "c_sharp": "c_sharp",
+    "xml": "xml",
+    "csproj": "xml",
+    "pip_requirements": "pip_requirements",
+}
+
+
+# Grammars are imported on first use, a run only loads the ones of its files
+@cache
+def get_grammar_language(grammar: Grammar) -> Language:
+    if grammar == "python":
+        from cdot_tree_sitter_python import language as language_py
+
+        return Language(language_py())
+    if grammar == "c_sharp":
+        import tree_sitter_c_sharp as tscsharp
+
+        return Language(tscsharp.language())
+    if grammar == "xml":
+        from tree_sitter_xml import language_xml
+
+        return Language(language_xml())
+    from tree_sitter_requirements import language as language_pip_requirements
+
+    return Language(language_pip_requirements())
+
+
+# Parsers are reused, each thread has its own as they can not be shared
+parser_pool = threading.local()
+
+
+def get_parser(grammar: Grammar) -> Parser:
+    parsers: dict[Grammar, Parser] | None = getattr(parser_pool, "parsers", None)
+    if parsers is None:
+        parsers = {}
+        parser_pool.parsers = parsers
+    parser = parsers.get(grammar)
+    if parser is None:
+        parser = Parser(get_grammar_language(grammar))
+        parsers[grammar] = parser
+    return parser
 
 
 def parser_from_file_path(file_path: str) -> Parser | None:
@@ -45,14 +87,7 @@ def parser_from_file_path(file_path: str) -> Parser | None:
 
     if language is None:
         return None
-    if language == "python":
-        return Parser(PY_LANGUAGE)
-    if language == "c_sharp":
-        return Parser(CS_LANGUAGE)
-    if language == "xml" or language == "csproj":
-        return Parser(XML_LANGUAGE)
-    if language == "pip_requirements":
-        return Parser(PIP_REQ_LANGUAGE)
+    return get_parser(language_to_grammar[language])
 
 
 def get_matcher_from_file_path(
@@ -64,16 +99,19 @@ def get_matcher_from_file_path(
     return get_matcher_from_language(language_or_none)
 
 
+# Matchers hold compiled queries, they are built once per language
+@cache
 def get_matcher_from_language(
     language: SupportedLanguages,
 ) -> ILanguageMatcher:
+    grammar_language = get_grammar_language(language_to_grammar[language])
     if language == "c_sharp":
-        return CSharpMatcher()
+        return CSharpMatcher(grammar_language)
     if language == "python":
-        return PythonMatcher()
+        return PythonMatcher(grammar_language)
     if language == "xml":
-        return XmlMatcher()
+        return XmlMatcher(grammar_language)
     if language == "csproj":
-        return CsProjMatcher()
+        return CsProjMatcher(grammar_language)
     if language == "pip_requirements":
-        return PipReqMatcher()
+        return PipReqMatcher(grammar_language)
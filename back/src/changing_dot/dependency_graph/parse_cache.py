@@ -0,0 +1,100 @@
+import hashlib
+import os
+import pickle
+import zlib
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from changing_dot.dependency_graph.language_matchers import MATCHERS_VERSION
+from changing_dot.dependency_graph.types import ReducedNode
+
+GRAMMAR_PACKAGES = [
+    "tree-sitter",
+    "tree-sitter-c-sharp",
+    "cdot-tree-sitter-python",
+    "tree-sitter-requirements",
+    "tree-sitter-xml",
+]
+
+# Bump when the format of the entries changes
+CACHE_FORMAT_VERSION = 2
+
+DEFAULT_MAX_CACHE_SIZE = 256 * 1024 * 1024
+
+
+def get_package_version(package: str) -> str:
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def get_versions_key() -> str:
+    grammar_versions = ",".join(
+        f"{package}={get_package_version(package)}" for package in GRAMMAR_PACKAGES
+    )
+    return (
+        f"{grammar_versions};matchers={MATCHERS_VERSION};format={CACHE_FORMAT_VERSION}"
+    )
+
+
+# Reduced nodes only hold types, points and spans: texts are read back from
+# the source of the file
+def serialize_reduced_nodes(reduced_nodes: list[ReducedNode]) -> bytes:
+    return zlib.compress(pickle.dumps(reduced_nodes, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def deserialize_reduced_nodes(data: bytes) -> list[ReducedNode]:
+    reduced_nodes: list[ReducedNode] = pickle.loads(zlib.decompress(data))
+    return reduced_nodes
+
+
+# Reduced nodes of parsed files, stored on disk so that a file that did not
+# change since the last run is not parsed again
+class ParseCache:
+    def __init__(
+        self, cache_path: str | Path, max_size: int = DEFAULT_MAX_CACHE_SIZE
+    ) -> None:
+        self.cache_path = Path(cache_path)
+        self.max_size = max_size
+        self.versions_key = get_versions_key()
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+
+    def get_entry_path(self, file_path: str, source: bytes) -> Path:
+        content_hash = hashlib.sha256(source).hexdigest()
+        key = f"{os.path.abspath(file_path)}\0{content_hash}\0{self.versions_key}"
+        return self.cache_path / f"{hashlib.sha256(key.encode()).hexdigest()}.bin"
+
+    def get(self, file_path: str, source: bytes) -> list[ReducedNode] | None:
+        entry_path = self.get_entry_path(file_path, source)
+        try:
+            data = entry_path.read_bytes()
+            reduced_nodes = deserialize_reduced_nodes(data)
+        except FileNotFoundError:
+            return None
+        except (zlib.error, pickle.UnpicklingError, ValueError, EOFError):
+            entry_path.unlink(missing_ok=True)
+            return None
+        # The modification time orders entries for the LRU eviction
+        os.utime(entry_path)
+        return reduced_nodes
+
+    def set(
+        self, file_path: str, source: bytes, reduced_nodes: list[ReducedNode]
+    ) -> None:
+        entry_path = self.get_entry_path(file_path, source)
+        temporary_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        temporary_path.write_bytes(serialize_reduced_nodes(reduced_nodes))
+        os.replace(temporary_path, entry_path)
+
+    def evict(self) -> None:
+        entries = [
+            (entry.stat().st_mtime, entry.stat().st_size, entry)
+            for entry in self.cache_path.glob("*.bin")
+        ]
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total_size <= self.max_size:
+                break
+            entry.unlink(missing_ok=True)
+            total_size -= size
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, NamedTuple, get_args
 
 from pydantic import BaseModel
 
@@ -7,6 +7,8 @@ SupportedLanguages = Literal["python", "c_sharp", "xml", "csproj", "pip_requirem
 
 DependencyGraphNodeType = Literal["Import", "Class", "Method", "Constructor", "Field"]
 
+NODE_TYPES: tuple[DependencyGraphNodeType, ...] = get_args(DependencyGraphNodeType)
+
 
 class DependencyGraphNode(BaseModel):
     node_type: DependencyGraphNodeType
@@ -20,6 +22,23 @@ class DependencyGraphNodeWithIndex(DependencyGraphNode):
     index: int
 
 
+# Bytes of a block in the source of its file. A block can start with the
+# comment above it, its text is then the comment and the body joined by a
+# newline. Without a comment, body_start_byte is start_byte.
+class BlockSpan(NamedTuple):
+    start_byte: int
+    comment_end_byte: int
+    body_start_byte: int
+    end_byte: int
+
+
+# Type, start point, end point and span of a reduced node, and the position of
+# its parent in the same reduction list
+ReducedNode = tuple[
+    DependencyGraphNodeType, tuple[int, int], tuple[int, int], BlockSpan, int | None
+]
+
+
 RelationType = Literal["ParentOf/ChildOf", "Constructs/ConstructedBy"]
 
 
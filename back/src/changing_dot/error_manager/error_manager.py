@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 
-from changing_dot.custom_types import CompileError, RestrictionOptions
+from changing_dot.custom_types import BlockEdit, CompileError, RestrictionOptions
+from changing_dot.dependency_graph.dependency_graph import DependencyGraph
+from changing_dot.modifyle.modifyle import applied_edits_context
 from changing_dot_visualize.observer import Observer
 
 
@@ -13,6 +15,30 @@ class IErrorManager(ABC):
     def has_syntax_errors(self) -> bool:
         pass
 
+    # Checks of the code with edits applied. By default the edits are written
+    # to the files, which are restored after the check.
+    def get_compile_errors_with_edits(
+        self, DG: DependencyGraph, edits: list[BlockEdit], observer: Observer
+    ) -> list[CompileError]:
+        with applied_edits_context(DG, edits):
+            return self.get_compile_errors(observer)
+
+    def is_error_solved_with_edits(
+        self,
+        DG: DependencyGraph,
+        edits: list[BlockEdit],
+        compile_error: CompileError,
+        observer: Observer,
+    ) -> bool:
+        compile_errors = self.get_compile_errors_with_edits(DG, edits, observer)
+        return compile_error.key not in {error.key for error in compile_errors}
+
+    def has_syntax_errors_with_edits(
+        self, DG: DependencyGraph, edits: list[BlockEdit]
+    ) -> bool:
+        with applied_edits_context(DG, edits):
+            return self.has_syntax_errors()
+
 
 class HardCodedErrorManager(IErrorManager):
     i: int = 0
@@ -1,17 +1,28 @@
+import os
+
 import grpc
 from changing_dot.config.environment import ANAYLZER_URL
-from changing_dot.custom_types import CompileError, RestrictionOptions
+from changing_dot.custom_types import BlockEdit, CompileError, RestrictionOptions
+from changing_dot.dependency_graph.dependency_graph import DependencyGraph
 from changing_dot.error_manager.error_manager import (
     IErrorManager,
     filter_restricted_errors,
 )
 from changing_dot.generated_grpc.feedback_server_pb2 import (
+    CheckEditsReply,
+    CheckEditsRequest,
+    DocumentText,
+    Error,
     GetCompileErrorsRequest,
+    GetDiagnosticDeltaRequest,
+    GetDocumentDiagnosticsReply,
+    GetDocumentDiagnosticsRequest,
     HasSyntaxErrorsRequest,
 )
 from changing_dot.generated_grpc.feedback_server_pb2_grpc import (
     FeedbackServerStub,
 )
+from changing_dot.modifyle.modifyle import get_edited_texts
 from changing_dot_visualize.observer import Observer
 
 grpc_options = [
@@ -20,10 +31,30 @@ grpc_options = [
 ]
 
 
+def get_document_texts(edited_texts: dict[str, str]) -> list[DocumentText]:
+    return [
+        DocumentText(filePath=os.path.abspath(file_path), text=text)
+        for file_path, text in edited_texts.items()
+    ]
+
+
+def to_compile_error(error: Error) -> CompileError:
+    return CompileError(
+        text=error.errorText,
+        file_path=error.filePath,
+        project_name=error.projectName,
+        pos=tuple(error.position),
+    )
+
+
 class RoslynErrorManager(IErrorManager):
     solution_file_path: str
     analyzer_url: str
     restriction_options: RestrictionOptions
+    # Errors of the last snapshot of the analyzer read by this manager, in
+    # the order of the analyzer
+    snapshot_id: int | None
+    analyzer_errors: list[CompileError]
 
     def __init__(
         self, solution_file_path: str, restriction_options: RestrictionOptions
@@ -32,40 +63,65 @@ class RoslynErrorManager(IErrorManager):
         self.restriction_options = restriction_options
         assert ANAYLZER_URL is not None
         self.analyzer_url = ANAYLZER_URL
+        self.snapshot_id = None
+        self.analyzer_errors = []
 
     def get_compile_errors(self, observer: Observer) -> list[CompileError]:
+        return self.get_filtered_compile_errors(self.fetch_compile_errors(), observer)
+
+    # Once a snapshot of the errors is known, only the errors added and removed
+    # since are sent by the analyzer
+    def fetch_compile_errors(self) -> list[CompileError]:
         with grpc.insecure_channel(self.analyzer_url, options=grpc_options) as channel:
             stub = FeedbackServerStub(channel)
-            error_response = stub.GetCompileErrors(
-                GetCompileErrorsRequest(filePath=self.solution_file_path)
-            )
-            compile_errors: list[CompileError] = [
-                CompileError(
-                    text=error.errorText,
-                    file_path=error.filePath,
-                    project_name=error.projectName,
-                    pos=tuple(error.position),
+            if self.snapshot_id is None:
+                error_response = stub.GetCompileErrors(
+                    GetCompileErrorsRequest(filePath=self.solution_file_path)
+                )
+                self.analyzer_errors = [
+                    to_compile_error(error) for error in error_response.Errors
+                ]
+                self.snapshot_id = error_response.snapshotId
+            else:
+                delta_response = stub.GetDiagnosticDelta(
+                    GetDiagnosticDeltaRequest(
+                        filePath=self.solution_file_path,
+                        sinceSnapshot=self.snapshot_id,
+                    )
                 )
-                for error in error_response.Errors
-            ]
+                # Order indexes the errors of the snapshot followed by the
+                # added ones
+                known_errors = [] if delta_response.isFull else self.analyzer_errors
+                known_errors = known_errors + [
+                    to_compile_error(error) for error in delta_response.added
+                ]
+                self.analyzer_errors = [
+                    known_errors[index] for index in delta_response.order
+                ]
+                self.snapshot_id = delta_response.snapshotId
 
-            unique_line_pos_tuples = set()
-            result: list[CompileError] = []
+        return list(self.analyzer_errors)
 
-            # Remove when 2 errors are on the same line for now
-            for error in compile_errors:
-                new_line_pos_tuple = (error.file_path, error.pos[0])
-                if new_line_pos_tuple not in unique_line_pos_tuples:
-                    unique_line_pos_tuples.add(new_line_pos_tuple)
-                    result.append(error)
+    def get_filtered_compile_errors(
+        self, compile_errors: list[CompileError], observer: Observer
+    ) -> list[CompileError]:
+        unique_line_pos_tuples = set()
+        result: list[CompileError] = []
 
-            observer.log(f"found {len(result)} compile_errors")
+        # Remove when 2 errors are on the same line for now
+        for error in compile_errors:
+            new_line_pos_tuple = (error.file_path, error.pos[0])
+            if new_line_pos_tuple not in unique_line_pos_tuples:
+                unique_line_pos_tuples.add(new_line_pos_tuple)
+                result.append(error)
 
-            filtered_errors = filter_restricted_errors(
-                result, self.restriction_options, observer
-            )
+        observer.log(f"found {len(result)} compile_errors")
+
+        filtered_errors = filter_restricted_errors(
+            result, self.restriction_options, observer
+        )
 
-            return filtered_errors
+        return filtered_errors
 
     def has_syntax_errors(self) -> bool:
         with grpc.insecure_channel(self.analyzer_url, options=grpc_options) as channel:
@@ -75,3 +131,90 @@ class RoslynErrorManager(IErrorManager):
             )
             has_syntax_errors: bool = has_syntax_error_response.HasSyntaxErrors
             return has_syntax_errors
+
+    # Edits are checked by the analyzer against its loaded solution, the files
+    # are not written. Edits that overlap are still applied on disk.
+    def check_edits(
+        self, edited_texts: dict[str, str], syntax_only: bool
+    ) -> CheckEditsReply:
+        with grpc.insecure_channel(self.analyzer_url, options=grpc_options) as channel:
+            stub = FeedbackServerStub(channel)
+            check_edits_response: CheckEditsReply = stub.CheckEdits(
+                CheckEditsRequest(
+                    filePath=self.solution_file_path,
+                    documents=get_document_texts(edited_texts),
+                    syntaxOnly=syntax_only,
+                )
+            )
+            return check_edits_response
+
+    def get_compile_errors_with_edits(
+        self, DG: DependencyGraph, edits: list[BlockEdit], observer: Observer
+    ) -> list[CompileError]:
+        edited_texts = get_edited_texts(DG, edits)
+        if edited_texts is None:
+            return super().get_compile_errors_with_edits(DG, edits, observer)
+
+        check_edits_response = self.check_edits(edited_texts, syntax_only=False)
+        return self.get_filtered_compile_errors(
+            [to_compile_error(error) for error in check_edits_response.Errors],
+            observer,
+        )
+
+    def has_syntax_errors_with_edits(
+        self, DG: DependencyGraph, edits: list[BlockEdit]
+    ) -> bool:
+        edited_texts = get_edited_texts(DG, edits)
+        if edited_texts is None:
+            return super().has_syntax_errors_with_edits(DG, edits)
+
+        has_syntax_errors: bool = self.check_edits(
+            edited_texts, syntax_only=True
+        ).HasSyntaxErrors
+        return has_syntax_errors
+
+    def get_document_diagnostics(
+        self, edited_texts: dict[str, str], compile_error: CompileError
+    ) -> GetDocumentDiagnosticsReply:
+        with grpc.insecure_channel(self.analyzer_url, options=grpc_options) as channel:
+            stub = FeedbackServerStub(channel)
+            document_response: GetDocumentDiagnosticsReply = (
+                stub.GetDocumentDiagnostics(
+                    GetDocumentDiagnosticsRequest(
+                        filePath=self.solution_file_path,
+                        documents=get_document_texts(edited_texts),
+                        documentPath=os.path.abspath(compile_error.file_path),
+                        startLine=compile_error.pos[0],
+                        endLine=compile_error.pos[2],
+                    )
+                )
+            )
+            return document_response
+
+    # Only the lines of the error in its document are analyzed, the whole
+    # solution is compiled when the document is not known to the analyzer
+    def is_error_solved_with_edits(
+        self,
+        DG: DependencyGraph,
+        edits: list[BlockEdit],
+        compile_error: CompileError,
+        observer: Observer,
+    ) -> bool:
+        edited_texts = get_edited_texts(DG, edits)
+        if edited_texts is None:
+            return super().is_error_solved_with_edits(
+                DG, edits, compile_error, observer
+            )
+
+        document_response = self.get_document_diagnostics(edited_texts, compile_error)
+
+        if not document_response.documentFound:
+            return super().is_error_solved_with_edits(
+                DG, edits, compile_error, observer
+            )
+
+        document_error_keys = {
+            to_compile_error(error).key for error in document_response.Errors
+        }
+        observer.log(f"found {len(document_error_keys)} errors around the problem")
+        return compile_error.key not in document_error_keys
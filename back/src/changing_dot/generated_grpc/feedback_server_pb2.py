@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x15\x66\x65\x65\x64\x62\x61\x63k_server.proto\x12\x0f\x66\x65\x65\x64\x62\x61\x63k_server\"*\n\x16HasSyntaxErrorsRequest\x12\x10\n\x08\x66ilePath\x18\x01 \x01(\t\"/\n\x14HasSyntaxErrorsReply\x12\x17\n\x0fHasSyntaxErrors\x18\x01 \x01(\x08\"+\n\x17GetCompileErrorsRequest\x12\x10\n\x08\x66ilePath\x18\x01 \x01(\t\"?\n\x15GetCompileErrorsReply\x12&\n\x06\x45rrors\x18\x01 \x03(\x0b\x32\x16.feedback_server.Error\"S\n\x05\x45rror\x12\x11\n\terrorText\x18\x01 \x01(\t\x12\x13\n\x0bprojectName\x18\x02 \x01(\t\x12\x10\n\x08\x66ilePath\x18\x03 \x01(\t\x12\x10\n\x08position\x18\x04 \x03(\x05\x32\xd9\x01\n\x0e\x46\x65\x65\x64\x62\x61\x63kServer\x12\x64\n\x10GetCompileErrors\x12(.feedback_server.GetCompileErrorsRequest\x1a&.feedback_server.GetCompileErrorsReply\x12\x61\n\x0fHasSyntaxErrors\x12\'.feedback_server.HasSyntaxErrorsRequest\x1a%.feedback_server.HasSyntaxErrorsReplyB\x11\xaa\x02\x0e\x44otnetAnalyzerb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x15\x66\x65\x65\x64\x62\x61\x63k_server.proto\x12\x0f\x66\x65\x65\x64\x62\x61\x63k_server\"*\n\x16HasSyntaxErrorsRequest\x12\x10\n\x08\x66ilePath\x18\x01 \x01(\t\"/\n\x14HasSyntaxErrorsReply\x12\x17\n\x0fHasSyntaxErrors\x18\x01 \x01(\x08\"+\n\x17GetCompileErrorsRequest\x12\x10\n\x08\x66ilePath\x18\x01 \x01(\t\"S\n\x15GetCompileErrorsReply\x12&\n\x06\x45rrors\x18\x01 \x03(\x0b\x32\x16.feedback_server.Error\x12\x12\n\nsnapshotId\x18\x02 \x01(\x03\"S\n\x05\x45rror\x12\x11\n\terrorText\x18\x01 \x01(\t\x12\x13\n\x0bprojectName\x18\x02 \x01(\t\x12\x10\n\x08\x66ilePath\x18\x03 \x01(\t\x12\x10\n\x08position\x18\x04 \x03(\x05\".\n\x0c\x44ocumentText\x12\x10\n\x08\x66ilePath\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\"k\n\x11\x43heckEditsRequest\x12\x10\n\x08\x66ilePath\x18\x01 \x01(\t\x12\x30\n\tdocuments\x18\x02 \x03(\x0b\x32\x1d.feedback_server.DocumentText\x12\x12\n\nsyntaxOnly\x18\x03 \x01(\x08\"R\n\x0f\x43heckEditsReply\x12\x17\n\x0fHasSyntaxErrors\x18\x01 \x01(\x08\x12&\n\x06\x45rrors\x18\x02 \x03(\x0b\x32\x16.feedback_server.Error\"D\n\x19GetDiagnosticDeltaRequest\x12\x10\n\x08\x66ilePath\x18\x01 \x01(\t\x12\x15\n\rsinceSnapshot\x18\x02 \x01(\x03\"\x9c\x01\n\x17GetDiagnosticDeltaReply\x12\x12\n\nsnapshotId\x18\x01 \x01(\x03\x12\x0e\n\x06isFull\x18\x02 \x01(\x08\x12%\n\x05\x61\x64\x64\x65\x64\x18\x03 \x03(\x0b\x32\x16.feedback_server.Error\x12\'\n\x07removed\x18\x04 \x03(\x0b\x32\x16.feedback_server.Error\x12\r\n\x05order\x18\x05 \x03(\x05\"\x9d\x01\n\x1dGetDocumentDiagnosticsRequest\x12\x10\n\x08\x66ilePath\x18\x01 \x01(\t\x12\x30\n\tdocuments\x18\x02 \x03(\x0b\x32\x1d.feedback_server.DocumentText\x12\x14\n\x0c\x64ocumentPath\x18\x03 \x01(\t\x12\x11\n\tstartLine\x18\x04 \x01(\x05\x12\x0f\n\x07\x65ndLine\x18\x05 \x01(\x05\"\\\n\x1bGetDocumentDiagnosticsReply\x12\x15\n\rdocumentFound\x18\x01 \x01(\x08\x12&\n\x06\x45rrors\x18\x02 \x03(\x0b\x32\x16.feedback_server.Error2\x91\x04\n\x0e\x46\x65\x65\x64\x62\x61\x63kServer\x12\x64\n\x10GetCompileErrors\x12(.feedback_server.GetCompileErrorsRequest\x1a&.feedback_server.GetCompileErrorsReply\x12\x61\n\x0fHasSyntaxErrors\x12\'.feedback_server.HasSyntaxErrorsRequest\x1a%.feedback_server.HasSyntaxErrorsReply\x12R\n\nCheckEdits\x12\".feedback_server.CheckEditsRequest\x1a .feedback_server.CheckEditsReply\x12j\n\x12GetDiagnosticDelta\x12*.feedback_server.GetDiagnosticDeltaRequest\x1a(.feedback_server.GetDiagnosticDeltaReply\x12v\n\x16GetDocumentDiagnostics\x12..feedback_server.GetDocumentDiagnosticsRequest\x1a,.feedback_server.GetDocumentDiagnosticsReplyB\x11\xaa\x02\x0e\x44otnetAnalyzerb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -29,9 +29,23 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_GETCOMPILEERRORSREQUEST']._serialized_start=135
   _globals['_GETCOMPILEERRORSREQUEST']._serialized_end=178
   _globals['_GETCOMPILEERRORSREPLY']._serialized_start=180
-  _globals['_GETCOMPILEERRORSREPLY']._serialized_end=243
-  _globals['_ERROR']._serialized_start=245
-  _globals['_ERROR']._serialized_end=328
-  _globals['_FEEDBACKSERVER']._serialized_start=331
-  _globals['_FEEDBACKSERVER']._serialized_end=548
+  _globals['_GETCOMPILEERRORSREPLY']._serialized_end=263
+  _globals['_ERROR']._serialized_start=265
+  _globals['_ERROR']._serialized_end=348
+  _globals['_DOCUMENTTEXT']._serialized_start=350
+  _globals['_DOCUMENTTEXT']._serialized_end=396
+  _globals['_CHECKEDITSREQUEST']._serialized_start=398
+  _globals['_CHECKEDITSREQUEST']._serialized_end=505
+  _globals['_CHECKEDITSREPLY']._serialized_start=507
+  _globals['_CHECKEDITSREPLY']._serialized_end=589
+  _globals['_GETDIAGNOSTICDELTAREQUEST']._serialized_start=591
+  _globals['_GETDIAGNOSTICDELTAREQUEST']._serialized_end=659
+  _globals['_GETDIAGNOSTICDELTAREPLY']._serialized_start=662
+  _globals['_GETDIAGNOSTICDELTAREPLY']._serialized_end=818
+  _globals['_GETDOCUMENTDIAGNOSTICSREQUEST']._serialized_start=821
+  _globals['_GETDOCUMENTDIAGNOSTICSREQUEST']._serialized_end=978
+  _globals['_GETDOCUMENTDIAGNOSTICSREPLY']._serialized_start=980
+  _globals['_GETDOCUMENTDIAGNOSTICSREPLY']._serialized_end=1072
+  _globals['_FEEDBACKSERVER']._serialized_start=1075
+  _globals['_FEEDBACKSERVER']._serialized_end=1604
 # @@protoc_insertion_point(module_scope)
@@ -24,6 +24,21 @@ class FeedbackServerStub(object):
             request_serializer=feedback__server__pb2.HasSyntaxErrorsRequest.SerializeToString,
             response_deserializer=feedback__server__pb2.HasSyntaxErrorsReply.FromString,
         )
+        self.CheckEdits = channel.unary_unary(
+            "/feedback_server.FeedbackServer/CheckEdits",
+            request_serializer=feedback__server__pb2.CheckEditsRequest.SerializeToString,
+            response_deserializer=feedback__server__pb2.CheckEditsReply.FromString,
+        )
+        self.GetDiagnosticDelta = channel.unary_unary(
+            "/feedback_server.FeedbackServer/GetDiagnosticDelta",
+            request_serializer=feedback__server__pb2.GetDiagnosticDeltaRequest.SerializeToString,
+            response_deserializer=feedback__server__pb2.GetDiagnosticDeltaReply.FromString,
+        )
+        self.GetDocumentDiagnostics = channel.unary_unary(
+            "/feedback_server.FeedbackServer/GetDocumentDiagnostics",
+            request_serializer=feedback__server__pb2.GetDocumentDiagnosticsRequest.SerializeToString,
+            response_deserializer=feedback__server__pb2.GetDocumentDiagnosticsReply.FromString,
+        )
 
 
 class FeedbackServerServicer(object):
@@ -41,6 +56,24 @@ class FeedbackServerServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def CheckEdits(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def GetDiagnosticDelta(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def GetDocumentDiagnostics(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_FeedbackServerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -54,6 +87,21 @@ def add_FeedbackServerServicer_to_server(servicer, server):
             request_deserializer=feedback__server__pb2.HasSyntaxErrorsRequest.FromString,
             response_serializer=feedback__server__pb2.HasSyntaxErrorsReply.SerializeToString,
         ),
+        "CheckEdits": grpc.unary_unary_rpc_method_handler(
+            servicer.CheckEdits,
+            request_deserializer=feedback__server__pb2.CheckEditsRequest.FromString,
+            response_serializer=feedback__server__pb2.CheckEditsReply.SerializeToString,
+        ),
+        "GetDiagnosticDelta": grpc.unary_unary_rpc_method_handler(
+            servicer.GetDiagnosticDelta,
+            request_deserializer=feedback__server__pb2.GetDiagnosticDeltaRequest.FromString,
+            response_serializer=feedback__server__pb2.GetDiagnosticDeltaReply.SerializeToString,
+        ),
+        "GetDocumentDiagnostics": grpc.unary_unary_rpc_method_handler(
+            servicer.GetDocumentDiagnostics,
+            request_deserializer=feedback__server__pb2.GetDocumentDiagnosticsRequest.FromString,
+            response_serializer=feedback__server__pb2.GetDocumentDiagnosticsReply.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "feedback_server.FeedbackServer", rpc_method_handlers
@@ -122,3 +170,90 @@ class FeedbackServer(object):
             timeout,
             metadata,
         )
+
+    @staticmethod
+    def CheckEdits(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/feedback_server.FeedbackServer/CheckEdits",
+            feedback__server__pb2.CheckEditsRequest.SerializeToString,
+            feedback__server__pb2.CheckEditsReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
+
+    @staticmethod
+    def GetDiagnosticDelta(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/feedback_server.FeedbackServer/GetDiagnosticDelta",
+            feedback__server__pb2.GetDiagnosticDeltaRequest.SerializeToString,
+            feedback__server__pb2.GetDiagnosticDeltaReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
+
+    @staticmethod
+    def GetDocumentDiagnostics(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/feedback_server.FeedbackServer/GetDocumentDiagnostics",
+            feedback__server__pb2.GetDocumentDiagnosticsRequest.SerializeToString,
+            feedback__server__pb2.GetDocumentDiagnosticsReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
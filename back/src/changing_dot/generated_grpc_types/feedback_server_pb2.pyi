@@ -24,10 +24,12 @@ class GetCompileErrorsRequest(_message.Message):
     def __init__(self, filePath: _Optional[str] = ...) -> None: ...
 
 class GetCompileErrorsReply(_message.Message):
-    __slots__ = ("Errors",)
+    __slots__ = ("Errors", "snapshotId")
     ERRORS_FIELD_NUMBER: _ClassVar[int]
+    SNAPSHOTID_FIELD_NUMBER: _ClassVar[int]
     Errors: _containers.RepeatedCompositeFieldContainer[Error]
-    def __init__(self, Errors: _Optional[_Iterable[_Union[Error, _Mapping]]] = ...) -> None: ...
+    snapshotId: int
+    def __init__(self, Errors: _Optional[_Iterable[_Union[Error, _Mapping]]] = ..., snapshotId: _Optional[int] = ...) -> None: ...
 
 class Error(_message.Message):
     __slots__ = ("errorText", "projectName", "filePath", "position")
@@ -40,3 +42,73 @@ class Error(_message.Message):
     filePath: str
     position: _containers.RepeatedScalarFieldContainer[int]
     def __init__(self, errorText: _Optional[str] = ..., projectName: _Optional[str] = ..., filePath: _Optional[str] = ..., position: _Optional[_Iterable[int]] = ...) -> None: ...
+
+class DocumentText(_message.Message):
+    __slots__ = ("filePath", "text")
+    FILEPATH_FIELD_NUMBER: _ClassVar[int]
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    filePath: str
+    text: str
+    def __init__(self, filePath: _Optional[str] = ..., text: _Optional[str] = ...) -> None: ...
+
+class CheckEditsRequest(_message.Message):
+    __slots__ = ("filePath", "documents", "syntaxOnly")
+    FILEPATH_FIELD_NUMBER: _ClassVar[int]
+    DOCUMENTS_FIELD_NUMBER: _ClassVar[int]
+    SYNTAXONLY_FIELD_NUMBER: _ClassVar[int]
+    filePath: str
+    documents: _containers.RepeatedCompositeFieldContainer[DocumentText]
+    syntaxOnly: bool
+    def __init__(self, filePath: _Optional[str] = ..., documents: _Optional[_Iterable[_Union[DocumentText, _Mapping]]] = ..., syntaxOnly: bool = ...) -> None: ...
+
+class CheckEditsReply(_message.Message):
+    __slots__ = ("HasSyntaxErrors", "Errors")
+    HASSYNTAXERRORS_FIELD_NUMBER: _ClassVar[int]
+    ERRORS_FIELD_NUMBER: _ClassVar[int]
+    HasSyntaxErrors: bool
+    Errors: _containers.RepeatedCompositeFieldContainer[Error]
+    def __init__(self, HasSyntaxErrors: bool = ..., Errors: _Optional[_Iterable[_Union[Error, _Mapping]]] = ...) -> None: ...
+
+class GetDiagnosticDeltaRequest(_message.Message):
+    __slots__ = ("filePath", "sinceSnapshot")
+    FILEPATH_FIELD_NUMBER: _ClassVar[int]
+    SINCESNAPSHOT_FIELD_NUMBER: _ClassVar[int]
+    filePath: str
+    sinceSnapshot: int
+    def __init__(self, filePath: _Optional[str] = ..., sinceSnapshot: _Optional[int] = ...) -> None: ...
+
+class GetDiagnosticDeltaReply(_message.Message):
+    __slots__ = ("snapshotId", "isFull", "added", "removed", "order")
+    SNAPSHOTID_FIELD_NUMBER: _ClassVar[int]
+    ISFULL_FIELD_NUMBER: _ClassVar[int]
+    ADDED_FIELD_NUMBER: _ClassVar[int]
+    REMOVED_FIELD_NUMBER: _ClassVar[int]
+    ORDER_FIELD_NUMBER: _ClassVar[int]
+    snapshotId: int
+    isFull: bool
+    added: _containers.RepeatedCompositeFieldContainer[Error]
+    removed: _containers.RepeatedCompositeFieldContainer[Error]
+    order: _containers.RepeatedScalarFieldContainer[int]
+    def __init__(self, snapshotId: _Optional[int] = ..., isFull: bool = ..., added: _Optional[_Iterable[_Union[Error, _Mapping]]] = ..., removed: _Optional[_Iterable[_Union[Error, _Mapping]]] = ..., order: _Optional[_Iterable[int]] = ...) -> None: ...
+
+class GetDocumentDiagnosticsRequest(_message.Message):
+    __slots__ = ("filePath", "documents", "documentPath", "startLine", "endLine")
+    FILEPATH_FIELD_NUMBER: _ClassVar[int]
+    DOCUMENTS_FIELD_NUMBER: _ClassVar[int]
+    DOCUMENTPATH_FIELD_NUMBER: _ClassVar[int]
+    STARTLINE_FIELD_NUMBER: _ClassVar[int]
+    ENDLINE_FIELD_NUMBER: _ClassVar[int]
+    filePath: str
+    documents: _containers.RepeatedCompositeFieldContainer[DocumentText]
+    documentPath: str
+    startLine: int
+    endLine: int
+    def __init__(self, filePath: _Optional[str] = ..., documents: _Optional[_Iterable[_Union[DocumentText, _Mapping]]] = ..., documentPath: _Optional[str] = ..., startLine: _Optional[int] = ..., endLine: _Optional[int] = ...) -> None: ...
+
+class GetDocumentDiagnosticsReply(_message.Message):
+    __slots__ = ("documentFound", "Errors")
+    DOCUMENTFOUND_FIELD_NUMBER: _ClassVar[int]
+    ERRORS_FIELD_NUMBER: _ClassVar[int]
+    documentFound: bool
+    Errors: _containers.RepeatedCompositeFieldContainer[Error]
+    def __init__(self, documentFound: bool = ..., Errors: _Optional[_Iterable[_Union[Error, _Mapping]]] = ...) -> None: ...
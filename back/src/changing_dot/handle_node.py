@@ -158,10 +158,10 @@ def handle_problem_node(
     # connect all other problems that were solved
     current_compile_errors = error_manager.get_compile_errors(observer)
 
-    existing_compile_errors = [node.error for node in pending_problem_nodes]
+    current_compile_error_keys = {error.key for error in current_compile_errors}
 
     for problem_node in pending_problem_nodes:
-        if problem_node.error not in current_compile_errors:
+        if problem_node.error.key not in current_compile_error_keys:
             # problem was fixed by solution
             G.add_edge(problem_node.index, new_solution_index)
             G.mark_node_as(problem_node.index, "handled")
@@ -170,7 +170,7 @@ def handle_problem_node(
             )
 
     for compile_error in current_compile_errors:
-        if compile_error not in existing_compile_errors:
+        if len(G.find_pending_problems(compile_error)) == 0:
             # new problem
             new_problem_index = G.add_problem_node(
                 ProblemNode(
@@ -299,13 +299,12 @@ def resume_problem_node(
     pending_nodes = G.get_all_pending_nodes()
     observer.log(f"Continuing on all {len(pending_nodes)} next nodes")
 
-    while len(pending_nodes) > 0:
-        node_index = pending_nodes[0]
-
+    pending_node_index = G.get_next_pending_node()
+    while pending_node_index is not None:
         handle_node(
             G,
             DG,
-            node_index,
+            pending_node_index,
             file_modifier,
             observer,
             error_manager,
@@ -313,8 +312,10 @@ def resume_problem_node(
             instruction_manager,
         )
 
-        pending_nodes = G.get_all_pending_nodes()
+        pending_node_index = G.get_next_pending_node()
 
     file_modifier.revert_changes(DG)
 
     observer.log("Finished modification")
+
+    observer.flush()
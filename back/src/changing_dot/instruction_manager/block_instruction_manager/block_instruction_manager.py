@@ -80,9 +80,8 @@ def get_blocks_from_dependency_graph(
     dependency_graph: DependencyGraph, file_path: str
 ) -> str:
     blocks = ""
-    for node in dependency_graph.get_nodes_with_index():
-        if node.file_path == file_path:
-            blocks += f"\nBlock : {node}"
+    for node in dependency_graph.get_file_nodes_with_index(file_path):
+        blocks += f"\nBlock : {node}"
 
     return blocks
 
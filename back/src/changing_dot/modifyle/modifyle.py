@@ -1,10 +1,15 @@
+from collections import defaultdict
 from collections.abc import Iterator
 from contextlib import contextmanager
+from typing import TYPE_CHECKING
 
 from changing_dot.custom_types import BlockEdit
 from changing_dot.dependency_graph.dependency_graph import DependencyGraph
 from changing_dot.utils.text_functions import read_text, write_text
 
+if TYPE_CHECKING:
+    from changing_dot.dependency_graph.types import DependencyGraphNode
+
 
 class IModifyle:
     def revert_changes(self, DG: DependencyGraph) -> None:
@@ -56,6 +61,46 @@ def apply_edits(DG: DependencyGraph, edits: list[BlockEdit]) -> None:
         DG.update_graph_from_edits([edit])
 
 
+def get_edited_texts(
+    DG: DependencyGraph, edits: list[BlockEdit]
+) -> dict[str, str] | None:
+    # Texts of the edited files as apply_edits would write them, computed
+    # without touching the files or the graph. Edits of a file are applied from
+    # the bottom up so that the positions of the blocks stay valid. None when
+    # two edits touch the same lines: the graph must be updated between them.
+    # Edits are checked as they are when the graph is updated.
+    edits_by_file: dict[str, list[tuple[DependencyGraphNode, BlockEdit]]] = defaultdict(
+        list
+    )
+    for edit in edits:
+        edits_by_file[edit.file_path].append((DG.get_node(edit.block_id), edit))
+
+    edited_texts: dict[str, str] = {}
+    for file_path, file_edits in edits_by_file.items():
+        file_lines = read_text(file_path).splitlines()
+        next_start_index: int | None = None
+
+        for node, edit in sorted(
+            file_edits, key=lambda file_edit: file_edit[0].start_point, reverse=True
+        ):
+            start_index = node.start_point[0]
+            end_index = node.end_point[0] + 1
+            if next_start_index is not None and end_index > next_start_index:
+                return None
+
+            after_lines = edit.after.splitlines()
+            after_lines[0] = " " * node.start_point[1] + after_lines[0]
+            file_lines[start_index:end_index] = after_lines
+            next_start_index = start_index
+
+        edited_texts[file_path] = "\n".join(file_lines)
+
+    for edit in edits:
+        DG.check_edit(edit, edited_texts[edit.file_path])
+
+    return edited_texts
+
+
 # Use when you need to stack multiple changes and then revert
 class IntegralModifyle(IModifyle):
     def __init__(self) -> None:
@@ -65,8 +110,6 @@ class IntegralModifyle(IModifyle):
         if len(edits) == 0:
             return
 
-        DG.save_state()
-
         for edit in edits:
             if self.original_files_content.get(edit.file_path) is None:
                 self.original_files_content[edit.file_path] = read_text(edit.file_path)
@@ -89,7 +132,7 @@ def applied_edits_context(
         if original_files_content.get(edit.file_path) is None:
             original_files_content[edit.file_path] = read_text(edit.file_path)
 
-    DG.save_state()
+    DG.begin()
 
     try:
         apply_edits(DG, edits)
@@ -97,4 +140,4 @@ def applied_edits_context(
     finally:
         for file_path in original_files_content:
             write_text(file_path, original_files_content[file_path])
-        DG.revert()
+        DG.rollback()
@@ -70,19 +70,18 @@ def run_resolve_graph(
         folder_to_analyse, analyzer_options.language
     )
 
-    observer = Observer(G, iteration_name, output_path)
-
-    interpreter = create_instruction_interpreter(observer, llm_provider)
-
-    resolve_graph(
-        G,
-        DG,
-        error_manager,
-        instruction_manager,
-        interpreter,
-        file_modifier,
-        observer,
-    )
+    with Observer(G, iteration_name, output_path) as observer:
+        interpreter = create_instruction_interpreter(observer, llm_provider)
+
+        resolve_graph(
+            G,
+            DG,
+            error_manager,
+            instruction_manager,
+            interpreter,
+            file_modifier,
+            observer,
+        )
 
 
 def resolve_graph(
@@ -106,9 +105,8 @@ def resolve_graph(
     pending_nodes = G.get_all_pending_nodes()
     observer.log(f"Continuing on all {len(pending_nodes)} next nodes")
 
-    while len(pending_nodes) > 0:
-        node_index = pending_nodes[0]
-
+    node_index = G.get_next_pending_node()
+    while node_index is not None:
         handle_node(
             G,
             DG,
@@ -120,8 +118,10 @@ def resolve_graph(
             instruction_manager,
         )
 
-        pending_nodes = G.get_all_pending_nodes()
+        node_index = G.get_next_pending_node()
 
     optimize_graph(G, observer)
 
     observer.log("Finished")
+
+    observer.flush()
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, Literal
 from changing_dot_visualize.observer import Observer
 
 from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.changing_graph.graph_journal import GraphJournal
 from changing_dot.commit.reset_repo import set_repo
 from changing_dot.custom_types import (
     AnalyzerOptions,
@@ -27,7 +28,6 @@ from changing_dot.instruction_manager.block_instruction_manager.block_instructio
 )
 from changing_dot.modifyle.modifyle import IntegralModifyle
 from changing_dot.optimize_graph import optimize_graph
-from changing_dot.utils.process_pickle_files import process_pickle_files
 
 if TYPE_CHECKING:
     from changing_dot.error_manager.error_manager import IErrorManager
@@ -48,7 +48,7 @@ def run_resume_graph(
 
     instruction_manager = create_instruction_manager(goal, llm_provider)
 
-    graphs = process_pickle_files(f"{output_path}/{iteration_name}/")
+    journal = GraphJournal(f"{output_path}/{iteration_name}/")
 
     error_manager: IErrorManager
     folder_to_analyse: str
@@ -67,42 +67,43 @@ def run_resume_graph(
 
     file_modifier: IModifyle = IntegralModifyle()
 
-    G = ChangingGraph(graphs[-1])
+    G = ChangingGraph(journal.load_latest())
 
     DG = create_dependency_graph_from_folder(
         folder_to_analyse, analyzer_options.language
     )
 
-    observer = Observer(
+    with Observer(
         G,
         iteration_name,
         output_folder=output_path,
-        step=len(graphs),
-    )
-
-    interpreter = create_instruction_interpreter(observer, llm_provider)
+        step=journal.number_of_steps,
+    ) as observer:
+        interpreter = create_instruction_interpreter(observer, llm_provider)
+
+        node = ProblemNode(
+            index=resume_initial_node.index,
+            node_type="problem",
+            status="pending",
+            error=resume_initial_node.error,
+        )
 
-    node = ProblemNode(
-        index=resume_initial_node.index,
-        node_type="problem",
-        status="pending",
-        error=resume_initial_node.error,
-    )
+        resume_problem_node(
+            G,
+            DG,
+            node.index,
+            node,
+            resume_initial_node.new_instruction,
+            resume_initial_node.new_edits,
+            error_manager,
+            instruction_manager,
+            interpreter,
+            file_modifier,
+            observer,
+        )
 
-    resume_problem_node(
-        G,
-        DG,
-        node.index,
-        node,
-        resume_initial_node.new_instruction,
-        resume_initial_node.new_edits,
-        error_manager,
-        instruction_manager,
-        interpreter,
-        file_modifier,
-        observer,
-    )
+        optimize_graph(G, observer)
 
-    optimize_graph(G, observer)
+        observer.log("Finished")
 
-    observer.log("Finished")
+        observer.flush()
@@ -19,6 +19,12 @@ def read_text(filename: str) -> str:
         raise UnicodeError from None
 
 
+def read_source(filename: str) -> bytes:
+    # Same bytes as the ones given to tree-sitter, so node byte offsets can be
+    # used to slice it directly
+    return read_text(filename).encode("utf-8")
+
+
 def write_text(filename: str, content: str) -> None:
     encoding = "utf-8"
     with open(str(filename), "w", encoding=encoding) as f:
@@ -1,8 +1,114 @@
-from tree_sitter import Node
+from pydantic import BaseModel
+from tree_sitter import Node, Tree
 
-from changing_dot.utils.text_functions import read_text
 
+def get_node_text_from_source(node: Node, source: bytes) -> str:
+    return source[node.start_byte : node.end_byte].decode("utf-8")
 
-def get_node_text_from_file_path(node: Node, file_path: str) -> str:
-    source = read_text(file_path)
-    return source[node.start_byte : node.end_byte]
+
+class SourceEdit(BaseModel):
+    old_start_byte: int
+    old_end_byte: int
+    new_start_byte: int
+    new_end_byte: int
+
+
+def get_common_prefix_length(a: bytes, b: bytes) -> int:
+    # Binary search on memoryview slices so that comparisons stay in C
+    view_a, view_b = memoryview(a), memoryview(b)
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if view_a[:middle] == view_b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def get_common_suffix_length(a: bytes, b: bytes, max_length: int) -> int:
+    view_a, view_b = memoryview(a), memoryview(b)
+    low, high = 0, max_length
+    while low < high:
+        middle = (low + high + 1) // 2
+        if view_a[len(a) - middle :] == view_b[len(b) - middle :]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def split_final_newline(source: bytes) -> tuple[bytes, bytes]:
+    for newline in (b"\r\n", b"\n"):
+        if source.endswith(newline):
+            return source[: -len(newline)], newline
+    return source, b""
+
+
+def get_source_edits(old_source: bytes, new_source: bytes) -> list[SourceEdit]:
+    # Files are rewritten without their final newline, so it is kept as its own
+    # edit instead of stretching the main edit up to the end of the file
+    old_body, old_final_newline = split_final_newline(old_source)
+    new_body, new_final_newline = split_final_newline(new_source)
+
+    edits: list[SourceEdit] = []
+
+    prefix_length = get_common_prefix_length(old_body, new_body)
+    suffix_length = get_common_suffix_length(
+        old_body, new_body, min(len(old_body), len(new_body)) - prefix_length
+    )
+    if prefix_length + suffix_length < max(len(old_body), len(new_body)):
+        edits.append(
+            SourceEdit(
+                old_start_byte=prefix_length,
+                old_end_byte=len(old_body) - suffix_length,
+                new_start_byte=prefix_length,
+                new_end_byte=len(new_body) - suffix_length,
+            )
+        )
+
+    if old_final_newline != new_final_newline:
+        edits.append(
+            SourceEdit(
+                old_start_byte=len(old_body),
+                old_end_byte=len(old_source),
+                new_start_byte=len(new_body),
+                new_end_byte=len(new_source),
+            )
+        )
+
+    return edits
+
+
+def get_point_from_byte(source: bytes, byte: int) -> tuple[int, int]:
+    row = source.count(b"\n", 0, byte)
+    column = byte - (source.rfind(b"\n", 0, byte) + 1)
+    return row, column
+
+
+def edit_tree(
+    tree: Tree, old_source: bytes, new_source: bytes, edits: list[SourceEdit]
+) -> None:
+    # Edits are given from last to first so that the positions of the ones that
+    # remain to apply are the same in the old and in the partially edited tree
+    for edit in reversed(edits):
+        tree.edit(
+            start_byte=edit.old_start_byte,
+            old_end_byte=edit.old_end_byte,
+            new_end_byte=edit.new_end_byte,
+            start_point=get_point_from_byte(old_source, edit.old_start_byte),
+            old_end_point=get_point_from_byte(old_source, edit.old_end_byte),
+            new_end_point=get_point_from_byte(new_source, edit.new_end_byte),
+        )
+
+
+def map_end_byte(edits: list[SourceEdit], end_byte: int) -> int | None:
+    # Returns None when the byte was inside an edited range
+    delta = 0
+    for edit in edits:
+        if end_byte <= edit.old_start_byte:
+            break
+        if end_byte < edit.old_end_byte:
+            return None
+        delta = edit.new_end_byte - edit.old_end_byte
+    return end_byte + delta
@@ -1,20 +1,20 @@
-import os
-import pickle
+import time
+import weakref
+from types import TracebackType
 from typing import Any
 
 from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.changing_graph.checkpoint_writer import (
+    Checkpoint,
+    CheckpointWriter,
+)
+from changing_dot.changing_graph.graph_journal import GraphJournalWriter
 from dash import html
 from loguru import logger
 
 from changing_dot_visualize.utils import get_items
 
 
-def ensure_directory_exists(file_path: str) -> None:
-    directory = os.path.dirname(file_path)
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-
-
 class Observer:
     G: ChangingGraph
     iteration_name: str
@@ -29,6 +29,8 @@ class Observer:
         iteration_name: str,
         output_folder: str,
         step: int | None = None,
+        checkpoint_every_steps: int = 1,
+        checkpoint_every_seconds: float | None = None,
     ):
         self.G = G
         self.iteration_name = iteration_name
@@ -38,27 +40,91 @@ class Observer:
             step = 0
         self.step = step
 
+        # A checkpoint is written every checkpoint_every_steps saved states or
+        # once checkpoint_every_seconds elapsed since the last one
+        self.checkpoint_every_steps = checkpoint_every_steps
+        self.checkpoint_every_seconds = checkpoint_every_seconds
+        self.unsaved_states = 0
+        self.last_checkpoint_time = time.monotonic()
+
+        self.journal_writer: GraphJournalWriter | None = None
+        self.checkpoint_writer: CheckpointWriter | None = None
+        self.checkpoint_writer_finalizer: weakref.finalize[[], Observer] | None = None
+
         self.logger = logger.bind(request_id=self.iteration_name)
 
-    def save_graph_state(self) -> None:
-        # Create the path for the file in GCS
-        path = f"{self.output_folder}/{self.iteration_name}/step_{self.step}.pickle"
+    # Pending states are written when the observer is closed, use it as a
+    # context manager
+    def __enter__(self) -> "Observer":
+        return self
 
-        ensure_directory_exists(path)
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
 
-        # Adding attribute to underlying nx graph
-        self.G.G.graph["step_logs"] = self.logs
+    def save_graph_state(self) -> None:
+        self.unsaved_states += 1
+        if self.is_checkpoint_due():
+            self.write_checkpoint()
+
+    def is_checkpoint_due(self) -> bool:
+        if self.unsaved_states >= self.checkpoint_every_steps:
+            return True
+        return (
+            self.checkpoint_every_seconds is not None
+            and time.monotonic() - self.last_checkpoint_time
+            >= self.checkpoint_every_seconds
+        )
+
+    def write_checkpoint(self) -> None:
+        if self.journal_writer is None:
+            self.journal_writer = GraphJournalWriter(
+                f"{self.output_folder}/{self.iteration_name}"
+            )
+        if self.checkpoint_writer is None:
+            self.checkpoint_writer = CheckpointWriter(self.journal_writer)
+            # Checkpoints already submitted are written if the observer is not
+            # closed, the finalizer does not keep the observer alive
+            self.checkpoint_writer_finalizer = weakref.finalize(
+                self, self.checkpoint_writer.close
+            )
 
-        # Serialize the graph object to a bytes object
-        pickle_data = pickle.dumps(self.G.G, protocol=pickle.HIGHEST_PROTOCOL)
+        # Only the changes made to the graph since the last step are written,
+        # with the logs of the step. Snapshots are written from a copy of the
+        # graph, as it keeps changing while the checkpoint is written.
+        delta = self.G.pop_changes(self.logs)
+        G = self.G.G.copy() if self.journal_writer.start_step(self.step) else None
+        self.checkpoint_writer.submit(Checkpoint(self.step, G, delta))
 
-        with open(path, "wb") as file:
-            file.write(pickle_data)
+        self.logger.info(f"Saving state of step {self.step}")
 
         # Increment step and reset logs
         self.step += 1
         self.logs = []
-        self.logger.info(f"Saved state at {path}")
+        self.unsaved_states = 0
+        self.last_checkpoint_time = time.monotonic()
+
+    def flush(self) -> None:
+        # Writes the pending states and waits for all checkpoints to be written
+        if self.unsaved_states > 0:
+            self.write_checkpoint()
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.flush()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self.checkpoint_writer_finalizer is not None:
+                self.checkpoint_writer_finalizer.detach()
+                self.checkpoint_writer_finalizer = None
+            if self.checkpoint_writer is not None:
+                self.checkpoint_writer.close()
+                self.checkpoint_writer = None
 
     def log(self, log: str) -> None:
         self.logger.info(log)
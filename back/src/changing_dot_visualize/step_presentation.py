@@ -1,8 +1,8 @@
-import pickle
 from typing import Literal
 
 import networkx as nx
 import vizro.models as vm
+from changing_dot.changing_graph.graph_journal import GraphJournal
 from dash import dcc, html
 
 
@@ -33,9 +33,5 @@ class StepPresentation(vm.VizroBaseModel):
         )
 
     def load_graph(self) -> nx.Graph:
-        file_path = (
-            f"{self.output_path}/{self.iteration_name}/step_{self.step_index}.pickle"
-        )
-        with open(file_path, "rb") as handle:
-            G: nx.Graph = pickle.load(handle)
-            return G
+        journal = GraphJournal(f"{self.output_path}/{self.iteration_name}")
+        return journal.load_step(self.step_index)
@@ -135,5 +135,7 @@ def benchmark_job(
 
             except Exception as e:
                 logger.error(e)
+            finally:
+                observer.close()
 
         reset_repo(commit)
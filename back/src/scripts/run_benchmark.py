@@ -128,5 +128,7 @@ if __name__ == "__main__":
 
             except Exception as e:
                 print(e)
+            finally:
+                observer.close()
 
         reset_repo(config["commit"])
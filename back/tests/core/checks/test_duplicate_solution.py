@@ -127,3 +127,44 @@ def test_duplicates_find_no_duplicates() -> None:
         check_if_duplicate_solution_block(G, new_solution_node)
         == existing_solution_node
     )
+
+
+def test_other_edits_or_failed_solutions_are_not_duplicates() -> None:
+    G = ChangingGraph()
+    instruction = Instruction(
+        block_id=1,
+        file_path="./tests/core/checks/fixtures/basic_file.cs",
+        solution="Do this original change",
+    )
+
+    def make_solution_node(after: str) -> SolutionNode:
+        return SolutionNode(
+            index=-1,
+            node_type="solution",
+            status="pending",
+            instruction=instruction,
+            edits=[
+                BlockEdit(
+                    block_id=1,
+                    file_path="./tests/core/checks/fixtures/basic_file.cs",
+                    before='return "Hello, World!";',
+                    after=after,
+                )
+            ],
+        )
+
+    existing_index = G.add_solution_node(make_solution_node('return "Welcome";'))
+
+    assert (
+        check_if_duplicate_solution_block(G, make_solution_node('return "Bye";'))
+        is None
+    )
+    assert check_if_duplicate_solution_block(
+        G, make_solution_node('return "Welcome";  ')
+    ) == G.get_solution_node(existing_index)
+
+    G.mark_node_as(existing_index, "failed")
+    assert (
+        check_if_duplicate_solution_block(G, make_solution_node('return "Welcome";'))
+        is None
+    )
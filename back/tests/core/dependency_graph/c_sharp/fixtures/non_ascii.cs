@@ -0,0 +1,8 @@
+// Café
+class Crème
+{
+    static string Brûlée()
+    {
+        return "Déjà vu";
+    }
+}
\ No newline at end of file
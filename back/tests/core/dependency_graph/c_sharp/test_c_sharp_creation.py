@@ -1,7 +1,11 @@
+from pathlib import Path
+
+import pytest
 from changing_dot.dependency_graph.dependency_graph import (
     DependencyGraph,
     create_dependency_graph_from_folder,
 )
+from changing_dot.dependency_graph.parse_cache import ParseCache
 from changing_dot.dependency_graph.types import (
     DependencyGraphNode,
     DependencyGraphNodeWithIndex,
@@ -344,6 +348,29 @@ def test_xml_csproj_files() -> None:
     assert len(graph.get_parent_child_relations()) == 37 + 6
 
 
+def test_csproj_blocks_are_matched_one_by_one() -> None:
+    file_path = get_fixture_path("random.csproj")
+    graph = DependencyGraph([file_path])
+    language_matcher = graph.file_path_to_language_matcher[file_path]
+    root_node = graph.get_tree(file_path).root_node
+
+    blocks = {
+        (node.start_byte, node.end_byte): node_type
+        for node, node_type in language_matcher.match_blocks(root_node)
+    }
+    matched_blocks = {}
+    ast_nodes = [root_node]
+    while len(ast_nodes) > 0:
+        ast_node = ast_nodes.pop()
+        ast_nodes.extend(ast_node.children)
+        node_type = language_matcher.match_class(ast_node)
+        if node_type is not None:
+            matched_blocks[(ast_node.start_byte, ast_node.end_byte)] = node_type
+
+    assert len(blocks) == 7
+    assert matched_blocks == blocks
+
+
 def test_csproj_files() -> None:
     graph = DependencyGraph([get_fixture_path("small.csproj")])
     # for now each element is a method
@@ -517,6 +544,131 @@ def test_relations_in_multiple_files() -> None:
         assert relation in graph.get_parent_child_relations()
 
 
-def test_we_can_give_c_sharp_and_folder_path() -> None:
-    graph = create_dependency_graph_from_folder(get_fixture_path("folder"), "c_sharp")
+def test_we_can_give_c_sharp_and_folder_path(tmp_path: Path) -> None:
+    graph = create_dependency_graph_from_folder(
+        get_fixture_path("folder"), "c_sharp", parse_cache=ParseCache(tmp_path)
+    )
+    assert graph.get_number_of_nodes() == 2
+
+
+def test_non_ascii_text_is_sliced_by_byte_range() -> None:
+    graph = DependencyGraph([get_fixture_path("non_ascii.cs")])
     assert graph.get_number_of_nodes() == 2
+    assert graph.get_node_by_type("Method") == [
+        DependencyGraphNode(
+            node_type="Method",
+            start_point=(3, 4),
+            end_point=(6, 5),
+            file_path=get_fixture_path("non_ascii.cs"),
+            text="""static string Brûlée()
+    {
+        return "Déjà vu";
+    }""",
+        )
+    ]
+    assert graph.get_node_by_type("Class")[0].text.startswith("// Café\nclass Crème")
+
+
+def test_parallel_build_matches_sequential_build() -> None:
+    file_paths = [
+        get_fixture_path("simple_property.cs"),
+        get_fixture_path("imports.cs"),
+        get_fixture_path("simple_method.cs"),
+        get_fixture_path("small.csproj"),
+        get_fixture_path("random.xml"),
+    ]
+    sequential_graph = DependencyGraph(file_paths)
+    parallel_graph = DependencyGraph(file_paths, workers=2)
+
+    assert parallel_graph.get_nodes_with_index() == (
+        sequential_graph.get_nodes_with_index()
+    )
+    assert parallel_graph.get_parent_child_relations() == (
+        sequential_graph.get_parent_child_relations()
+    )
+    assert not parallel_graph.has_syntax_errors()
+
+
+def test_enclosing_node_of_a_line() -> None:
+    graph = DependencyGraph([get_fixture_path("simple_method.cs")])
+    file_path = get_fixture_path("simple_method.cs")
+
+    assert graph.get_enclosing_node_index(file_path, 0) == 0
+    assert graph.get_enclosing_node_index(file_path, 4) == 1
+    assert graph.get_enclosing_node_index(file_path, 6) == 0
+    assert graph.get_enclosing_node_index(file_path, 7) is None
+    assert graph.get_enclosing_node_index("not_a_file.cs", 0) is None
+
+
+def test_node_views_match_nodes() -> None:
+    graph = DependencyGraph(
+        [get_fixture_path("imports.cs"), get_fixture_path("simple_constructor.cs")]
+    )
+
+    assert [
+        node_view.to_node_with_index() for node_view in graph.get_node_views()
+    ] == graph.get_nodes_with_index()
+    for node_view, node in zip(graph.get_node_views(), graph.get_nodes(), strict=True):
+        assert node_view.node_type == node.node_type
+        assert node_view.start_point == node.start_point
+        assert node_view.end_point == node.end_point
+        assert node_view.file_path == node.file_path
+        assert node_view.text == node.text
+
+
+def test_lazy_graph_has_the_block_ids_of_the_eager_graph(tmp_path: Path) -> None:
+    file_paths = [
+        get_fixture_path("imports.cs"),
+        get_fixture_path("simple_method.cs"),
+        get_fixture_path("small.csproj"),
+        get_fixture_path("random.xml"),
+    ]
+    eager_graph = DependencyGraph(file_paths)
+    parse_cache = ParseCache(tmp_path)
+
+    for lazy_graph in [
+        DependencyGraph(file_paths, lazy=True),
+        DependencyGraph(file_paths, workers=2, lazy=True),
+        # Cold then warm cache
+        DependencyGraph(file_paths, parse_cache=parse_cache, lazy=True),
+        DependencyGraph(file_paths, parse_cache=parse_cache, lazy=True),
+    ]:
+        assert lazy_graph.get_number_of_nodes() == eager_graph.get_number_of_nodes()
+
+        # Only the requested file is parsed
+        small_csproj = get_fixture_path("small.csproj")
+        assert lazy_graph.get_file_nodes_with_index(small_csproj) == (
+            eager_graph.get_file_nodes_with_index(small_csproj)
+        )
+        assert list(lazy_graph.sources) == [small_csproj]
+
+        assert lazy_graph.get_node(2) == eager_graph.get_node(2)
+        assert sorted(lazy_graph.sources) == sorted(
+            [small_csproj, eager_graph.get_node(2).file_path]
+        )
+
+        assert lazy_graph.get_nodes_with_index() == eager_graph.get_nodes_with_index()
+        assert lazy_graph.get_parent_child_relations() == (
+            eager_graph.get_parent_child_relations()
+        )
+        assert not lazy_graph.has_syntax_errors()
+
+
+def test_lazy_graph_reports_syntax_errors_of_files_not_parsed_yet() -> None:
+    graph = DependencyGraph(
+        [get_fixture_path("syntax_errors/has_syntax_error.cs")], lazy=True
+    )
+    assert graph.has_syntax_errors()
+    assert graph.sources == {}
+
+
+def test_lazy_graph_refuses_files_changed_before_being_parsed(
+    tmp_path: Path,
+) -> None:
+    file_path = tmp_path / "changed.cs"
+    file_path.write_text("class A {}")
+    graph = DependencyGraph([str(file_path)], lazy=True)
+    file_path.write_text("class A {}\nclass B {}")
+
+    with pytest.raises(AssertionError):
+        graph.get_node(0)
@@ -879,3 +879,103 @@ def test_handle_csproj_simple_update() -> None:
             index=2,
         ),
     ]
+
+
+def test_incremental_update_matches_a_fresh_parse() -> None:
+    graph = DependencyGraph([get_fixture_path("subject_3.cs")])
+
+    write_text(get_fixture_path("subject_3.cs"), get_fixture("shift_2.cs"))
+
+    graph.update_graph_from_edits(
+        [
+            BlockEdit(
+                block_id=0,
+                file_path=get_fixture_path("subject_3.cs"),
+                before="using System;",
+                after="// this shifts everything\nusing System;",
+            )
+        ]
+    )
+
+    fresh_graph = DependencyGraph([get_fixture_path("subject_3.cs")])
+
+    assert sorted(graph.get_nodes(), key=lambda node: node.start_point) == sorted(
+        fresh_graph.get_nodes(), key=lambda node: node.start_point
+    )
+    assert not graph.has_syntax_errors()
+
+
+def test_block_index_follows_updates() -> None:
+    graph = DependencyGraph([get_fixture_path("subject_3.cs")])
+
+    write_text(get_fixture_path("subject_3.cs"), get_fixture("shift_2.cs"))
+
+    graph.update_graph_from_edits(
+        [
+            BlockEdit(
+                block_id=0,
+                file_path=get_fixture_path("subject_3.cs"),
+                before="using System;",
+                after="// this shifts everything\nusing System;",
+            )
+        ]
+    )
+
+    assert graph.get_file_nodes_with_index(get_fixture_path("subject_3.cs")) == sorted(
+        graph.get_nodes_with_index(), key=lambda node: node.index
+    )
+    for node in graph.get_nodes_with_index():
+        assert (
+            graph.get_enclosing_node_index(node.file_path, node.start_point[0])
+            == node.index
+        )
+
+
+def test_rollback_of_committed_nested_transaction() -> None:
+    graph = DependencyGraph([get_fixture_path("subject_1.cs")])
+    fresh_graph = DependencyGraph([get_fixture_path("subject_1.cs")])
+
+    graph.begin()
+    graph.begin()
+
+    write_text(get_fixture_path("subject_1.cs"), get_fixture("update_2.cs"))
+
+    graph.update_graph_from_edits(
+        [
+            BlockEdit(
+                block_id=0,
+                file_path=get_fixture_path("subject_1.cs"),
+                before="""class SimpleClass
+{
+    static string SimpleMethod()
+    {
+        return "Hello, World!";
+    }
+}""",
+                after="""class SimpleClass
+{
+    static string SimpleMethod()
+    {
+        return "Hello, World!";
+    }
+    static string AnotherMethod()
+    {
+        return "Another Hello, World!";
+    }
+}""",
+            )
+        ]
+    )
+
+    graph.commit()
+
+    assert graph.get_number_of_nodes() == 3
+
+    graph.rollback()
+
+    assert graph.get_nodes_with_index() == fresh_graph.get_nodes_with_index()
+    assert (
+        graph.get_parent_child_relations() == fresh_graph.get_parent_child_relations()
+    )
+    assert graph.next_index == fresh_graph.next_index
+    assert graph.transactions == []
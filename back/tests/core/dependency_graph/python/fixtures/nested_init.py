@@ -0,0 +1,6 @@
+def make_class():
+    class Inner:
+        def __init__(self):
+            self.value = 1
+
+    return Inner
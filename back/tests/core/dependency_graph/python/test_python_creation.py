@@ -1,7 +1,10 @@
+from pathlib import Path
+
 from changing_dot.dependency_graph.dependency_graph import (
     DependencyGraph,
     create_dependency_graph_from_folder,
 )
+from changing_dot.dependency_graph.parse_cache import ParseCache
 from changing_dot.dependency_graph.types import (
     DependencyGraphNodeWithIndex,
     DependencyGraphRelation,
@@ -21,9 +24,9 @@ def test_full_python() -> None:
     assert len(graph_py.get_node_by_type("Field")) == 0
 
 
-def test_we_can_give_python_and_folder_path() -> None:
+def test_we_can_give_python_and_folder_path(tmp_path: Path) -> None:
     graph = create_dependency_graph_from_folder(
-        get_fixture_path("python_folder"), "python"
+        get_fixture_path("python_folder"), "python", parse_cache=ParseCache(tmp_path)
     )
     assert graph.get_number_of_nodes() == 2
 
@@ -109,3 +112,12 @@ def test_pip_requirements_files() -> None:
         )
     ]
     assert len(graph.get_parent_child_relations()) == 0
+
+
+def test_only_init_functions_are_constructors() -> None:
+    graph_py = DependencyGraph([get_fixture_path("nested_init.py")])
+    assert [node.node_type for node in graph_py.get_nodes()] == [
+        "Method",
+        "Class",
+        "Constructor",
+    ]
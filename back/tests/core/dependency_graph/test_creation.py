@@ -1,6 +1,12 @@
+import os
+import subprocess
+import sys
+import threading
+
 from changing_dot.dependency_graph.dependency_graph import (
     DependencyGraph,
 )
+from changing_dot.dependency_graph.node_type_to_terminal import parser_from_file_path
 
 
 def get_fixture_path(file_path: str) -> str:
@@ -17,3 +23,35 @@ def test_unrecognized_extension() -> None:
     graph = DependencyGraph([get_fixture_path("unrecognized_extension.eiei")])
     assert graph.get_number_of_nodes() == 0
     assert graph.get_parent_child_relations() == []
+
+
+def test_grammars_are_loaded_on_first_use() -> None:
+    script = (
+        "import sys\n"
+        "from changing_dot.dependency_graph.dependency_graph import DependencyGraph\n"
+        "DependencyGraph(['./tests/core/dependency_graph/python/fixtures/full.py'])\n"
+        "print(sorted(name for name in sys.modules if name.startswith('tree_sitter_')))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": "src"},
+    )
+    assert output.stdout.strip() == "[]"
+
+
+def test_parsers_are_reused_within_a_thread() -> None:
+    parser = parser_from_file_path("a.cs")
+    assert parser is parser_from_file_path("b.cs")
+    assert parser is not parser_from_file_path("a.py")
+
+    other_thread_parsers = []
+    thread = threading.Thread(
+        target=lambda: other_thread_parsers.append(parser_from_file_path("a.cs"))
+    )
+    thread.start()
+    thread.join()
+
+    assert other_thread_parsers[0] is not parser
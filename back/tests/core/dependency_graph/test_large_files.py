@@ -0,0 +1,87 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from changing_dot.custom_types import BlockEdit
+from changing_dot.dependency_graph.dependency_graph import DependencyGraph
+from changing_dot.dependency_graph.language_matchers import ILanguageMatcher
+from changing_dot.utils.text_functions import write_text
+from tree_sitter import Node
+
+NUMBER_OF_MEMBERS = 3000
+
+
+def get_method(index: int, value: int) -> str:
+    return f"int M{index}(int x)\n    {{\n        return x + {value};\n    }}"
+
+
+def write_big_class(file_path: Path, changed_member: int | None = None) -> None:
+    members = "".join(
+        f"    public int F{i} {{ get; set; }}\n"
+        f"    {get_method(i, -i if i == changed_member else i)}\n"
+        for i in range(NUMBER_OF_MEMBERS)
+    )
+    write_text(str(file_path), f"class Big\n{{\n{members}}}\n")
+
+
+# Matching the blocks of a whole tree costs as much as the tree, doing it for
+# each block of a file is quadratic
+def count_whole_tree_matches(monkeypatch: pytest.MonkeyPatch) -> list[Node]:
+    matched_trees: list[Node] = []
+    match_blocks = ILanguageMatcher.match_blocks
+
+    def counting_match_blocks(
+        self: ILanguageMatcher, ast_node: Node, *args: Any
+    ) -> Any:
+        if ast_node.parent is None and len(args) == 0:
+            matched_trees.append(ast_node)
+        return match_blocks(self, ast_node, *args)
+
+    monkeypatch.setattr(ILanguageMatcher, "match_blocks", counting_match_blocks)
+    return matched_trees
+
+
+def test_file_with_more_than_50k_ast_nodes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    file_path = tmp_path / "Big.cs"
+    write_big_class(file_path)
+    matched_trees = count_whole_tree_matches(monkeypatch)
+
+    graph = DependencyGraph([str(file_path)])
+
+    assert graph.get_tree(str(file_path)).root_node.descendant_count > 50_000
+    assert graph.get_number_of_nodes() == 2 * NUMBER_OF_MEMBERS + 1
+    assert len(matched_trees) == 1
+
+    edited_member = NUMBER_OF_MEMBERS // 2
+    write_big_class(file_path, edited_member)
+    graph.update_graph_from_edits(
+        [
+            BlockEdit(
+                file_path=str(file_path),
+                block_id=2 * edited_member + 2,
+                before=get_method(edited_member, edited_member),
+                after=get_method(edited_member, -edited_member),
+            )
+        ]
+    )
+
+    # The blocks after the edit are shifted without matching the tree again
+    assert len(matched_trees) == 1
+    assert graph.get_node(2 * edited_member + 2).text == get_method(
+        edited_member, -edited_member
+    )
+    assert graph.get_number_of_nodes() == 2 * NUMBER_OF_MEMBERS + 1
+
+
+def test_deeply_nested_project_file(tmp_path: Path) -> None:
+    # Deeper than the Python recursion limit allows for a recursive walk
+    depth = 500
+    file_path = tmp_path / "Deep.csproj"
+    write_text(str(file_path), "<A>" * depth + "<B/>" + "</A>" * depth)
+
+    graph = DependencyGraph([str(file_path)])
+
+    assert graph.get_number_of_nodes() == depth
+    assert len(graph.get_parent_child_relations()) == depth - 1
@@ -0,0 +1,97 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from changing_dot.dependency_graph.dependency_graph import DependencyGraph
+from changing_dot.dependency_graph.parse_cache import ParseCache
+from changing_dot.utils.text_functions import read_source
+
+
+def get_fixture_path(file_path: str) -> str:
+    return "./tests/core/dependency_graph/c_sharp/fixtures/" + file_path
+
+
+def copy_fixtures(folder: Path) -> list[str]:
+    file_paths = []
+    for file_name in ["imports.cs", "simple_method.cs", "small.csproj"]:
+        shutil.copy(get_fixture_path(file_name), folder / file_name)
+        file_paths.append(str(folder / file_name))
+    return file_paths
+
+
+def test_warm_build_matches_cold_build(tmp_path: Path) -> None:
+    file_paths = copy_fixtures(tmp_path)
+    parse_cache = ParseCache(tmp_path / "cache")
+
+    cold_graph = DependencyGraph(file_paths, parse_cache=parse_cache)
+    warm_graph = DependencyGraph(file_paths, parse_cache=parse_cache)
+
+    assert warm_graph.get_nodes_with_index() == cold_graph.get_nodes_with_index()
+    assert (
+        warm_graph.get_parent_child_relations()
+        == cold_graph.get_parent_child_relations()
+    )
+    # Nothing was parsed on the warm build
+    assert warm_graph.trees == {}
+    assert not warm_graph.has_syntax_errors()
+
+
+def test_files_are_read_once_on_a_cold_build(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    file_paths = copy_fixtures(tmp_path)
+    read_file_paths: list[str] = []
+
+    def counting_read_source(file_path: str) -> bytes:
+        read_file_paths.append(file_path)
+        return read_source(file_path)
+
+    monkeypatch.setattr(
+        "changing_dot.dependency_graph.dependency_graph.read_source",
+        counting_read_source,
+    )
+
+    DependencyGraph(file_paths, parse_cache=ParseCache(tmp_path / "cache"))
+
+    assert sorted(read_file_paths) == sorted(file_paths)
+
+
+def test_only_changed_files_are_parsed(tmp_path: Path) -> None:
+    file_paths = copy_fixtures(tmp_path)
+    parse_cache = ParseCache(tmp_path / "cache")
+
+    DependencyGraph(file_paths, parse_cache=parse_cache)
+
+    with open(file_paths[1], "a") as file:
+        file.write("\n// changed\n")
+
+    graph = DependencyGraph(file_paths, parse_cache=parse_cache)
+
+    assert list(graph.trees.keys()) == [file_paths[1]]
+    assert (
+        graph.get_nodes_with_index()
+        == DependencyGraph(file_paths).get_nodes_with_index()
+    )
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    file_paths = copy_fixtures(tmp_path)
+    parse_cache = ParseCache(tmp_path / "cache")
+
+    DependencyGraph(file_paths, parse_cache=parse_cache)
+
+    entries = list((tmp_path / "cache").iterdir())
+    for entry in entries:
+        os.utime(entry, (0, 0))
+
+    sources = [Path(file_path).read_bytes() for file_path in file_paths]
+    assert parse_cache.get(file_paths[1], sources[1]) is not None
+    assert parse_cache.get(file_paths[2], sources[2]) is not None
+
+    parse_cache.max_size = sum(entry.stat().st_size for entry in entries) - 1
+    parse_cache.evict()
+
+    assert parse_cache.get(file_paths[0], sources[0]) is None
+    assert parse_cache.get(file_paths[1], sources[1]) is not None
+    assert parse_cache.get(file_paths[2], sources[2]) is not None
@@ -0,0 +1,247 @@
+import pickle
+import random
+from pathlib import Path
+
+import networkx as nx
+from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.custom_types import (
+    CompileError,
+    ErrorProblemNode,
+    InitialResolveNode,
+    Instruction,
+    ProblemNode,
+    SolutionNode,
+)
+from changing_dot.optimize_graph import optimize_graph
+from changing_dot_visualize.observer import Observer
+
+
+def make_problem_node(line: int) -> ProblemNode:
+    return ProblemNode(
+        index=-1,
+        node_type="problem",
+        status="pending",
+        error=CompileError(
+            text="Error",
+            file_path="./file.cs",
+            pos=(line, 0, line, 1),
+            project_name="Initial project",
+        ),
+    )
+
+
+def make_solution_node() -> SolutionNode:
+    return SolutionNode(
+        index=-1,
+        node_type="solution",
+        status="pending",
+        instruction=Instruction(block_id=0, file_path="./file.cs", solution="Fix"),
+        edits=[],
+    )
+
+
+def scan_pending_nodes(G: ChangingGraph) -> list[int]:
+    return [
+        index
+        for index, node in G.G.nodes(data=True)
+        if node["status"] == "pending"
+        and node["node_type"] in ("problem", "solution", "initial_resolve")
+    ]
+
+
+def test_pending_nodes_follow_status_changes() -> None:
+    G = ChangingGraph()
+    G.add_initial_resolve_node(
+        InitialResolveNode(index=-1, node_type="initial_resolve", status="pending")
+    )
+    problem_index = G.add_problem_node(make_problem_node(1))
+    solution_index = G.add_solution_node(make_solution_node())
+
+    assert G.get_all_pending_nodes() == [0, problem_index, solution_index]
+    assert G.get_next_pending_node() == 0
+
+    G.mark_node_as(0, "handled")
+    assert G.get_next_pending_node() == problem_index
+
+    problem_node = G.get_problem_node(problem_index)
+    G.error_on_problem_node(
+        ErrorProblemNode(
+            index=problem_index,
+            node_type="error_problem",
+            status="failed",
+            error=problem_node.error,
+            error_text="Failed",
+            suspected_instruction=None,
+            suspected_edits=None,
+        )
+    )
+    assert G.get_next_pending_node() == solution_index
+    assert G.get_all_pending_problem_nodes() == []
+
+    G.mark_node_as(solution_index, "handled")
+    assert G.get_next_pending_node() is None
+    assert G.get_all_handled_solution_nodes() == [solution_index]
+
+    G.mark_node_as(solution_index, "pending")
+    assert G.get_next_pending_node() == solution_index
+    assert G.get_all_pending_nodes() == scan_pending_nodes(G)
+
+
+def test_removed_nodes_leave_the_indexes() -> None:
+    G = ChangingGraph()
+    first_index = G.add_problem_node(make_problem_node(1))
+    second_index = G.add_problem_node(make_problem_node(2))
+    G.add_edge(first_index, second_index)
+
+    G.remove_node(first_index)
+    G.remove_redundant_edges()
+
+    assert G.get_all_pending_nodes() == [second_index]
+    assert G.get_next_pending_node() == second_index
+    assert [node.index for node in G.get_all_pending_problem_nodes()] == [second_index]
+
+
+def test_indexes_are_rebuilt_from_a_saved_graph() -> None:
+    G = ChangingGraph()
+    problem_index = G.add_problem_node(make_problem_node(1))
+    solution_index = G.add_solution_node(make_solution_node())
+    G.mark_node_as(solution_index, "handled")
+
+    resumed_G = ChangingGraph(nx.DiGraph(G.G))
+
+    assert resumed_G.get_next_pending_node() == problem_index
+    assert resumed_G.get_all_handled_solution_nodes() == [solution_index]
+
+
+def test_main_loop_handles_many_nodes() -> None:
+    G = ChangingGraph()
+    for line in range(20000):
+        G.add_problem_node(make_problem_node(line))
+
+    handled = 0
+    node_index = G.get_next_pending_node()
+    while node_index is not None:
+        G.mark_node_as(node_index, "handled")
+        handled += 1
+        node_index = G.get_next_pending_node()
+
+    assert handled == 20000
+
+
+def test_find_same_problem_uses_the_problem_index() -> None:
+    G = ChangingGraph()
+    first_index = G.add_problem_node(make_problem_node(1))
+    G.add_problem_node(make_problem_node(2))
+
+    assert G.find_same_problem("./file.cs", 1, "Error") == [first_index]
+    assert G.find_same_problem("./file.cs", 1, "Other error") == []
+
+    G.mark_node_as(first_index, "handled")
+    assert G.find_same_problem("./file.cs", 1, "Error") == [first_index]
+
+    G.remove_node(first_index)
+    assert G.find_same_problem("./file.cs", 1, "Error") == []
+
+
+def test_pending_problems_of_an_error_are_found_by_key() -> None:
+    G = ChangingGraph()
+    first_index = G.add_problem_node(make_problem_node(1))
+    error = make_problem_node(1).error
+
+    assert G.find_pending_problems(error) == [first_index]
+    assert G.find_pending_problems(
+        CompileError(**{**error.model_dump(), "file_path": "file.cs"})
+    ) == [first_index]
+    assert (
+        G.find_pending_problems(
+            CompileError(**{**error.model_dump(), "pos": (1, 0, 1, 2)})
+        )
+        == []
+    )
+
+    G.mark_node_as(first_index, "handled")
+    assert G.find_pending_problems(error) == []
+
+
+def test_duplicate_indexes_survive_pickling() -> None:
+    G = ChangingGraph()
+    problem_index = G.add_problem_node(make_problem_node(1))
+    solution_node = make_solution_node()
+    solution_index = G.add_solution_node(solution_node)
+
+    resumed_G = ChangingGraph(pickle.loads(pickle.dumps(G.G)))
+    pickled_G = pickle.loads(pickle.dumps(G))
+
+    for loaded_G in (resumed_G, pickled_G):
+        assert loaded_G.find_same_problem("./file.cs", 1, "Error") == [problem_index]
+        assert loaded_G.find_same_solution(
+            solution_node.instruction, solution_node.edits
+        ) == [solution_index]
+
+
+def build_random_graph(
+    number_of_nodes: int, number_of_edges: int, seed: int
+) -> ChangingGraph:
+    generator = random.Random(seed)
+    G = ChangingGraph()
+    for _ in range(number_of_nodes):
+        G.add_solution_node(make_solution_node())
+    for _ in range(number_of_edges):
+        source, target = generator.sample(range(number_of_nodes), 2)
+        G.add_edge(source, target)
+    return G
+
+
+def reference_optimization(G: ChangingGraph) -> nx.DiGraph:
+    # Merge every cycle into one node named after its members, then reduce
+    condensation = nx.condensation(G.G)
+    named = nx.relabel_nodes(
+        condensation,
+        {
+            component: frozenset(members)
+            for component, members in condensation.nodes(data="members")
+        },
+    )
+    reduced: nx.DiGraph = nx.transitive_reduction(named)
+    return reduced
+
+
+def optimized_graph_by_members(
+    G: ChangingGraph, merged: dict[int, set[int]]
+) -> set[tuple[frozenset[int], frozenset[int]]]:
+    def name(index: int) -> frozenset[int]:
+        return frozenset(merged.get(index, {index}))
+
+    return {(name(source), name(target)) for source, target in G.G.edges()}
+
+
+def test_optimize_graph_merges_cycles_and_reduces_edges(tmp_path: Path) -> None:
+    for seed in range(20):
+        G = build_random_graph(40, 70, seed)
+        expected = reference_optimization(G)
+        cycles = [set(cycle) for cycle in G.get_cycles()]
+        first_merged_index = G.next_index
+
+        optimize_graph(G, Observer(G, "test", str(tmp_path)))
+
+        merged = {
+            first_merged_index + position: cycle
+            for position, cycle in enumerate(cycles)
+        }
+        assert G.get_cycles() == []
+        assert optimized_graph_by_members(G, merged) == set(expected.edges())
+        assert G.get_number_of_nodes() == expected.number_of_nodes()
+
+
+def test_redundant_edges_of_a_large_graph_are_removed() -> None:
+    G = ChangingGraph()
+    for _ in range(5000):
+        G.add_problem_node(make_problem_node(0))
+    for index in range(1, 5000):
+        G.add_edge(index - 1, index)
+        if index >= 10:
+            G.add_edge(index - 10, index)
+
+    G.remove_redundant_edges()
+
+    assert G.get_number_of_edges() == 4999
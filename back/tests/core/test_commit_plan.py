@@ -0,0 +1,135 @@
+import random
+
+from changing_dot.apply_graph_changes import apply_graph_changes
+from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.commit.commit_plan import plan_commits
+from changing_dot.custom_types import (
+    BlockEdit,
+    CompileError,
+    Instruction,
+    NodeStatus,
+    ProblemNode,
+    SolutionNode,
+)
+from changing_dot.dependency_graph.dependency_graph import DependencyGraph
+from changing_dot.modifyle.modifyle import IModifyle
+
+
+def add_solution_node(G: ChangingGraph, status: NodeStatus = "handled") -> int:
+    index = G.next_index
+    return G.add_solution_node(
+        SolutionNode(
+            index=-1,
+            node_type="solution",
+            status=status,
+            instruction=Instruction(block_id=index, file_path="./file.cs", solution=""),
+            edits=[
+                BlockEdit(
+                    file_path="./file.cs",
+                    block_id=index,
+                    before="before",
+                    after=f"after {index}",
+                )
+            ],
+        )
+    )
+
+
+def add_problem_node(G: ChangingGraph) -> int:
+    return G.add_problem_node(
+        ProblemNode(
+            index=-1,
+            node_type="problem",
+            status="handled",
+            error=CompileError(
+                text="Error", file_path="./file.cs", project_name="", pos=(0, 0, 0, 0)
+            ),
+        )
+    )
+
+
+def peel_leaves(G: ChangingGraph) -> list[int]:
+    # Order of the commits when leaves were removed from the graph one by one
+    G = ChangingGraph(G.G.copy())
+    order = []
+    leaves = G.get_leaves()
+    while len(leaves) > 0:
+        leaf = leaves.pop()
+        if G.get_node(leaf).node_type == "solution":
+            order.append(leaf)
+        G.remove_node(leaf)
+        leaves = G.get_leaves()
+    return order
+
+
+def test_plan_commits_leaves_first_and_keeps_the_graph() -> None:
+    G = ChangingGraph()
+    problem_index = add_problem_node(G)
+    solution_index = add_solution_node(G)
+    failed_index = add_solution_node(G, "failed")
+    new_problem_index = add_problem_node(G)
+    new_solution_index = add_solution_node(G)
+    G.add_edge(problem_index, solution_index)
+    G.add_edge(problem_index, failed_index)
+    G.add_edge(solution_index, new_problem_index)
+    G.add_edge(new_problem_index, new_solution_index)
+
+    plan = plan_commits(G)
+
+    assert [node.index for node in plan.solution_nodes] == [
+        new_solution_index,
+        solution_index,
+    ]
+    assert plan.skipped_nodes == [failed_index]
+    assert plan.get_edits_list() == [
+        G.get_solution_node(new_solution_index).edits,
+        G.get_solution_node(solution_index).edits,
+    ]
+    assert G.get_number_of_nodes() == 5
+    assert G.get_number_of_edges() == 4
+
+
+def test_plan_commits_follows_the_leaf_order() -> None:
+    generator = random.Random(0)
+    for _ in range(20):
+        G = ChangingGraph()
+        for _ in range(50):
+            if generator.random() < 0.5:
+                add_solution_node(G)
+            else:
+                add_problem_node(G)
+        for _ in range(80):
+            source, target = sorted(generator.sample(range(50), 2))
+            G.add_edge(source, target)
+
+        assert [node.index for node in plan_commits(G).solution_nodes] == (
+            peel_leaves(G)
+        )
+
+
+class RecordingModifyle(IModifyle):
+    def __init__(self) -> None:
+        self.applied_edits: list[list[BlockEdit]] = []
+
+    def apply_change(self, DG: DependencyGraph, edits: list[BlockEdit]) -> None:
+        self.applied_edits.append(edits)
+
+
+def test_changes_of_a_graph_with_a_cycle_are_applied_in_node_order() -> None:
+    # Graphs are applied before being optimized, they can still have cycles
+    G = ChangingGraph()
+    first_solution = add_solution_node(G)
+    problem = add_problem_node(G)
+    second_solution = add_solution_node(G)
+    add_solution_node(G, "failed")
+    G.add_edge(first_solution, problem)
+    G.add_edge(problem, second_solution)
+    G.add_edge(second_solution, first_solution)
+    modifyle = RecordingModifyle()
+
+    apply_graph_changes(G, DependencyGraph([]), modifyle, None)
+
+    assert modifyle.applied_edits == [
+        G.get_solution_node(first_solution).edits,
+        G.get_solution_node(second_solution).edits,
+    ]
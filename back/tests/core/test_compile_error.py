@@ -0,0 +1,50 @@
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+from changing_dot.custom_types import CompileError
+
+
+def test_compile_error_key_ignores_project_and_path_form() -> None:
+    relative_error = CompileError(
+        text="Error",
+        file_path="./file.cs",
+        project_name="First project",
+        pos=(1, 0, 1, 1),
+    )
+    absolute_error = CompileError(
+        text="Error",
+        file_path=os.path.abspath("file.cs"),
+        project_name="Second project",
+        pos=(1, 0, 1, 1),
+    )
+    other_error = relative_error.model_copy(update={"pos": (2, 0, 2, 1)})
+
+    assert relative_error.key == absolute_error.key
+    assert {relative_error.key, absolute_error.key, other_error.key} == {
+        relative_error.key,
+        other_error.key,
+    }
+    # The key does not change how errors compare or are saved
+    assert relative_error == pickle.loads(pickle.dumps(relative_error))
+    assert "key" not in relative_error.model_dump()
+
+
+def test_compile_error_key_follows_the_working_directory_after_pickling(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    error = CompileError(
+        text="Error",
+        file_path="./file.cs",
+        project_name="Project",
+        pos=(1, 0, 1, 1),
+    )
+    assert error.key[0] == os.path.abspath("file.cs")
+    saved_error = pickle.dumps(error)
+    moved_error = error.model_copy(update={"pos": (2, 0, 2, 1)})
+
+    monkeypatch.chdir(tmp_path)
+
+    assert pickle.loads(saved_error).key[0] == str(tmp_path / "file.cs")
+    assert moved_error.key == (str(tmp_path / "file.cs"), (2, 0, 2, 1), "Error")
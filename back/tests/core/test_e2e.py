@@ -1,11 +1,11 @@
 import os
-import pickle
 import shutil
 from collections.abc import Generator
 
 import pytest
 from changing_dot.apply_graph_changes import apply_graph_changes
 from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.changing_graph.graph_journal import GraphJournal
 from changing_dot.create_graph import create_graph
 from changing_dot.custom_types import (
     BlockEdit,
@@ -129,24 +129,14 @@ def test_e2e() -> None:
 
     ### assert
 
-    expected_directory_path = "./outputs/tmp"
+    journal = GraphJournal("./outputs/tmp")
 
-    files = [
-        f
-        for f in os.listdir(expected_directory_path)
-        if os.path.isfile(os.path.join(expected_directory_path, f))
-    ]
+    assert journal.number_of_steps == 2
 
-    assert len(files) == 2
-
-    expected_file_path = "./outputs/tmp/step_1.pickle"
-
-    with open(expected_file_path, "rb") as pickle_file:
-        data = pickle.load(pickle_file)
-        data_graph = ChangingGraph(data)
-        assert (
-            data_graph.get_number_of_nodes() == 3
-        )  # 1 initial -> 1 solution failed -> 1 solution ok
+    data_graph = ChangingGraph(journal.load_step(1))
+    assert (
+        data_graph.get_number_of_nodes() == 3
+    )  # 1 initial -> 1 solution failed -> 1 solution ok
 
     assert read_text("./tests/core/fixtures/e2e/base.cs") == initial_file_content
 
@@ -215,21 +205,11 @@ def test_e2e() -> None:
 
     ## assert
 
-    expected_directory_path = "./outputs/tmp"
-
-    files = [
-        f
-        for f in os.listdir(expected_directory_path)
-        if os.path.isfile(os.path.join(expected_directory_path, f))
-    ]
-
-    assert len(files) == 3  # add a new step
+    journal = GraphJournal("./outputs/tmp")
 
-    expected_file_path = "./outputs/tmp/step_2.pickle"
+    assert journal.number_of_steps == 3  # add a new step
 
-    with open(expected_file_path, "rb") as pickle_file:
-        data = pickle.load(pickle_file)
-        data_graph = ChangingGraph(data)
-        assert (
-            data_graph.get_number_of_nodes() == 2
-        )  # Removes failed and correct solution then adds a new solution
+    data_graph = ChangingGraph(journal.load_step(2))
+    assert (
+        data_graph.get_number_of_nodes() == 2
+    )  # Removes failed and correct solution then adds a new solution
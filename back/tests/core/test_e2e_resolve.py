@@ -1,10 +1,10 @@
 import os
-import pickle
 import shutil
 from collections.abc import Generator
 
 import pytest
 from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.changing_graph.graph_journal import GraphJournal
 from changing_dot.custom_types import (
     BlockEdit,
     CompileError,
@@ -101,27 +101,13 @@ def test_e2e_resolve() -> None:
 
     ### assert
 
-    expected_directory_path = "./outputs/tmp"
+    journal = GraphJournal("./outputs/tmp")
 
-    files = [
-        f
-        for f in os.listdir(expected_directory_path)
-        if os.path.isfile(os.path.join(expected_directory_path, f))
-    ]
-
-    assert len(files) == 3
+    assert journal.number_of_steps == 3
     # init step -> solve step -> opti step
 
-    expected_file_path = "./outputs/tmp/step_1.pickle"
-
-    with open(expected_file_path, "rb") as pickle_file:
-        data = pickle.load(pickle_file)
-        data_graph = ChangingGraph(data)
-        assert (
-            data_graph.get_number_of_nodes() == 3
-        )  # 1 initial -> 1 problem -> 1 solution
-        assert (
-            data_graph.get_number_of_edges() == 2
-        )  # 1 initial -> 1 problem -> 1 solution
+    data_graph = ChangingGraph(journal.load_step(1))
+    assert data_graph.get_number_of_nodes() == 3  # 1 initial -> 1 problem -> 1 solution
+    assert data_graph.get_number_of_edges() == 2  # 1 initial -> 1 problem -> 1 solution
 
     assert read_text("./tests/core/fixtures/e2e/base.cs") == changed_file_content
@@ -0,0 +1,180 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import grpc
+import pytest
+from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.custom_types import BlockEdit, CompileError, RestrictionOptions
+from changing_dot.dependency_graph.dependency_graph import DependencyGraph
+from changing_dot.error_manager import roslyn_error_manager
+from changing_dot.error_manager.roslyn_error_manager import RoslynErrorManager
+from changing_dot.generated_grpc.feedback_server_pb2 import (
+    Error,
+    GetCompileErrorsReply,
+    GetDiagnosticDeltaReply,
+    GetDocumentDiagnosticsReply,
+)
+from changing_dot.generated_grpc.feedback_server_pb2_grpc import (
+    FeedbackServerServicer,
+    add_FeedbackServerServicer_to_server,
+)
+from changing_dot_visualize.observer import Observer
+
+SUBJECT_PATH = "./tests/core/fixtures/subject.cs"
+
+
+def get_compile_error(line: int, file_path: str = "./file.cs") -> CompileError:
+    return CompileError(
+        text=f"Error {line}",
+        file_path=file_path,
+        project_name="test",
+        pos=(line, 1, line, 2),
+    )
+
+
+def get_error(line: int, file_path: str = "./file.cs") -> Error:
+    return Error(
+        errorText=f"Error {line}",
+        projectName="test",
+        filePath=file_path,
+        position=[line, 1, line, 2],
+    )
+
+
+class FakeFeedbackServer(FeedbackServerServicer):  # type: ignore[misc]
+    def __init__(self) -> None:
+        self.requests: list[str] = []
+
+    def GetCompileErrors(self, request: Any, context: Any) -> GetCompileErrorsReply:
+        self.requests.append("GetCompileErrors")
+        return GetCompileErrorsReply(Errors=[get_error(1), get_error(2)], snapshotId=1)
+
+    def GetDiagnosticDelta(self, request: Any, context: Any) -> GetDiagnosticDeltaReply:
+        self.requests.append(f"GetDiagnosticDelta {request.sinceSnapshot}")
+        if request.sinceSnapshot == 1:
+            # Errors 3 and 2, the new error comes first
+            return GetDiagnosticDeltaReply(
+                snapshotId=2,
+                added=[get_error(3)],
+                removed=[get_error(1)],
+                order=[2, 1],
+            )
+        # Unknown snapshot
+        return GetDiagnosticDeltaReply(
+            snapshotId=3, isFull=True, added=[get_error(4)], order=[0]
+        )
+
+    def GetDocumentDiagnostics(
+        self, request: Any, context: Any
+    ) -> GetDocumentDiagnosticsReply:
+        self.requests.append(
+            f"GetDocumentDiagnostics {request.startLine}-{request.endLine}"
+        )
+        # The error stays as long as the property is named Size
+        text = next(
+            document.text
+            for document in request.documents
+            if document.filePath == request.documentPath
+        )
+        errors = (
+            [get_error(request.startLine, request.documentPath)]
+            if "int Size {" in text
+            else []
+        )
+        return GetDocumentDiagnosticsReply(documentFound=True, Errors=errors)
+
+
+@pytest.fixture()
+def feedback_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeFeedbackServer]:
+    servicer = FakeFeedbackServer()
+    server = grpc.server(ThreadPoolExecutor(max_workers=1))
+    add_FeedbackServerServicer_to_server(servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    monkeypatch.setattr(roslyn_error_manager, "ANAYLZER_URL", f"localhost:{port}")
+    yield servicer
+    server.stop(None)
+
+
+def test_roslyn_errors_are_updated_from_deltas(
+    feedback_server: FakeFeedbackServer, tmp_path: Path
+) -> None:
+    observer = Observer(ChangingGraph(), "test", str(tmp_path))
+    error_manager = RoslynErrorManager("./solution.sln", RestrictionOptions())
+
+    assert error_manager.get_compile_errors(observer) == [
+        get_compile_error(1),
+        get_compile_error(2),
+    ]
+    assert error_manager.get_compile_errors(observer) == [
+        get_compile_error(3),
+        get_compile_error(2),
+    ]
+    assert error_manager.get_compile_errors(observer) == [get_compile_error(4)]
+    assert feedback_server.requests == [
+        "GetCompileErrors",
+        "GetDiagnosticDelta 1",
+        "GetDiagnosticDelta 2",
+    ]
+
+
+def test_roslyn_error_is_checked_in_its_document(
+    feedback_server: FakeFeedbackServer, tmp_path: Path
+) -> None:
+    observer = Observer(ChangingGraph(), "test", str(tmp_path))
+    error_manager = RoslynErrorManager("./solution.sln", RestrictionOptions())
+    DG = DependencyGraph([SUBJECT_PATH])
+    compile_error = get_compile_error(26, SUBJECT_PATH)
+
+    def get_edits(after: str) -> list[BlockEdit]:
+        return [
+            BlockEdit(
+                file_path=SUBJECT_PATH,
+                block_id=7,
+                before="[JsonIgnore]\n        public int Size { get; set; }",
+                after=after,
+            )
+        ]
+
+    assert not error_manager.is_error_solved_with_edits(
+        DG,
+        get_edits("[JsonProperty]\n        public int Size { get; set; }"),
+        compile_error,
+        observer,
+    )
+    assert error_manager.is_error_solved_with_edits(
+        DG,
+        get_edits("[JsonIgnore]\n        public int ChangedSize { get; set; }"),
+        compile_error,
+        observer,
+    )
+    assert feedback_server.requests == [
+        "GetDocumentDiagnostics 26-26",
+        "GetDocumentDiagnostics 26-26",
+    ]
+
+
+def test_invalid_edits_are_not_sent_to_the_analyzer(
+    feedback_server: FakeFeedbackServer, tmp_path: Path
+) -> None:
+    observer = Observer(ChangingGraph(), "test", str(tmp_path))
+    error_manager = RoslynErrorManager("./solution.sln", RestrictionOptions())
+    DG = DependencyGraph([SUBJECT_PATH])
+    edits = [
+        BlockEdit(
+            file_path=SUBJECT_PATH,
+            block_id=7,
+            before="[JsonIgnore]\n        public string Size { get; set; }",
+            after="[JsonIgnore]\n        public int ChangedSize { get; set; }",
+        )
+    ]
+
+    with pytest.raises(AssertionError, match="The before does not match"):
+        error_manager.is_error_solved_with_edits(
+            DG, edits, get_compile_error(26, SUBJECT_PATH), observer
+        )
+    with pytest.raises(AssertionError, match="The before does not match"):
+        error_manager.get_compile_errors_with_edits(DG, edits, observer)
+    assert feedback_server.requests == []
@@ -0,0 +1,251 @@
+import gc
+import os
+import pickle
+import random
+import subprocess
+import sys
+import weakref
+from pathlib import Path
+from typing import Any
+
+import networkx as nx
+import pytest
+from changing_dot.changing_graph import graph_journal
+from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.changing_graph.graph_journal import (
+    JOURNAL_FILE_NAME,
+    MANIFEST_FILE_NAME,
+    GraphJournal,
+)
+from changing_dot.custom_types import CompileError, ProblemNode
+from changing_dot_visualize.observer import Observer
+
+GraphState = tuple[list[tuple[int, dict[str, Any]]], set[tuple[int, int]]]
+
+
+def add_problem_node(G: ChangingGraph, line: int) -> int:
+    return G.add_problem_node(
+        ProblemNode(
+            index=-1,
+            node_type="problem",
+            status="pending",
+            error=CompileError(
+                text="Error",
+                file_path="./file.cs",
+                project_name="test",
+                pos=(line, 0, line, 1),
+            ),
+        )
+    )
+
+
+def get_state(G: nx.DiGraph) -> GraphState:
+    return [(node, dict(attributes)) for node, attributes in G.nodes(data=True)], set(
+        G.edges()
+    )
+
+
+def run_random_steps(
+    G: ChangingGraph, observer: Observer, number_of_steps: int, seed: int
+) -> list[GraphState]:
+    generator = random.Random(seed)
+    states: list[GraphState] = []
+    for step in range(number_of_steps):
+        for _ in range(3):
+            add_problem_node(G, step)
+        nodes = list(G.G.nodes())
+        for _ in range(3):
+            source, target = generator.sample(nodes, 2)
+            G.add_edge(source, target)
+        G.mark_node_as(generator.choice(nodes), "handled")
+        if generator.random() < 0.3:
+            G.remove_node(generator.choice(nodes))
+        edges = list(G.G.edges())
+        if len(edges) > 0 and generator.random() < 0.3:
+            G.remove_edge(*generator.choice(edges))
+        observer.log(f"Step {step}")
+        observer.save_graph_state()
+        states.append(get_state(G.G))
+    observer.flush()
+    return states
+
+
+@pytest.fixture(autouse=True)
+def _small_snapshot_interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(graph_journal, "SNAPSHOT_INTERVAL", 4)
+
+
+def test_journal_rebuilds_every_step(tmp_path: Path) -> None:
+    G = ChangingGraph()
+    observer = Observer(G, "run", str(tmp_path))
+    states = run_random_steps(G, observer, 15, 0)
+
+    journal = GraphJournal(str(tmp_path / "run"))
+
+    assert journal.number_of_steps == 15
+    assert sorted(os.listdir(tmp_path / "run")) == sorted(
+        [JOURNAL_FILE_NAME, MANIFEST_FILE_NAME]
+        + [f"snapshot_{step}.pickle" for step in (0, 4, 8, 12)]
+    )
+    for step, state in enumerate(states):
+        G_at_step = journal.load_step(step)
+        assert get_state(G_at_step) == state
+        assert [log.children for log in G_at_step.graph["step_logs"]] == [
+            [f"Step {step}"]
+        ]
+    assert [get_state(G_at_step) for G_at_step in journal.load_all_steps()] == states
+    assert get_state(journal.load_latest()) == states[-1]
+
+
+def test_resumed_run_appends_to_the_journal(tmp_path: Path) -> None:
+    G = ChangingGraph()
+    states = run_random_steps(G, Observer(G, "run", str(tmp_path)), 6, 1)
+
+    journal = GraphJournal(str(tmp_path / "run"))
+    resumed_G = ChangingGraph(journal.load_latest())
+    resumed_observer = Observer(
+        resumed_G, "run", str(tmp_path), step=journal.number_of_steps
+    )
+    states += run_random_steps(resumed_G, resumed_observer, 3, 2)
+
+    journal = GraphJournal(str(tmp_path / "run"))
+    assert [get_state(G_at_step) for G_at_step in journal.load_all_steps()] == states
+
+
+def test_journal_ignores_a_cut_record(tmp_path: Path) -> None:
+    G = ChangingGraph()
+    states = run_random_steps(G, Observer(G, "run", str(tmp_path)), 3, 3)
+
+    journal_path = tmp_path / "run" / JOURNAL_FILE_NAME
+    journal_path.write_bytes(journal_path.read_bytes()[:-1])
+
+    journal = GraphJournal(str(tmp_path / "run"))
+    assert journal.number_of_steps == 2
+    assert get_state(journal.load_latest()) == states[1]
+
+
+def test_latest_step_is_loaded_from_the_manifest(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    G = ChangingGraph()
+    states = run_random_steps(G, Observer(G, "run", str(tmp_path)), 10, 4)
+
+    opened_files: list[str] = []
+    original_open = open
+
+    def open_and_record(file: str, *args: Any, **kwargs: Any) -> Any:
+        opened_files.append(os.path.basename(file))
+        return original_open(file, *args, **kwargs)
+
+    def fail_listdir(directory: str) -> list[str]:
+        raise AssertionError(f"{directory} was listed")
+
+    monkeypatch.setattr(os, "listdir", fail_listdir)
+    monkeypatch.setattr("builtins.open", open_and_record)
+
+    journal = GraphJournal(str(tmp_path / "run"))
+    assert journal.number_of_steps == 10
+    assert get_state(journal.load_latest()) == states[-1]
+    assert opened_files == [
+        MANIFEST_FILE_NAME,
+        "snapshot_8.pickle",
+        JOURNAL_FILE_NAME,
+    ]
+
+    monkeypatch.undo()
+    (tmp_path / "run" / MANIFEST_FILE_NAME).unlink()
+    journal = GraphJournal(str(tmp_path / "run"))
+    assert journal.number_of_steps == 10
+    assert get_state(journal.load_step(5)) == states[5]
+
+
+def test_journal_reads_runs_saved_as_pickles(tmp_path: Path) -> None:
+    graphs = []
+    for step in range(3):
+        G = nx.DiGraph()
+        G.add_nodes_from(range(step + 1))
+        graphs.append(G)
+        with open(tmp_path / f"step_{step}.pickle", "wb") as file:
+            pickle.dump(G, file)
+
+    journal = GraphJournal(str(tmp_path))
+
+    assert journal.number_of_steps == 3
+    assert list(journal.load_step(1).nodes()) == [0, 1]
+    assert [list(G.nodes()) for G in journal.load_all_steps()] == [
+        list(G.nodes()) for G in graphs
+    ]
+
+
+def test_checkpoints_follow_the_cadence(tmp_path: Path) -> None:
+    G = ChangingGraph()
+    observer = Observer(G, "run", str(tmp_path), checkpoint_every_steps=3)
+    for line in range(7):
+        add_problem_node(G, line)
+        observer.save_graph_state()
+
+    assert observer.step == 2
+    observer.flush()
+
+    journal = GraphJournal(str(tmp_path / "run"))
+    assert journal.number_of_steps == 3
+    assert [G_at_step.number_of_nodes() for G_at_step in journal.load_all_steps()] == [
+        3,
+        6,
+        7,
+    ]
+
+    timed_observer = Observer(
+        G,
+        "timed_run",
+        str(tmp_path),
+        checkpoint_every_steps=100,
+        checkpoint_every_seconds=0,
+    )
+    timed_observer.save_graph_state()
+    timed_observer.save_graph_state()
+    assert timed_observer.step == 2
+    timed_observer.close()
+
+
+def test_pending_checkpoints_are_written_on_interrupt(tmp_path: Path) -> None:
+    script = f"""
+from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.custom_types import InitialResolveNode
+from changing_dot_visualize.observer import Observer
+
+G = ChangingGraph()
+with Observer(G, "run", {str(tmp_path)!r}, checkpoint_every_steps=10) as observer:
+    for _ in range(5):
+        G.add_initial_resolve_node(
+            InitialResolveNode(index=-1, node_type="initial_resolve", status="pending")
+        )
+        observer.save_graph_state()
+    raise KeyboardInterrupt
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=False,
+        env={**os.environ, "PYTHONPATH": "src"},
+    )
+
+    assert "KeyboardInterrupt" in result.stderr
+    journal = GraphJournal(str(tmp_path / "run"))
+    assert journal.number_of_steps == 1
+    assert journal.load_latest().number_of_nodes() == 5
+
+
+def test_observers_that_are_not_closed_are_collected(tmp_path: Path) -> None:
+    G = ChangingGraph()
+    observer = Observer(G, "run", str(tmp_path))
+    add_problem_node(G, 0)
+    observer.save_graph_state()
+    observer_reference = weakref.ref(observer)
+
+    del observer
+    gc.collect()
+
+    assert observer_reference() is None
+    assert GraphJournal(str(tmp_path / "run")).number_of_steps == 1
@@ -0,0 +1,110 @@
+from pathlib import Path
+
+from changing_dot.changing_graph.changing_graph import ChangingGraph
+from changing_dot.custom_types import (
+    BlockEdit,
+    CompileError,
+    Instruction,
+    ProblemNode,
+)
+from changing_dot.dependency_graph.dependency_graph import DependencyGraph
+from changing_dot.error_manager.error_manager import HardCodedErrorManager
+from changing_dot.handle_node import handle_problem_node
+from changing_dot.instruction_interpreter.hard_coded_instruction_interpreter import (
+    HardCodedInstructionInterpreter,
+)
+from changing_dot.instruction_manager.hard_coded_instruction_manager import (
+    HardCodedInstructionManager,
+)
+from changing_dot.modifyle.modifyle import FakeModifyle
+from changing_dot_visualize.observer import Observer
+
+
+# Every solution is valid, the hardcoded errors are the ones after each
+# accepted solution
+class AcceptingErrorManager(HardCodedErrorManager):
+    def is_error_solved_with_edits(
+        self,
+        DG: DependencyGraph,
+        edits: list[BlockEdit],
+        compile_error: CompileError,
+        observer: Observer,
+    ) -> bool:
+        return True
+
+    def has_syntax_errors_with_edits(
+        self, DG: DependencyGraph, edits: list[BlockEdit]
+    ) -> bool:
+        return False
+
+
+def get_compile_error(line: int) -> CompileError:
+    return CompileError(
+        text=f"Error {line}",
+        file_path="./file.cs",
+        project_name="test",
+        pos=(line, 1, line, 2),
+    )
+
+
+def add_problem_node(G: ChangingGraph, line: int) -> int:
+    return G.add_problem_node(
+        ProblemNode(
+            index=-1,
+            node_type="problem",
+            status="pending",
+            error=get_compile_error(line),
+        )
+    )
+
+
+def handle(
+    G: ChangingGraph,
+    problem_index: int,
+    error_manager: HardCodedErrorManager,
+    observer: Observer,
+) -> None:
+    edit = BlockEdit(file_path="./file.cs", block_id=0, before="", after="")
+    handle_problem_node(
+        G,
+        DependencyGraph([]),
+        problem_index,
+        HardCodedInstructionManager(
+            Instruction(block_id=0, file_path="./file.cs", solution="")
+        ),
+        HardCodedInstructionInterpreter(edit),
+        FakeModifyle(),
+        error_manager,
+        observer,
+    )
+
+
+def test_problems_are_solved_from_the_current_errors(tmp_path: Path) -> None:
+    G = ChangingGraph()
+    observer = Observer(G, "test", str(tmp_path))
+    error_manager = AcceptingErrorManager(
+        [
+            [get_compile_error(2), get_compile_error(3)],
+            [get_compile_error(3)],
+        ]
+    )
+    first_problem = add_problem_node(G, 1)
+    second_problem = add_problem_node(G, 2)
+
+    handle(G, first_problem, error_manager, observer)
+
+    # Pending again while error 4 is already gone, as when a problem is resumed
+    resumed_problem = add_problem_node(G, 4)
+    third_problem = next(
+        problem_node.index
+        for problem_node in G.get_all_pending_problem_nodes()
+        if problem_node.error == get_compile_error(3)
+    )
+
+    handle(G, second_problem, error_manager, observer)
+
+    assert G.get_node(resumed_problem).status == "handled"
+    assert G.get_node(third_problem).status == "pending"
+    assert [
+        problem_node.index for problem_node in G.get_all_pending_problem_nodes()
+    ] == [third_problem]
@@ -7,6 +7,7 @@ from changing_dot.modifyle.modifyle import (
     IModifyle,
     IntegralModifyle,
     applied_edits_context,
+    get_edited_texts,
 )
 from changing_dot.utils.text_functions import write_text
 
@@ -345,3 +346,100 @@ def test_applied_edits_context(
     assert get_subject() == get_fixture("base.cs")
     assert get_fixture("subject2.cs") == get_fixture("base.cs")
     assert DG.get_node(7).text == "[JsonIgnore]\n        public int Size { get; set; }"
+
+
+def test_applied_edits_context_restores_the_whole_graph(
+    modifyle: IModifyle,
+    base: str,
+) -> None:
+    file_paths = [
+        "./tests/core/fixtures/subject2.cs",
+        "./tests/core/fixtures/subject.cs",
+    ]
+    DG = DependencyGraph(file_paths)
+
+    edits: list[BlockEdit] = [
+        BlockEdit(
+            file_path="./tests/core/fixtures/subject2.cs",
+            block_id=10,
+            before="using Newtonsoft.Json;",
+            after="// New line yo !\nusing Newtonsoft.Json;",
+        ),
+        BlockEdit(
+            file_path="./tests/core/fixtures/subject.cs",
+            block_id=7,
+            before="[JsonIgnore]\n        public int Size { get; set; }",
+            after="[JsonIgnore]\n        public int ChangedSize { get; set; }",
+        ),
+    ]
+
+    with applied_edits_context(DG, edits), applied_edits_context(DG, []):
+        pass
+
+    fresh_DG = DependencyGraph(file_paths)
+
+    assert DG.get_nodes_with_index() == fresh_DG.get_nodes_with_index()
+    assert DG.get_parent_child_relations() == fresh_DG.get_parent_child_relations()
+    assert DG.next_index == fresh_DG.next_index
+    for file_path in file_paths:
+        assert str(DG.get_tree(file_path).root_node) == str(
+            fresh_DG.get_tree(file_path).root_node
+        )
+        assert DG.get_file_nodes_with_index(
+            file_path
+        ) == fresh_DG.get_file_nodes_with_index(file_path)
+
+
+def test_edited_texts_match_the_applied_edits(base: str) -> None:
+    file_paths = [
+        "./tests/core/fixtures/subject2.cs",
+        "./tests/core/fixtures/subject.cs",
+    ]
+    DG = DependencyGraph(file_paths)
+
+    edits: list[BlockEdit] = [
+        BlockEdit(
+            file_path="./tests/core/fixtures/subject2.cs",
+            block_id=16,
+            before="[JsonIgnore]\n        public int Size { get; set; }",
+            after="[JsonDataIgnore]\n        public int Size { get; set; }",
+        ),
+        BlockEdit(
+            file_path="./tests/core/fixtures/subject2.cs",
+            block_id=10,
+            before="using Newtonsoft.Json;",
+            after="// New line yo !\nusing Newtonsoft.Json;",
+        ),
+        BlockEdit(
+            file_path="./tests/core/fixtures/subject2.cs",
+            block_id=13,
+            before="[JsonIgnore]\n        public string? DistinctId { get; set; }",
+            after="public string? DistinctId { get; set; }",
+        ),
+        BlockEdit(
+            file_path="./tests/core/fixtures/subject.cs",
+            block_id=7,
+            before="[JsonIgnore]\n        public int Size { get; set; }",
+            after="[JsonIgnore]\n        public int ChangedSize { get; set; }",
+        ),
+    ]
+
+    assert get_edited_texts(DG, edits) == {
+        "./tests/core/fixtures/subject2.cs": get_fixture("multiple_changes.cs"),
+        "./tests/core/fixtures/subject.cs": get_fixture("basic_change.cs"),
+    }
+    assert get_subject() == get_fixture("base.cs")
+    assert get_fixture("subject2.cs") == get_fixture("base.cs")
+    assert DG.get_node(7).text == "[JsonIgnore]\n        public int Size { get; set; }"
+
+    class_node = DG.get_node(2)
+    overlapping_edits = [
+        BlockEdit(
+            file_path="./tests/core/fixtures/subject.cs",
+            block_id=2,
+            before=class_node.text,
+            after=class_node.text.replace("BaseAction", "Action"),
+        ),
+        edits[3],
+    ]
+    assert get_edited_texts(DG, overlapping_edits) is None
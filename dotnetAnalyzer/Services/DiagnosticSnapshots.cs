@@ -0,0 +1,88 @@
+namespace RoslynAnalyzer;
+
+// Order holds the current errors, each as its index in the errors of the
+// snapshot followed by the added errors
+public record DiagnosticDelta(long SnapshotId, bool IsFull, List<CompileError> Added, List<CompileError> Removed, List<int> Order);
+
+// Errors of the last analyses, each kept under a snapshot id so that clients
+// only ask for what changed since the errors they already have. Older
+// snapshots are dropped. A snapshot only stands for the solution it was taken
+// from, a delta from the snapshot of another solution is full.
+public class DiagnosticSnapshots
+{
+    const int MaxSnapshots = 16;
+
+    record Snapshot(string SolutionPath, List<CompileError> CompileErrors);
+
+    readonly object snapshotsLock = new();
+    readonly Dictionary<long, Snapshot> snapshots = [];
+    readonly Queue<long> snapshotIds = new();
+    long lastSnapshotId = 0;
+
+    public long Add(string solutionPath, List<CompileError> compileErrors)
+    {
+        return Add(new Snapshot(GetSolutionKey(solutionPath), compileErrors));
+    }
+
+    public DiagnosticDelta GetDelta(string solutionPath, long sinceSnapshotId, List<CompileError> compileErrors)
+    {
+        var snapshot = new Snapshot(GetSolutionKey(solutionPath), compileErrors);
+
+        Snapshot? previousSnapshot;
+        lock (snapshotsLock)
+        {
+            snapshots.TryGetValue(sinceSnapshotId, out previousSnapshot);
+        }
+        long snapshotId = Add(snapshot);
+
+        bool isFull = previousSnapshot == null || previousSnapshot.SolutionPath != snapshot.SolutionPath;
+        List<CompileError> previousErrors = isFull ? [] : previousSnapshot!.CompileErrors;
+
+        Dictionary<string, int> indexByKey = [];
+        for (int index = 0; index < previousErrors.Count; index++)
+        {
+            indexByKey.TryAdd(previousErrors[index].Key, index);
+        }
+
+        List<CompileError> added = [];
+        List<int> order = [];
+        foreach (var error in compileErrors)
+        {
+            if (!indexByKey.TryGetValue(error.Key, out int index))
+            {
+                index = previousErrors.Count + added.Count;
+                indexByKey[error.Key] = index;
+                added.Add(error);
+            }
+            order.Add(index);
+        }
+
+        var currentKeys = compileErrors.Select(error => error.Key).ToHashSet();
+        var removed = previousErrors
+            .Where(error => !currentKeys.Contains(error.Key))
+            .DistinctBy(error => error.Key)
+            .ToList();
+
+        return new DiagnosticDelta(snapshotId, isFull, added, removed, order);
+    }
+
+    long Add(Snapshot snapshot)
+    {
+        lock (snapshotsLock)
+        {
+            long snapshotId = ++lastSnapshotId;
+            snapshots[snapshotId] = snapshot;
+            snapshotIds.Enqueue(snapshotId);
+            while (snapshotIds.Count > MaxSnapshots)
+            {
+                snapshots.Remove(snapshotIds.Dequeue());
+            }
+            return snapshotId;
+        }
+    }
+
+    static string GetSolutionKey(string solutionPath)
+    {
+        return Path.GetFullPath(solutionPath);
+    }
+}
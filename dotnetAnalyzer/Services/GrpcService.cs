@@ -8,30 +8,39 @@ public class GrpcService : FeedbackServer.FeedbackServerBase
 {
     RoslynAnalyzerService roslynAnalyzerService;
 
-    public GrpcService()
+    DiagnosticSnapshots diagnosticSnapshots;
+
+    // The services are singletons, the solution stays loaded between calls
+    public GrpcService(RoslynAnalyzerService roslynAnalyzerService, DiagnosticSnapshots diagnosticSnapshots)
     {
-        roslynAnalyzerService = new RoslynAnalyzerService();
+        this.roslynAnalyzerService = roslynAnalyzerService;
+        this.diagnosticSnapshots = diagnosticSnapshots;
     }
 
     public override async Task<GetCompileErrorsReply> GetCompileErrors(GetCompileErrorsRequest request, ServerCallContext context)
     {
         List<CompileError> compileErrors = await roslynAnalyzerService.AnalyzeSolution(request.FilePath);
 
-        var reply = new GetCompileErrorsReply();
-        foreach (var error in compileErrors)
+        var reply = new GetCompileErrorsReply
         {
-            var compileError = new Error
-            {
-                ErrorText = error.ErrorText,
-                ProjectName = error.ProjectName,
-                FilePath = error.FilePath,
-            };
-            compileError.Position.AddRange(error.Position);
-            reply.Errors.Add(compileError);
-        }
+            SnapshotId = diagnosticSnapshots.Add(request.FilePath, compileErrors)
+        };
+        reply.Errors.AddRange(compileErrors.Select(ToError));
 
         return await Task.FromResult(reply);
     }
+
+    static Error ToError(CompileError error)
+    {
+        var compileError = new Error
+        {
+            ErrorText = error.ErrorText,
+            ProjectName = error.ProjectName,
+            FilePath = error.FilePath,
+        };
+        compileError.Position.AddRange(error.Position);
+        return compileError;
+    }
     public override async Task<HasSyntaxErrorsReply> HasSyntaxErrors(HasSyntaxErrorsRequest request, ServerCallContext context)
     {
         bool hasSyntaxErrors = await roslynAnalyzerService.HasSyntaxErrors(request.FilePath);
@@ -41,6 +50,49 @@ public class GrpcService : FeedbackServer.FeedbackServerBase
             HasSyntaxErrors = hasSyntaxErrors
         };
     }
-}
+    public override async Task<CheckEditsReply> CheckEdits(CheckEditsRequest request, ServerCallContext context)
+    {
+        EditsCheck editsCheck = await roslynAnalyzerService.CheckEdits(
+            request.FilePath,
+            request.Documents.Select(document => (document.FilePath, document.Text)).ToList(),
+            request.SyntaxOnly);
 
+        var reply = new CheckEditsReply
+        {
+            HasSyntaxErrors = editsCheck.HasSyntaxErrors
+        };
+        reply.Errors.AddRange(editsCheck.CompileErrors.Select(ToError));
+        return reply;
+    }
+    public override async Task<GetDiagnosticDeltaReply> GetDiagnosticDelta(GetDiagnosticDeltaRequest request, ServerCallContext context)
+    {
+        List<CompileError> compileErrors = await roslynAnalyzerService.AnalyzeSolution(request.FilePath);
+        DiagnosticDelta delta = diagnosticSnapshots.GetDelta(request.FilePath, request.SinceSnapshot, compileErrors);
 
+        var reply = new GetDiagnosticDeltaReply
+        {
+            SnapshotId = delta.SnapshotId,
+            IsFull = delta.IsFull
+        };
+        reply.Added.AddRange(delta.Added.Select(ToError));
+        reply.Removed.AddRange(delta.Removed.Select(ToError));
+        reply.Order.AddRange(delta.Order);
+        return reply;
+    }
+    public override async Task<GetDocumentDiagnosticsReply> GetDocumentDiagnostics(GetDocumentDiagnosticsRequest request, ServerCallContext context)
+    {
+        DocumentErrors documentErrors = await roslynAnalyzerService.GetDocumentErrors(
+            request.FilePath,
+            request.Documents.Select(document => (document.FilePath, document.Text)).ToList(),
+            request.DocumentPath,
+            request.StartLine,
+            request.EndLine);
+
+        var reply = new GetDocumentDiagnosticsReply
+        {
+            DocumentFound = documentErrors.DocumentFound
+        };
+        reply.Errors.AddRange(documentErrors.CompileErrors.Select(ToError));
+        return reply;
+    }
+}
@@ -1,6 +1,6 @@
+using System.Collections.Concurrent;
 using Microsoft.CodeAnalysis;
-using Microsoft.CodeAnalysis.CSharp;
-using Microsoft.CodeAnalysis.MSBuild;
+using Microsoft.CodeAnalysis.Text;
 using DotnetAnalyzer;
 
 namespace RoslynAnalyzer;
@@ -21,32 +21,92 @@ public class CompileError
         Position = position;
     }
 
+    public string Key => $"{ProjectName}\n{FilePath}\n{string.Join(",", Position)}\n{ErrorText}";
+
     public override string ToString()
     {
         return $"Error: {ErrorText}\nFile: {FilePath}\nPosition: {string.Join(", ", Position)}";
     }
 }
-class RoslynAnalyzerService : FeedbackServer.FeedbackServerBase
+public record EditsCheck(bool HasSyntaxErrors, List<CompileError> CompileErrors);
+
+public record DocumentErrors(bool DocumentFound, List<CompileError> CompileErrors);
+
+public class RoslynAnalyzerService : FeedbackServer.FeedbackServerBase
 {
-    MSBuildWorkspace workspace;
-    public RoslynAnalyzerService()
+    SolutionWorkspace solutionWorkspace;
+    readonly object analyzedSolutionLock = new();
+    Solution? analyzedSolution;
+    Dictionary<ProjectId, List<CompileError>> projectCompileErrors = [];
+
+    public RoslynAnalyzerService(SolutionWorkspace solutionWorkspace)
     {
-        workspace = MSBuildWorkspace.Create();
+        this.solutionWorkspace = solutionWorkspace;
     }
 
     public async Task<bool> HasSyntaxErrors(string solutionPath)
     {
-        RestoreService.Restore(solutionPath);
-        var solution = await workspace.OpenSolutionAsync(solutionPath);
+        var solution = await solutionWorkspace.GetSolution(solutionPath);
+        return await HasSyntaxErrors(solution);
+    }
+
+    public async Task<List<CompileError>> AnalyzeSolution(string solutionPath)
+    {
+        var solution = await solutionWorkspace.GetSolution(solutionPath);
+        return await AnalyzeSolution(solution);
+    }
+
+    // Errors of the loaded solution with the text of some documents replaced.
+    // Only a fork of the solution sees the new texts, so concurrent checks do
+    // not interfere with each other.
+    public async Task<EditsCheck> CheckEdits(string solutionPath, IEnumerable<(string FilePath, string Text)> documents, bool syntaxOnly)
+    {
+        var solution = await solutionWorkspace.GetSolution(solutionPath);
+        var editedSolution = SolutionWorkspace.WithDocumentTexts(solution, documents);
 
-        if (workspace.Diagnostics.Any())
+        bool hasSyntaxErrors = await HasSyntaxErrors(editedSolution);
+        List<CompileError> compileErrors = syntaxOnly ? [] : await AnalyzeSolution(editedSolution);
+        return new EditsCheck(hasSyntaxErrors, compileErrors);
+    }
+
+    // Errors of one document of the loaded solution with the text of some
+    // documents replaced, in the given lines only when startLine is not 0.
+    // Only the semantic model of the document is built, not the compilation
+    // of every project.
+    public async Task<DocumentErrors> GetDocumentErrors(string solutionPath, IEnumerable<(string FilePath, string Text)> documents, string documentPath, int startLine, int endLine)
+    {
+        var solution = await solutionWorkspace.GetSolution(solutionPath);
+        var editedSolution = SolutionWorkspace.WithDocumentTexts(solution, documents);
+
+        var documentIds = editedSolution.GetDocumentIdsWithFilePath(Path.GetFullPath(documentPath));
+        if (documentIds.IsEmpty) return new DocumentErrors(false, []);
+
+        List<CompileError> compileErrors = [];
+        // A document linked in several projects is checked in each of them
+        foreach (var documentId in documentIds)
         {
-            Console.WriteLine("Diagnostics while loading the solution:");
-            foreach (var diag in workspace.Diagnostics)
+            var document = editedSolution.GetDocument(documentId)!;
+            var semanticModel = await document.GetSemanticModelAsync();
+            if (semanticModel == null) return new DocumentErrors(false, []);
+
+            TextSpan? span = null;
+            if (startLine > 0)
             {
-                Console.WriteLine($"  {diag.Kind}: {diag.Message}");
+                var lines = (await document.GetTextAsync()).Lines;
+                int firstLine = Math.Clamp(startLine - 1, 0, lines.Count - 1);
+                int lastLine = Math.Clamp(endLine - 1, firstLine, lines.Count - 1);
+                span = TextSpan.FromBounds(lines[firstLine].Start, lines[lastLine].EndIncludingLineBreak);
             }
+
+            compileErrors.AddRange(semanticModel.GetDiagnostics(span)
+                .Where(IsReportedError)
+                .Select(diag => ToCompileError(diag, document.Project)));
         }
+        return new DocumentErrors(true, compileErrors);
+    }
+
+    static async Task<bool> HasSyntaxErrors(Solution solution)
+    {
         bool hasSyntaxErrors = false;
 
         foreach (var project in solution.Projects)
@@ -63,49 +123,94 @@ class RoslynAnalyzerService : FeedbackServer.FeedbackServerBase
         return hasSyntaxErrors;
     }
 
-    public async Task<List<CompileError>> AnalyzeSolution(string solutionPath)
+    // Errors of each project for the last analyzed solution. Only projects
+    // with a changed document, and the projects that depend on them, are
+    // compiled again.
+    async Task<List<CompileError>> AnalyzeSolution(Solution solution)
     {
-        RestoreService.Restore(solutionPath);
-        var solution = await workspace.OpenSolutionAsync(solutionPath);
-
-        if (workspace.Diagnostics.Any())
+        Solution? previousSolution;
+        Dictionary<ProjectId, List<CompileError>> previousCompileErrors;
+        lock (analyzedSolutionLock)
         {
-            Console.WriteLine("Diagnostics while loading the solution:");
-            foreach (var diag in workspace.Diagnostics)
-            {
-                Console.WriteLine($"  {diag.Kind}: {diag.Message}");
-            }
+            previousSolution = analyzedSolution;
+            previousCompileErrors = projectCompileErrors;
         }
 
-        List<CompileError> allCompileError = [];
+        var affectedProjectIds = GetAffectedProjects(previousSolution, solution);
+        var projectsToAnalyze = solution.Projects
+            .Where(project => affectedProjectIds == null
+                || affectedProjectIds.Contains(project.Id)
+                || !previousCompileErrors.ContainsKey(project.Id));
+
+        // Compiling is CPU bound, projects are compiled on the thread pool with
+        // at most one project per processor
+        var analyzedProjects = new ConcurrentDictionary<ProjectId, List<CompileError>>();
+        await Parallel.ForEachAsync(
+            projectsToAnalyze,
+            new ParallelOptions { MaxDegreeOfParallelism = Environment.ProcessorCount },
+            async (project, _) => analyzedProjects[project.Id] = await AnalyzeProject(project));
+
+        var compileErrors = solution.ProjectIds
+            .Where(previousCompileErrors.ContainsKey)
+            .ToDictionary(projectId => projectId, projectId => previousCompileErrors[projectId]);
+        foreach (var (projectId, projectErrors) in analyzedProjects)
+        {
+            compileErrors[projectId] = projectErrors;
+        }
 
-        foreach (var project in solution.Projects)
+        lock (analyzedSolutionLock)
         {
-            var compilation = await project.GetCompilationAsync();
+            analyzedSolution = solution;
+            projectCompileErrors = compileErrors;
+        }
 
-            var compilationOptions = new CSharpCompilationOptions(OutputKind.DynamicallyLinkedLibrary);
+        return solution.Projects.SelectMany(project => compileErrors[project.Id]).ToList();
+    }
 
-            var diagnostics = compilation?.GetDiagnostics().Where(diagnostic =>
-                diagnostic.IsWarningAsError || diagnostic.Severity == DiagnosticSeverity.Error);
+    // Projects with a changed document and the projects that transitively
+    // depend on them, null when every project has to be compiled
+    static HashSet<ProjectId>? GetAffectedProjects(Solution? previousSolution, Solution solution)
+    {
+        // A reloaded solution is a new solution
+        if (previousSolution == null || previousSolution.Id != solution.Id) return null;
 
-            if (diagnostics == null) return allCompileError;
+        var solutionChanges = solution.GetChanges(previousSolution);
+        if (solutionChanges.GetAddedProjects().Any() || solutionChanges.GetRemovedProjects().Any()) return null;
 
-            diagnostics = diagnostics.Where(d => !(d.Location.SourceTree?.FilePath ?? "").Contains("/obj/"));
+        var dependencyGraph = solution.GetProjectDependencyGraph();
+        HashSet<ProjectId> affectedProjectIds = [];
+        foreach (var projectChanges in solutionChanges.GetProjectChanges())
+        {
+            affectedProjectIds.Add(projectChanges.ProjectId);
+            affectedProjectIds.UnionWith(
+                dependencyGraph.GetProjectsThatTransitivelyDependOnThisProject(projectChanges.ProjectId));
+        }
+        return affectedProjectIds;
+    }
 
+    static async Task<List<CompileError>> AnalyzeProject(Project project)
+    {
+        var compilation = await project.GetCompilationAsync();
 
-            List<CompileError> compileErrors = diagnostics.Select(diag =>
-            {
-                var lineSpan = diag.Location.GetLineSpan().StartLinePosition;
-                var endLineSpan = diag.Location.GetLineSpan().EndLinePosition;
-                var filePath = diag.Location?.SourceTree?.FilePath ?? project.FilePath ?? "";
-                // Add one to go from index to line_number
-                return new CompileError(diag.GetMessage(), project.Name, filePath, [lineSpan.Line + 1, lineSpan.Character + 1, endLineSpan.Line + 1, endLineSpan.Character + 1]);
-            }).ToList();
+        var diagnostics = compilation?.GetDiagnostics().Where(IsReportedError);
 
-            allCompileError = allCompileError.Concat(compileErrors).ToList();
+        if (diagnostics == null) return [];
 
-        }
-        return allCompileError;
+        return diagnostics.Select(diag => ToCompileError(diag, project)).ToList();
+    }
 
+    static bool IsReportedError(Diagnostic diagnostic)
+    {
+        return (diagnostic.IsWarningAsError || diagnostic.Severity == DiagnosticSeverity.Error)
+            && !(diagnostic.Location.SourceTree?.FilePath ?? "").Contains("/obj/");
     }
-}
\ No newline at end of file
+
+    static CompileError ToCompileError(Diagnostic diag, Project project)
+    {
+        var lineSpan = diag.Location.GetLineSpan().StartLinePosition;
+        var endLineSpan = diag.Location.GetLineSpan().EndLinePosition;
+        var filePath = diag.Location?.SourceTree?.FilePath ?? project.FilePath ?? "";
+        // Add one to go from index to line_number
+        return new CompileError(diag.GetMessage(), project.Name, filePath, [lineSpan.Line + 1, lineSpan.Character + 1, endLineSpan.Line + 1, endLineSpan.Character + 1]);
+    }
+}
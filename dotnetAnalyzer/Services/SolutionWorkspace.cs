@@ -0,0 +1,209 @@
+using System.Security.Cryptography;
+using Microsoft.CodeAnalysis;
+using Microsoft.CodeAnalysis.MSBuild;
+using Microsoft.CodeAnalysis.Text;
+
+namespace RoslynAnalyzer;
+
+// Solution loaded once and kept between calls. Documents changed on disk are
+// applied to the loaded solution so that Roslyn reuses what it compiled for the
+// rest of it. The solution is restored and loaded again only when the solution
+// or one of its project files changes, or when a source file is added to or
+// removed from a project directory, as SDK-style projects include them all.
+public class SolutionWorkspace
+{
+    // A file written twice within the same tick keeps its write time, so the
+    // content of a file written this recently is compared as well
+    static readonly TimeSpan RacyWriteInterval = TimeSpan.FromSeconds(2);
+
+    record DocumentStamp(DateTime WriteTime, long Length, byte[]? ContentHash);
+
+    readonly SemaphoreSlim semaphore = new(1, 1);
+    MSBuildWorkspace? workspace;
+    string? solutionPath;
+    Solution? solution;
+    Dictionary<string, DateTime> projectFileWriteTimes = [];
+    Dictionary<string, DocumentStamp> documentStamps = [];
+    List<string> projectDirectories = [];
+    HashSet<string> sourceFiles = [];
+
+    public async Task<Solution> GetSolution(string solutionPath)
+    {
+        await semaphore.WaitAsync();
+        try
+        {
+            return await GetUpToDateSolution(solutionPath);
+        }
+        finally
+        {
+            semaphore.Release();
+        }
+    }
+
+    // Solution with the text of the documents at these paths replaced, the
+    // given solution is left as it is
+    public static Solution WithDocumentTexts(Solution solution, IEnumerable<(string FilePath, string Text)> documents)
+    {
+        foreach (var (filePath, text) in documents)
+        {
+            foreach (var documentId in solution.GetDocumentIdsWithFilePath(Path.GetFullPath(filePath)))
+            {
+                solution = solution.WithDocumentText(documentId, SourceText.From(text));
+            }
+        }
+        return solution;
+    }
+
+    async Task<Solution> GetUpToDateSolution(string solutionPath)
+    {
+        if (solution == null || this.solutionPath != solutionPath || HaveProjectFilesChanged() || HaveSourceFilesChanged())
+        {
+            return await LoadSolution(solutionPath);
+        }
+
+        foreach (var (filePath, stamp) in documentStamps.ToList())
+        {
+            if (!File.Exists(filePath))
+            {
+                return await LoadSolution(solutionPath);
+            }
+
+            if (!HasChanged(filePath, stamp, out var content))
+            {
+                if (stamp.ContentHash != null && !IsRacy(stamp.WriteTime))
+                {
+                    documentStamps[filePath] = stamp with { ContentHash = null };
+                }
+                continue;
+            }
+
+            content ??= File.ReadAllBytes(filePath);
+            SourceText text;
+            using (var stream = new MemoryStream(content))
+            {
+                text = SourceText.From(stream);
+            }
+            foreach (var documentId in solution.GetDocumentIdsWithFilePath(filePath))
+            {
+                solution = solution.WithDocumentText(documentId, text);
+            }
+            documentStamps[filePath] = GetStamp(filePath, content);
+        }
+
+        return solution;
+    }
+
+    static bool IsRacy(DateTime writeTime)
+    {
+        return DateTime.UtcNow - writeTime < RacyWriteInterval;
+    }
+
+    // Content is given when the file was just read, to not read it again
+    static DocumentStamp GetStamp(string filePath, byte[]? content = null)
+    {
+        var info = new FileInfo(filePath);
+        byte[]? contentHash = null;
+        if (IsRacy(info.LastWriteTimeUtc))
+        {
+            contentHash = SHA256.HashData(content ?? File.ReadAllBytes(filePath));
+        }
+        return new DocumentStamp(info.LastWriteTimeUtc, info.Length, contentHash);
+    }
+
+    // The file is read only when its write time can not be trusted, its
+    // content is then given back
+    static bool HasChanged(string filePath, DocumentStamp stamp, out byte[]? content)
+    {
+        content = null;
+        var info = new FileInfo(filePath);
+        if (info.LastWriteTimeUtc != stamp.WriteTime || info.Length != stamp.Length)
+        {
+            return true;
+        }
+        if (stamp.ContentHash == null)
+        {
+            return false;
+        }
+        content = File.ReadAllBytes(filePath);
+        return !SHA256.HashData(content).AsSpan().SequenceEqual(stamp.ContentHash);
+    }
+
+    bool HaveProjectFilesChanged()
+    {
+        return projectFileWriteTimes.Any(entry =>
+            !File.Exists(entry.Key) || File.GetLastWriteTimeUtc(entry.Key) != entry.Value);
+    }
+
+    bool HaveSourceFilesChanged()
+    {
+        return !GetSourceFiles(projectDirectories).SetEquals(sourceFiles);
+    }
+
+    // Source files under the project directories, without the build outputs
+    static HashSet<string> GetSourceFiles(IEnumerable<string> projectDirectories)
+    {
+        var sourceFiles = new HashSet<string>();
+        foreach (var directory in projectDirectories.Where(Directory.Exists))
+        {
+            foreach (var filePath in Directory.EnumerateFiles(directory, "*.cs", SearchOption.AllDirectories))
+            {
+                var topDirectory = Path.GetRelativePath(directory, filePath).Split(Path.DirectorySeparatorChar)[0];
+                if (topDirectory is not ("bin" or "obj"))
+                {
+                    sourceFiles.Add(filePath);
+                }
+            }
+        }
+        return sourceFiles;
+    }
+
+    async Task<Solution> LoadSolution(string solutionPath)
+    {
+        RestoreService.Restore(solutionPath);
+
+        workspace?.Dispose();
+        workspace = MSBuildWorkspace.Create();
+        var loadedSolution = await workspace.OpenSolutionAsync(solutionPath);
+
+        if (workspace.Diagnostics.Any())
+        {
+            Console.WriteLine("Diagnostics while loading the solution:");
+            foreach (var diag in workspace.Diagnostics)
+            {
+                Console.WriteLine($"  {diag.Kind}: {diag.Message}");
+            }
+        }
+
+        projectFileWriteTimes = new Dictionary<string, DateTime>
+        {
+            [solutionPath] = File.GetLastWriteTimeUtc(solutionPath)
+        };
+        foreach (var project in loadedSolution.Projects)
+        {
+            if (project.FilePath != null)
+            {
+                projectFileWriteTimes[project.FilePath] = File.GetLastWriteTimeUtc(project.FilePath);
+            }
+        }
+
+        projectDirectories = loadedSolution.Projects
+            .Select(project => Path.GetDirectoryName(project.FilePath))
+            .OfType<string>()
+            .Distinct()
+            .ToList();
+        sourceFiles = GetSourceFiles(projectDirectories);
+
+        documentStamps = [];
+        foreach (var document in loadedSolution.Projects.SelectMany(project => project.Documents))
+        {
+            if (document.FilePath != null && File.Exists(document.FilePath))
+            {
+                documentStamps[document.FilePath] = GetStamp(document.FilePath);
+            }
+        }
+
+        this.solutionPath = solutionPath;
+        solution = loadedSolution;
+        return loadedSolution;
+    }
+}